@@ -0,0 +1,131 @@
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure src is in python path if running from root
+src_path = Path(__file__).resolve().parent.parent / "src"
+if src_path.exists():
+    sys.path.insert(0, str(src_path))
+
+from opensteuerauszug.core.kursliste_db_reader import KurslisteDBReader  # noqa: E402
+from opensteuerauszug.kursliste.converter import (  # noqa: E402
+    BLOB_FORMATS,
+    convert_kursliste_xml_to_sqlite,
+)
+from opensteuerauszug.model.kursliste import Da1Rate, Sign  # noqa: E402
+
+DEFAULT_XML = (
+    Path(__file__).resolve().parent.parent
+    / "tests"
+    / "samples"
+    / "kursliste"
+    / "kursliste_mini.xml"
+)
+
+
+def _decode_all(reader: KurslisteDBReader) -> int:
+    """Deserializes every blob of the securities, signs and da1_rates tables."""
+    assert reader.conn is not None
+    count = 0
+    for row in reader.conn.execute(
+        "SELECT security_object_blob, security_type_identifier FROM securities"
+    ):
+        if reader._deserialize_security(row[0], row[1]) is not None:
+            count += 1
+    for row in reader.conn.execute("SELECT sign_object_blob FROM signs"):
+        if reader._deserialize_object(row[0], Sign, "Sign") is not None:
+            count += 1
+    for row in reader.conn.execute("SELECT da1_rate_object_blob FROM da1_rates"):
+        if reader._deserialize_object(row[0], Da1Rate, "Da1Rate") is not None:
+            count += 1
+    return count
+
+
+def _lookup_all(reader: KurslisteDBReader, tax_year: int) -> int:
+    """Looks up every security by ISIN the way the calculators do, payments included."""
+    assert reader.conn is not None
+    isins = [
+        row[0] for row in reader.conn.execute("SELECT isin FROM securities WHERE isin IS NOT NULL")
+    ]
+    return sum(len(reader.find_securities_by_isin(isin, tax_year)) for isin in isins)
+
+
+def benchmark(xml_file: Path, repeat: int) -> None:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for blob_format in BLOB_FORMATS:
+            db_file = Path(tmp_dir) / f"kursliste_{blob_format}.sqlite"
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                convert_kursliste_xml_to_sqlite(xml_file, db_file, blob_format=blob_format)
+            convert_seconds = time.perf_counter() - start
+
+            with KurslisteDBReader(str(db_file)) as reader:
+                assert reader.conn is not None
+                tax_year = int(
+                    reader.conn.execute(
+                        "SELECT value FROM metadata WHERE key = 'tax_year'"
+                    ).fetchone()[0]
+                )
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    decoded = _decode_all(reader)
+                decode_seconds = (time.perf_counter() - start) / repeat
+
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    looked_up = _lookup_all(reader, tax_year)
+                lookup_seconds = (time.perf_counter() - start) / repeat
+
+            results.append(
+                (
+                    blob_format,
+                    convert_seconds,
+                    db_file.stat().st_size,
+                    decoded,
+                    decode_seconds,
+                    looked_up,
+                    lookup_seconds,
+                )
+            )
+
+    print(f"Kursliste: {xml_file} (reads averaged over {repeat} runs)")
+    print(
+        f"{'format':<8} {'convert':>10} {'db size':>12} {'objects':>8} {'decode all':>12}"
+        f" {'securities':>10} {'ISIN lookups':>13}"
+    )
+    for blob_format, convert_s, size, decoded, decode_s, looked_up, lookup_s in results:
+        print(
+            f"{blob_format:<8} {convert_s:>9.2f}s {size:>12,} {decoded:>8} {decode_s:>11.3f}s"
+            f" {looked_up:>10} {lookup_s:>12.3f}s"
+        )
+    baseline = results[0]
+    for result in results[1:]:
+        print(
+            f"{result[0]} vs {baseline[0]}: decode {baseline[4] / result[4]:.1f}x,"
+            f" lookups {baseline[6] / result[6]:.1f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the Kursliste SQLite blob formats on conversion and read speed."
+    )
+    parser.add_argument(
+        "xml_file",
+        nargs="?",
+        default=str(DEFAULT_XML),
+        help="Kursliste XML file to convert (use a full-size Kursliste for meaningful numbers).",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed read passes.")
+    args = parser.parse_args()
+    benchmark(Path(args.xml_file), args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
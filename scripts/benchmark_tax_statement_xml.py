@@ -0,0 +1,106 @@
+import argparse
+import copy
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import lxml.etree as ET
+
+# Ensure src is in python path if running from root
+src_path = Path(__file__).resolve().parent.parent / "src"
+if src_path.exists():
+    sys.path.insert(0, str(src_path))
+
+from opensteuerauszug.model.ech0196 import TaxStatement, ns_tag  # noqa: E402
+
+DEFAULT_XML = Path(__file__).resolve().parent.parent / "tests" / "samples" / "fake_statement.xml"
+
+
+def build_large_statement(template: Path, securities: int, events: int) -> bytes:
+    """
+    Scales up a statement: every depot gets the given number of securities, each
+    a copy of the template's securities with its stock and payment entries
+    repeated until it has about the given number of them.
+    """
+    root = ET.parse(str(template)).getroot()
+    depots = root.findall(f"{ns_tag(None, 'listOfSecurities')}/{ns_tag(None, 'depot')}")
+    if not any(depot.findall(ns_tag(None, "security")) for depot in depots):
+        raise ValueError(f"{template} contains no securities to replicate")
+
+    position_id = 0
+    for depot in depots:
+        originals = depot.findall(ns_tag(None, "security"))
+        if not originals:
+            continue
+        for security in originals:
+            depot.remove(security)
+        for i in range(securities):
+            security = copy.deepcopy(originals[i % len(originals)])
+            position_id += 1
+            security.set("positionId", str(position_id))
+            entries = [
+                child
+                for child in security
+                if child.tag in (ns_tag(None, "stock"), ns_tag(None, "payment"))
+            ]
+            for j in range(max(events - len(entries), 0)):
+                security.append(copy.deepcopy(entries[j % len(entries)]))
+            depot.append(security)
+    return ET.tostring(root, xml_declaration=True, encoding="UTF-8")
+
+
+def benchmark(template: Path, securities: int, events: int, repeat: int) -> None:
+    xml = build_large_statement(template, securities, events)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        xml_file = Path(tmp_dir) / "large_statement.xml"
+        xml_file.write_bytes(xml)
+        elements = sum(1 for _ in ET.parse(str(xml_file)).getroot().iter(ET.Element))
+
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            statement = TaxStatement.from_xml_file(str(xml_file))
+            parse_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            statement.to_xml_bytes()
+            timings.append((parse_seconds, time.perf_counter() - start))
+
+    print(
+        f"Statement: {template} scaled to {securities} securities per depot, "
+        f"~{events} stock/payment entries each ({len(xml):,} bytes, {elements:,} elements)"
+    )
+    print(f"{'run':>4} {'from_xml_file':>14} {'to_xml_bytes':>13}")
+    for number, (parse_seconds, serialize_seconds) in enumerate(timings, start=1):
+        print(f"{number:>4} {parse_seconds:>13.3f}s {serialize_seconds:>12.3f}s")
+    for label, seconds in (
+        ("parse", min(t[0] for t in timings)),
+        ("serialize", min(t[1] for t in timings)),
+    ):
+        print(f"best {label}: {seconds:.3f}s, {seconds / elements * 1e6:.1f} us per element")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure how fast a large eCH-0196 tax statement is parsed and serialized."
+    )
+    parser.add_argument(
+        "xml_file",
+        nargs="?",
+        default=str(DEFAULT_XML),
+        help="Tax statement used as template for the securities.",
+    )
+    parser.add_argument(
+        "--securities", type=int, default=2000, help="Number of securities per depot."
+    )
+    parser.add_argument(
+        "--events", type=int, default=20, help="Stock and payment entries per security."
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs.")
+    args = parser.parse_args()
+    benchmark(Path(args.xml_file), args.securities, args.events, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,69 @@
+"""
+Filters a Kursliste down to the securities of a portfolio.
+
+The input is read in a single pass with ``iterparse`` and the output is
+written as it goes through an ``xmlfile`` writer, so memory is bounded by
+the definitions at the top of the Kursliste and the selected securities,
+not by the size of the input. A Kursliste already converted to SQLite (see
+``convert_kursliste_to_sqlite.py``) can be used as input instead of the XML.
+"""
+
 import argparse
+import contextlib
+import datetime
 import logging
+import os
 import sys
+import tempfile
+from collections import Counter
+
 import lxml.etree as ET
-from pydantic import ValidationError
 
-from opensteuerauszug.model.kursliste import Kursliste
+from opensteuerauszug.core.kursliste_db_reader import KurslisteDBReader
+from opensteuerauszug.kursliste.converter import read_metadata_value
 from opensteuerauszug.model.ech0196 import TaxStatement
+from opensteuerauszug.model.kursliste import KURSLISTE_NS
+
+# Direct children of <kursliste>, by local name
+DEFINITION_TAGS = frozenset(
+    {
+        "canton",
+        "capitalKey",
+        "country",
+        "currency",
+        "securityGroup",
+        "securityType",
+        "legalForm",
+        "sector",
+        "shortCut",
+        "sign",
+        "capitalisationRate",
+        "da1Rate",
+        "mediumTermBond",
+        "institution",
+    }
+)
+SECURITY_TAGS = ("bond", "coinBullion", "currencyNote", "derivative", "fund", "liborSwap", "share")
+EXCHANGE_RATE_TAGS = ("exchangeRate", "exchangeRateMonthly", "exchangeRateYearEnd")
+
+SQLITE_HEADER = b"SQLite format 3\x00"
+# Converted databases store every object in the 2.2 schema
+DB_KURSLISTE_VERSION = "2.2.0.0"
+DB_EXCHANGE_RATE_QUERIES = {
+    "exchangeRate": """
+        SELECT currency_code AS currency, date, denomination, rate AS value
+        FROM exchange_rates_daily WHERE tax_year = ? AND currency_code IN ({}) ORDER BY id
+    """,
+    "exchangeRateMonthly": """
+        SELECT currency_code AS currency, year, month, denomination, rate AS value
+        FROM exchange_rates_monthly WHERE tax_year = ? AND currency_code IN ({}) ORDER BY id
+    """,
+    "exchangeRateYearEnd": """
+        SELECT currency_code AS currency, year, denomination, rate AS value,
+            rate_middle AS valueMiddle
+        FROM exchange_rates_year_end WHERE tax_year = ? AND currency_code IN ({}) ORDER BY id
+    """,
+}
 
 
 def parse_tax_statements(file_paths: list[str]) -> tuple[set[int], set[str]]:
@@ -109,9 +167,238 @@ def parse_tax_statements(file_paths: list[str]) -> tuple[set[int], set[str]]:
     return collected_valor_numbers, collected_currencies
 
 
+def _local_name(elem: ET._Element) -> str:
+    return ET.QName(elem).localname
+
+
+def _security_name(elem: ET._Element) -> str | None:
+    for child in elem:
+        if _local_name(child) == "securityName":
+            return child.get("name")
+    return None
+
+
+class KurslisteSelection:
+    """
+    Decides which elements of a Kursliste are kept.
+
+    Securities are selected by valor number as they are read; the currencies,
+    countries and institutions they reference are collected on the way, so the
+    definitions and exchange rates can be filtered once all securities are seen.
+    """
+
+    def __init__(self, valor_numbers: set[int], relevant_currencies: set[str], include_bonds: bool):
+        self.valor_numbers = valor_numbers
+        self.relevant_currencies = set(relevant_currencies)
+        self.security_tags = {"share", "fund", "bond"} if include_bonds else {"share", "fund"}
+        self.country_codes: set[str] = set()
+        self.institution_ids: set[str] = set()
+        self.kept: Counter[str] = Counter()
+
+    def select_security(self, elem: ET._Element, tag: str) -> bool:
+        """Whether to keep a security element; records what a kept one references."""
+        if tag not in self.security_tags:
+            return False
+        try:
+            valor_number = int(elem.get("valorNumber", ""))
+        except ValueError:
+            return False
+        if valor_number not in self.valor_numbers:
+            return False
+
+        namespace = ET.QName(elem).namespace
+        payment_tag = f"{{{namespace}}}payment" if namespace else "payment"
+        currencies = [elem.get("currency")]
+        currencies.extend(payment.get("currency") for payment in elem.iter(payment_tag))
+        self.relevant_currencies.update(currency for currency in currencies if currency)
+        if elem.get("country"):
+            self.country_codes.add(elem.get("country"))
+        if elem.get("institutionId"):
+            self.institution_ids.add(elem.get("institutionId"))
+
+        self.kept[tag] += 1
+        logging.info(f"Kept {tag} - Valor: {valor_number}, Name: {_security_name(elem)}")
+        return True
+
+    def filter_definitions(self, definitions: list[tuple[str, ET._Element]]):
+        """
+        Yields the definitions to keep, in document order.
+
+        Must only be called once all securities have been selected. Currencies
+        are kept if relevant, institutions if a kept security references them
+        and countries if a kept security or institution is located there; all
+        other definitions are kept as they are.
+        """
+        for tag, elem in definitions:
+            if tag == "institution" and elem.get("id") in self.institution_ids:
+                if elem.get("country"):
+                    self.country_codes.add(elem.get("country"))
+
+        for tag, elem in definitions:
+            if tag == "currency":
+                keep = elem.get("currency") in self.relevant_currencies
+            elif tag == "country":
+                keep = elem.get("country") in self.country_codes
+            elif tag == "institution":
+                keep = elem.get("id") in self.institution_ids
+            else:
+                keep = True
+            if keep:
+                self.kept[tag] += 1
+                yield elem
+
+    def keep_exchange_rate(self, elem: ET._Element, tag: str) -> bool:
+        if elem.get("currency") not in self.relevant_currencies:
+            return False
+        self.kept[tag] += 1
+        return True
+
+
+def write_element(xf, elem: ET._Element, depth: int) -> None:
+    """
+    Writes ``elem`` to the ``xmlfile`` writer ``xf``, indented by ``depth``.
+
+    ``xf.write(elem)`` would repeat the namespace declarations on every
+    element; writing tag by tag inherits them from the enclosing element.
+    """
+    indent = "\n" + "  " * depth
+    xf.write(indent)
+    with xf.element(elem.tag, attrib=elem.attrib):
+        if elem.text and elem.text.strip():
+            xf.write(elem.text)
+        for child in elem:
+            write_element(xf, child, depth + 1)
+        if len(elem):
+            xf.write(indent)
+
+
+def is_sqlite_db(path: str) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(SQLITE_HEADER)) == SQLITE_HEADER
+
+
+def stream_filtered_xml(input_file: str, xf, selection: KurslisteSelection) -> None:
+    """
+    Streams the selected parts of the Kursliste XML ``input_file`` to ``xf``.
+
+    Every direct child of the root is dropped as soon as it is parsed. Only the
+    definitions and the selected securities are held until the first exchange
+    rate, because which countries, currencies and institutions to keep depends
+    on the securities that follow them; the exchange rates are written directly.
+    """
+    definitions: list[tuple[str, ET._Element]] = []
+    securities: list[ET._Element] = []
+    pending = True
+
+    def write_pending():
+        for elem in selection.filter_definitions(definitions):
+            write_element(xf, elem, 1)
+        for elem in securities:
+            write_element(xf, elem, 1)
+        definitions.clear()
+        securities.clear()
+
+    context = ET.iterparse(
+        input_file,
+        events=("end",),
+        remove_comments=True,
+        remove_pis=True,
+        huge_tree=True,
+        resolve_entities=False,
+        no_network=True,
+    )
+    root = None
+    with contextlib.ExitStack() as stack:
+        for _, elem in context:
+            if root is None:
+                root = elem.getroottree().getroot()
+                stack.enter_context(
+                    xf.element(root.tag, attrib=dict(root.attrib), nsmap=root.nsmap)
+                )
+            if elem.getparent() is not root:
+                continue
+            root.remove(elem)
+            tag = _local_name(elem)
+            if tag in EXCHANGE_RATE_TAGS:
+                if pending:
+                    write_pending()
+                    pending = False
+                if selection.keep_exchange_rate(elem, tag):
+                    write_element(xf, elem, 1)
+            elif tag in SECURITY_TAGS:
+                if selection.select_security(elem, tag):
+                    securities.append(elem)
+            elif tag in DEFINITION_TAGS:
+                definitions.append((tag, elem))
+            else:
+                logging.debug(f"Skipping unknown Kursliste element <{tag}>.")
+        if pending:
+            write_pending()
+        xf.write("\n")
+
+
+def stream_filtered_db(input_file: str, xf, selection: KurslisteSelection) -> None:
+    """
+    Writes the selected parts of the Kursliste database ``input_file`` to ``xf``.
+
+    A converted database keeps the signs, DA-1 rates, securities and exchange
+    rates, but no other definitions and none of the original root attributes;
+    the root is written for the tax year of the database.
+    """
+    tax_year = read_metadata_value(input_file, "tax_year")
+    if tax_year is None:
+        raise ValueError(f"Kursliste database {input_file} records no tax year")
+    tax_year = int(tax_year)
+    logging.warning(
+        "Kursliste databases do not store countries, currencies, institutions and the other "
+        "definitions except signs and DA-1 rates; they are missing from the output."
+    )
+
+    root_attrib = {
+        "version": DB_KURSLISTE_VERSION,
+        "creationDate": datetime.datetime.now().replace(microsecond=0).isoformat(),
+        "year": str(tax_year),
+    }
+    with (
+        KurslisteDBReader(input_file, read_only=True) as reader,
+        xf.element(f"{{{KURSLISTE_NS}}}kursliste", attrib=root_attrib, nsmap={None: KURSLISTE_NS}),
+    ):
+        for definition in (*reader.get_signs(tax_year), *reader.get_da1_rates(tax_year)):
+            selection.kept[definition.__xml_tag__] += 1
+            write_element(xf, definition.to_xml_tree(exclude_none=True), 1)
+
+        found = reader.find_securities_by_valors(selection.valor_numbers, tax_year)
+        securities: dict[str, list[ET._Element]] = {}
+        for matches in found.values():
+            for security in matches:
+                elem = security.to_xml_tree(exclude_none=True)
+                tag = _local_name(elem)
+                if selection.select_security(elem, tag):
+                    securities.setdefault(tag, []).append(elem)
+        for tag in SECURITY_TAGS:
+            for elem in securities.get(tag, ()):
+                write_element(xf, elem, 1)
+
+        currencies = sorted(selection.relevant_currencies)
+        placeholders = ", ".join("?" for _ in currencies)
+        for tag, query in DB_EXCHANGE_RATE_QUERIES.items():
+            if not currencies:
+                break
+            rows = reader.conn.execute(query.format(placeholders), (tax_year, *currencies))
+            for row in rows:
+                attrib = {key: str(row[key]) for key in row.keys() if row[key] is not None}
+                selection.kept[tag] += 1
+                write_element(xf, ET.Element(f"{{{KURSLISTE_NS}}}{tag}", attrib), 1)
+        xf.write("\n")
+
+
 def main():
-    parser = argparse.ArgumentParser(description="Filters a Kursliste XML file.")
-    parser.add_argument("--input-file", required=True, help="Path to the large Kursliste XML file.")
+    parser = argparse.ArgumentParser(description="Filters a Kursliste XML file or a Kursliste converted to SQLite.")
+    parser.add_argument(
+        "--input-file",
+        required=True,
+        help="Path to the large Kursliste XML file or a Kursliste converted to SQLite.",
+    )
     parser.add_argument(
         "--output-file", required=True, help="Path for the filtered Kursliste XML output."
     )
@@ -251,359 +538,67 @@ def filter_kursliste(
             f"Initial set of relevant currencies (target_currency + tax statement currencies): {relevant_currencies if relevant_currencies else 'None'}"
         )
 
-        # Proceed with Kursliste XML loading and processing only if there are valor numbers to filter by
+        # Proceed with Kursliste processing only if there are valor numbers to filter by
         if not valor_numbers_to_keep:
             logging.warning(
                 "No valor numbers to filter by (neither from command line nor tax statements). Output will be empty of securities."
             )
-            # Depending on desired behavior, could exit or produce an empty Kursliste structure.
-            # Current script structure will produce an empty Kursliste for securities/rates if this set is empty.
 
-        # Load and Parse Kursliste XML
-        logging.info(f"Loading Kursliste XML from {input_file}...")
-        try:
-            # Use Kursliste.from_xml_file to parse the input XML file
-            # Pass denylist=None to ensure all elements are loaded from the source Kursliste.
-            kursliste_data = Kursliste.from_xml_file(input_file, denylist=None)
-            logging.info(f"Successfully parsed Kursliste XML from {input_file}")
-            logging.info(
-                f"Kursliste date: {kursliste_data.creationDate}, Year: {kursliste_data.year}"
-            )
-        except ET.XMLSyntaxError as e:
-            logging.error(f"XML Syntax Error parsing Kursliste file {input_file}: {e}")
-            return 1  # Exit with error
-        except ValidationError as e:
-            logging.error(f"Pydantic validation error parsing Kursliste {input_file}: {e}")
-            return 1  # Exit with error
-        except (
-            FileNotFoundError
-        ):  # Already caught by the outer try-except, but good to be specific if desired
+        if not os.path.isfile(input_file):
             logging.error(f"Error: Kursliste input file not found at {input_file}")
             return 1
-        except Exception as e:  # Catch other potential errors from from_xml_file
+
+        selection = KurslisteSelection(valor_numbers_to_keep, relevant_currencies, include_bonds)
+        if not include_bonds:
+            logging.info("Skipping bond filtering as --include-bonds is False.")
+
+        # Write next to the output file and move it into place only once complete,
+        # so a failure midway leaves no truncated output behind.
+        output_dir = os.path.dirname(os.path.abspath(output_file))
+        fd, temp_output = tempfile.mkstemp(
+            prefix=".filter_kursliste-", suffix=".xml", dir=output_dir
+        )
+        os.close(fd)
+        try:
+            with ET.xmlfile(temp_output, encoding="UTF-8") as xf:
+                xf.write_declaration()
+                if is_sqlite_db(input_file):
+                    logging.info(f"Filtering Kursliste database {input_file}...")
+                    stream_filtered_db(input_file, xf, selection)
+                else:
+                    logging.info(f"Filtering Kursliste XML {input_file}...")
+                    stream_filtered_xml(input_file, xf, selection)
+            os.replace(temp_output, output_file)
+        except Exception as e:
             logging.error(
-                f"An unexpected error occurred while parsing Kursliste {input_file}: {e}",
+                f"An unexpected error occurred while filtering Kursliste {input_file}: {e}",
                 exc_info=True,
             )
             return 1
+        finally:
+            if os.path.exists(temp_output):
+                os.unlink(temp_output)
 
-        # Initialize filtered lists (using the consolidated valor_numbers_to_keep)
-        filtered_shares = []
-        filtered_funds = []
-        filtered_bonds = []
-
-        # 3. Filter Shares
-        if kursliste_data.shares:
-            logging.info(f"Processing {len(kursliste_data.shares)} shares from input...")
-            for share in kursliste_data.shares:
-                if (
-                    share.valorNumber and share.valorNumber in valor_numbers_to_keep
-                ):  # Use consolidated set
-                    filtered_shares.append(share)
-                    logging.info(
-                        f"Kept Share - Valor: {share.valorNumber}, Name: {share.securityName}"
-                    )
-        else:
-            logging.info("No shares found in the input Kursliste.")
-
-        # 4. Filter Funds
-        if kursliste_data.funds:
-            logging.info(f"Processing {len(kursliste_data.funds)} funds from input...")
-            for fund in kursliste_data.funds:
-                if (
-                    fund.valorNumber and fund.valorNumber in valor_numbers_to_keep
-                ):  # Use consolidated set
-                    filtered_funds.append(fund)
-                    logging.info(
-                        f"Kept Fund - Valor: {fund.valorNumber}, Name: {fund.securityName}"
-                    )
-        else:
-            logging.info("No funds found in the input Kursliste.")
-
-        # 5. Filter Bonds (Conditional)
-        if include_bonds:
-            if kursliste_data.bonds:
-                logging.info(
-                    f"Processing {len(kursliste_data.bonds)} bonds from input (include_bonds is True)..."
-                )
-                for bond in kursliste_data.bonds:
-                    if (
-                        bond.valorNumber and bond.valorNumber in valor_numbers_to_keep
-                    ):  # Use consolidated set
-                        filtered_bonds.append(bond)
-                        logging.info(
-                            f"Kept Bond - Valor: {bond.valorNumber}, Name: {bond.securityName}"
-                        )
-            else:
-                logging.info("No bonds found in the input Kursliste (include_bonds is True).")
-        else:
-            logging.info("Skipping bond filtering as --include-bonds is False.")
-
-        # 6. Log Summary of Security Filtering
+        kept = selection.kept
         logging.info(
-            f"Security Filtering Summary: Kept {len(filtered_shares)} shares, {len(filtered_funds)} funds, {len(filtered_bonds)} bonds."
-        )
-
-        # 7. Identify Relevant Currencies (Continued)
-        # The 'relevant_currencies' set was initialized before Kursliste parsing using target_currency and tax_statement_currencies.
-        # Now, it will be expanded with currencies from the filtered securities.
-        logging.debug(
-            f"Relevant currencies before expanding with filtered securities: {relevant_currencies}"
+            f"Security Filtering Summary: Kept {kept['share']} shares, {kept['fund']} funds, {kept['bond']} bonds."
         )
-
-        # Process Shares to expand relevant_currencies
-        for share in filtered_shares:
-            if share.currency:
-                relevant_currencies.add(share.currency)
-            if share.payment:
-                for payment in share.payment:
-                    if payment.currency:
-                        relevant_currencies.add(payment.currency)
-
-        # Process Funds to expand relevant_currencies
-        for fund in filtered_funds:
-            if fund.currency:
-                relevant_currencies.add(fund.currency)
-            if fund.payment:
-                for payment in fund.payment:
-                    if payment.currency:
-                        relevant_currencies.add(payment.currency)
-
-        # Process Bonds to expand relevant_currencies
-        for bond in filtered_bonds:
-            if bond.currency:
-                relevant_currencies.add(bond.currency)
-            if bond.payment:
-                for payment in bond.payment:
-                    if payment.currency:
-                        relevant_currencies.add(payment.currency)
-
         logging.info(
-            f"Final set of relevant currencies (after processing filtered securities): {relevant_currencies if relevant_currencies else 'None'}"
+            f"Final set of relevant currencies (after processing filtered securities): {selection.relevant_currencies if selection.relevant_currencies else 'None'}"
         )
-
-        # 8. Filter ExchangeRate Objects (Daily Rates)
-        filtered_exchange_rates = []
-        if kursliste_data.exchangeRates:
-            logging.info(f"Processing {len(kursliste_data.exchangeRates)} daily exchange rates...")
-            for rate in kursliste_data.exchangeRates:
-                if rate.currency in relevant_currencies:
-                    filtered_exchange_rates.append(rate)
-            logging.info(f"Kept {len(filtered_exchange_rates)} daily exchange rates.")
-        else:
-            logging.info("No daily exchange rates (exchangeRates) found in input.")
-
-        # 9. Filter ExchangeRateMonthly Objects
-        filtered_exchange_rates_monthly = []
-        if kursliste_data.exchangeRatesMonthly:
-            logging.info(
-                f"Processing {len(kursliste_data.exchangeRatesMonthly)} monthly exchange rates..."
-            )
-            for rate in kursliste_data.exchangeRatesMonthly:
-                if rate.currency in relevant_currencies:
-                    filtered_exchange_rates_monthly.append(rate)
-            logging.info(f"Kept {len(filtered_exchange_rates_monthly)} monthly exchange rates.")
-        else:
-            logging.info("No monthly exchange rates (exchangeRatesMonthly) found in input.")
-
-        # 10. Filter ExchangeRateYearEnd Objects
-        filtered_exchange_rates_year_end = []
-        if kursliste_data.exchangeRatesYearEnd:
-            logging.info(
-                f"Processing {len(kursliste_data.exchangeRatesYearEnd)} year-end exchange rates..."
-            )
-            for rate in kursliste_data.exchangeRatesYearEnd:
-                if (
-                    rate.currency in relevant_currencies
-                ):  # Assuming ExchangeRateYearEnd has a 'currency' field for filtering
-                    filtered_exchange_rates_year_end.append(rate)
-            logging.info(f"Kept {len(filtered_exchange_rates_year_end)} year-end exchange rates.")
-        else:
-            logging.info("No year-end exchange rates (exchangeRatesYearEnd) found in input.")
-
         logging.info(
-            f"Finished exchange rate filtering. Counts: Daily={len(filtered_exchange_rates)}, Monthly={len(filtered_exchange_rates_monthly)}, YearEnd={len(filtered_exchange_rates_year_end)}"
+            f"Kept {kept['currency']} definition currencies, {kept['country']} country definitions and {kept['institution']} institutions."
         )
-
-        # 11. Filter DefinitionCurrency Elements
-        filtered_definition_currencies = []
-        if kursliste_data.currencies:  # This is List[DefinitionCurrency]
-            logging.info(f"Processing {len(kursliste_data.currencies)} definition currencies...")
-            for def_curr in kursliste_data.currencies:
-                if def_curr.currency in relevant_currencies:
-                    filtered_definition_currencies.append(def_curr)
-            logging.info(f"Kept {len(filtered_definition_currencies)} definition currencies.")
-        else:
-            logging.info("No definition currencies (currencies) found in input.")
-
-        # 12. Identify Relevant Country Codes from Securities
-        relevant_country_codes = set()
-        for sec_list in [filtered_shares, filtered_funds, filtered_bonds]:
-            for sec in sec_list:
-                if sec.country:  # Assuming securities have a 'country' attribute (ISO2 code)
-                    relevant_country_codes.add(sec.country)
-        logging.info(f"Identified relevant country codes from securities: {relevant_country_codes}")
-
-        # 13. Identify Referenced Institutions and Filter Institution Elements
-        referenced_institution_ids = set()
-        for sec_list in [filtered_shares, filtered_funds, filtered_bonds]:
-            for sec in sec_list:
-                if hasattr(sec, 'institutionId') and sec.institutionId:  # Check if attribute exists
-                    referenced_institution_ids.add(sec.institutionId)
         logging.info(
-            f"Identified {len(referenced_institution_ids)} referenced institution IDs from securities."
+            f"Finished exchange rate filtering. Counts: Daily={kept['exchangeRate']}, Monthly={kept['exchangeRateMonthly']}, YearEnd={kept['exchangeRateYearEnd']}"
         )
-
-        filtered_institutions = []
-        if kursliste_data.institutions:
-            logging.info(f"Processing {len(kursliste_data.institutions)} institutions...")
-            for inst in kursliste_data.institutions:
-                if inst.id in referenced_institution_ids:
-                    filtered_institutions.append(inst)
-            logging.info(f"Kept {len(filtered_institutions)} institutions.")
-
-            # Add country codes from filtered institutions to relevant_country_codes
-            for inst in filtered_institutions:
-                if inst.country:  # Assuming Institution has a 'country' attribute
-                    relevant_country_codes.add(inst.country)
-            logging.info(
-                f"Updated relevant country codes with institution countries: {relevant_country_codes}"
-            )
-        else:
-            logging.info("No institutions found in input.")
-
-        # 14. Filter Country Elements based on updated relevant_country_codes
-        filtered_countries = []
-        if kursliste_data.countries:
-            logging.info(f"Processing {len(kursliste_data.countries)} country definitions...")
-            for country_def in kursliste_data.countries:
-                if (
-                    country_def.country in relevant_country_codes
-                ):  # 'country' field on Country model is the ISO2 code
-                    filtered_countries.append(country_def)
-            logging.info(f"Kept {len(filtered_countries)} country definitions.")
-        else:
-            logging.info("No country definitions (countries) found in input.")
-
-        logging.info("Finished definitional element filtering.")
-
-        # 15. Construct Output Kursliste Object
-        logging.info("Constructing the output Kursliste object...")
-        output_kursliste_obj = Kursliste(
-            # Top-level attributes from original data
-            version=kursliste_data.version,
-            creationDate=kursliste_data.creationDate,
-            referingToDate=kursliste_data.referingToDate if kursliste_data.referingToDate else None,
-            year=kursliste_data.year,
-            # Definitions (Non-filtered - taken directly from source)
-            # Ensure these attributes exist on kursliste_data before assigning
-            cantons=(
-                kursliste_data.cantons
-                if hasattr(kursliste_data, 'cantons') and kursliste_data.cantons
-                else []
-            ),
-            capitalKeys=(
-                kursliste_data.capitalKeys
-                if hasattr(kursliste_data, 'capitalKeys') and kursliste_data.capitalKeys
-                else []
-            ),
-            securityGroups=(
-                kursliste_data.securityGroups
-                if hasattr(kursliste_data, 'securityGroups') and kursliste_data.securityGroups
-                else []
-            ),
-            securityTypes=(
-                kursliste_data.securityTypes
-                if hasattr(kursliste_data, 'securityTypes') and kursliste_data.securityTypes
-                else []
-            ),
-            legalForms=(
-                kursliste_data.legalForms
-                if hasattr(kursliste_data, 'legalForms') and kursliste_data.legalForms
-                else []
-            ),
-            sectors=(
-                kursliste_data.sectors
-                if hasattr(kursliste_data, 'sectors') and kursliste_data.sectors
-                else []
-            ),
-            shortCuts=(
-                kursliste_data.shortCuts
-                if hasattr(kursliste_data, 'shortCuts') and kursliste_data.shortCuts
-                else []
-            ),
-            signs=(
-                kursliste_data.signs
-                if hasattr(kursliste_data, 'signs') and kursliste_data.signs
-                else []
-            ),  # Keep signs
-            da1Rates=(
-                kursliste_data.da1Rates
-                if hasattr(kursliste_data, 'da1Rates') and kursliste_data.da1Rates
-                else []
-            ),  # Keep da1Rates
-            mediumTermBonds=(
-                kursliste_data.mediumTermBonds
-                if hasattr(kursliste_data, 'mediumTermBonds') and kursliste_data.mediumTermBonds
-                else []
-            ),
-            # Definitions (Filtered)
-            countries=filtered_countries,
-            currencies=filtered_definition_currencies,
-            institutions=filtered_institutions,
-            # Securities (Filtered)
-            bonds=filtered_bonds,
-            coinBullions=[],  # Not processed in this script
-            currencyNotes=[],  # Not processed in this script
-            derivatives=[],  # Not processed in this script
-            funds=filtered_funds,
-            liborSwaps=[],  # Not processed in this script
-            shares=filtered_shares,
-            # Exchange Rates (Filtered)
-            exchangeRates=filtered_exchange_rates,
-            exchangeRatesMonthly=filtered_exchange_rates_monthly,
-            exchangeRatesYearEnd=filtered_exchange_rates_year_end,
-        )
-        logging.info("Successfully constructed output_kursliste_obj.")
-
-        # 16. Serialize to XML
-        logging.info(f"Serializing output Kursliste to XML for output file: {output_file}...")
-        try:
-            # Use the instance method to_xml for serialization
-            # ns_map should be handled by the model's own definition
-            output_xml_bytes = output_kursliste_obj.to_xml(
-                pretty_print=True,
-                encoding="UTF-8",
-                xml_declaration=True,
-                exclude_unset=True,
-                exclude_none=True,
-            )
-            logging.info("Successfully serialized Kursliste to XML bytes using instance method.")
-        except Exception as e:
-            logging.error(
-                f"Error during XML serialization using instance method: {e}", exc_info=True
-            )
-            return 1  # Exit if serialization fails
-
-        # 17. Write to Output File
-        try:
-            with open(output_file, 'wb') as f:
-                f.write(output_xml_bytes)
-            logging.info(f"Successfully wrote filtered Kursliste to {output_file}")
-        except IOError as e:
-            logging.error(f"Error writing output XML to file {output_file}: {e}", exc_info=True)
-            return 1  # Exit if file writing fails
-
+        logging.info(f"Successfully wrote filtered Kursliste to {output_file}")
         logging.info("Script finished successfully.")
-        return 0  # Exit with success code
+        return 0
 
-    except FileNotFoundError:
-        logging.error(f"Error: Input file not found at {input_file}")
-        return 1
     except Exception as e:
         logging.error(f"An unexpected error occurred: {e}", exc_info=True)
         return 1
-    return 1  # Exit with error code
 
 
 if __name__ == "__main__":
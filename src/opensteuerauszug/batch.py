@@ -0,0 +1,288 @@
+"""
+Running many ``process`` jobs from one manifest.
+
+A batch runs the jobs of a TOML manifest across a pool of worker processes.
+Every worker imports the application once and keeps a KurslisteSessionPool, so
+all jobs it runs share the opened Kursliste files and their warm caches. Each
+job runs the regular ``process`` command with its output redirected to a log
+file; a failing job is recorded in the summary and does not stop the others.
+
+Manifest format::
+
+    [defaults]              # Optional, merged into every job
+    importer = "ibkr"
+    tax_year = 2024
+    args = ["--no-payment-reconciliation"]
+
+    [[job]]
+    name = "client-a"       # Unique, defaults to the input file name
+    input = "clients/a/flex.xml"
+    broker = "ibkr"         # Optional, passed as --broker
+    output = "out/a.pdf"    # Optional, passed as --output
+    xml_output = "out/a.xml"  # Optional, passed as --xml-output
+    log = "out/a.log"       # Optional, defaults to <log dir>/<name>.log
+    args = ["--period-from", "2024-03-01"]  # Further process options
+
+Relative paths are resolved against the directory of the manifest. The importer
+"raw" stands for ``--raw-import``.
+"""
+
+import contextlib
+import logging
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .core.kursliste_session import KurslisteSessionPool
+
+try:
+    import tomllib  # Python 3.11+
+except ModuleNotFoundError:  # pragma: no cover
+    import tomli as tomllib  # Fallback for Python < 3.11
+
+RAW_IMPORTER = "raw"
+
+_JOB_KEYS = {
+    "name",
+    "input",
+    "importer",
+    "broker",
+    "tax_year",
+    "output",
+    "xml_output",
+    "log",
+    "args",
+}
+
+
+@dataclass
+class BatchJob:
+    """One process run of a batch."""
+
+    name: str
+    input: Path
+    log: Path
+    importer: Optional[str] = None
+    broker: Optional[str] = None
+    tax_year: Optional[int] = None
+    output: Optional[Path] = None
+    xml_output: Optional[Path] = None
+    args: List[str] = field(default_factory=list)
+
+    def command_line(self, common_args: List[str]) -> List[str]:
+        """Arguments of the process command for this job, after the batch-wide ones."""
+        argv = ["process", str(self.input), *common_args]
+        if self.importer == RAW_IMPORTER:
+            argv.append("--raw-import")
+        elif self.importer:
+            argv += ["--importer", self.importer]
+        if self.broker:
+            argv += ["--broker", self.broker]
+        if self.tax_year is not None:
+            argv += ["--tax-year", str(self.tax_year)]
+        if self.output:
+            argv += ["--output", str(self.output)]
+        if self.xml_output:
+            argv += ["--xml-output", str(self.xml_output)]
+        return argv + self.args
+
+
+@dataclass
+class BatchJobResult:
+    """Outcome of one job."""
+
+    name: str
+    status: str  # "ok" or "failed"
+    seconds: float
+    log: str
+    exit_code: int = 0
+    error: Optional[str] = None
+    worker_pid: Optional[int] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+def load_manifest(manifest_path: Path, log_dir: Optional[Path] = None) -> List[BatchJob]:
+    """
+    Reads the jobs of a batch manifest.
+
+    Args:
+        manifest_path: The TOML manifest.
+        log_dir: Directory for the logs of jobs without an explicit log path.
+            Defaults to the directory of the manifest.
+
+    Raises:
+        ValueError: If the manifest is malformed.
+    """
+    with open(manifest_path, "rb") as f:
+        try:
+            data = tomllib.load(f)
+        except tomllib.TOMLDecodeError as e:
+            raise ValueError(f"Invalid batch manifest {manifest_path}: {e}") from e
+
+    base_dir = manifest_path.resolve().parent
+    log_dir = log_dir if log_dir is not None else base_dir
+    defaults = data.get("defaults", {})
+    entries = data.get("job", [])
+    if not isinstance(defaults, dict) or not isinstance(entries, list):
+        raise ValueError(
+            f"Batch manifest {manifest_path} must contain a [defaults] table and [[job]] tables."
+        )
+    if not entries:
+        raise ValueError(f"Batch manifest {manifest_path} contains no [[job]] entries.")
+
+    def resolve(value: Any) -> Path:
+        path = Path(value).expanduser()
+        return path if path.is_absolute() else base_dir / path
+
+    jobs: List[BatchJob] = []
+    names = set()
+    for number, entry in enumerate(entries, start=1):
+        unknown = (set(defaults) | set(entry)) - _JOB_KEYS
+        if unknown:
+            raise ValueError(
+                f"Job {number} of {manifest_path} has unknown keys: {', '.join(sorted(unknown))}"
+            )
+        merged: Dict[str, Any] = {**defaults, **entry}
+        merged["args"] = [str(a) for a in defaults.get("args", []) + entry.get("args", [])]
+        if "input" not in merged:
+            raise ValueError(f"Job {number} of {manifest_path} has no input.")
+        input_path = resolve(merged["input"])
+        name = str(merged.get("name") or input_path.stem)
+        if name in names:
+            raise ValueError(f"Duplicate job name '{name}' in {manifest_path}.")
+        names.add(name)
+        jobs.append(
+            BatchJob(
+                name=name,
+                input=input_path,
+                log=resolve(merged["log"]) if "log" in merged else log_dir / f"{name}.log",
+                importer=merged.get("importer"),
+                broker=merged.get("broker"),
+                tax_year=int(merged["tax_year"]) if "tax_year" in merged else None,
+                output=resolve(merged["output"]) if "output" in merged else None,
+                xml_output=resolve(merged["xml_output"]) if "xml_output" in merged else None,
+                args=merged["args"],
+            )
+        )
+    return jobs
+
+
+# The KurslisteSessionPool of the current (worker) process. Its sessions live as
+# long as the process; the OS releases the files when the worker exits.
+_session_pool: Optional[KurslisteSessionPool] = None
+
+
+def _worker_session_pool() -> KurslisteSessionPool:
+    global _session_pool
+    if _session_pool is None:
+        _session_pool = KurslisteSessionPool()
+    return _session_pool
+
+
+def run_job(job: BatchJob, common_args: List[str]) -> BatchJobResult:
+    """Runs one job in the current process, capturing its output in the job's log."""
+    # Imported here: the CLI module imports this one to register the batch command
+    from typer.main import get_command
+
+    from .steuerauszug import app
+
+    start = time.perf_counter()
+    exit_code = 0
+    error: Optional[str] = None
+    for path in (job.log, job.output, job.xml_output):
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+    with open(job.log, "w", encoding="utf-8") as log_file:
+        handler = logging.StreamHandler(log_file)
+        root_logger = logging.getLogger()
+        root_logger.addHandler(handler)
+        try:
+            with contextlib.redirect_stdout(log_file), contextlib.redirect_stderr(log_file):
+                exit_code = (
+                    get_command(app).main(
+                        args=job.command_line(common_args),
+                        prog_name="opensteuerauszug",
+                        standalone_mode=False,
+                        obj=_worker_session_pool(),
+                    )
+                    or 0
+                )
+        except Exception as e:  # Isolate the failure to this job
+            exit_code = 1
+            error = f"{type(e).__name__}: {e}"
+            print(f"Batch job failed: {error}", file=log_file)
+            traceback.print_exc(limit=20, file=log_file)
+        finally:
+            root_logger.removeHandler(handler)
+            _worker_session_pool().end_job()
+    if exit_code and error is None:
+        error = f"process exited with code {exit_code}, see {job.log}"
+    return BatchJobResult(
+        name=job.name,
+        status="ok" if exit_code == 0 else "failed",
+        seconds=time.perf_counter() - start,
+        log=str(job.log),
+        exit_code=exit_code,
+        error=error,
+        worker_pid=os.getpid(),
+    )
+
+
+def run_batch(
+    jobs: List[BatchJob], common_args: List[str], workers: int = 1
+) -> List[BatchJobResult]:
+    """
+    Runs the jobs, in a pool of worker processes if workers > 1.
+
+    Returns the results in manifest order. A worker process that dies takes its
+    running jobs with it; they are reported as failed.
+    """
+    if workers <= 1:
+        return [run_job(job, common_args) for job in jobs]
+
+    results: Dict[str, BatchJobResult] = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_job, job, common_args): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                results[job.name] = future.result()
+            except Exception as e:
+                results[job.name] = BatchJobResult(
+                    name=job.name,
+                    status="failed",
+                    seconds=0.0,
+                    log=str(job.log),
+                    exit_code=1,
+                    error=f"Worker failed: {type(e).__name__}: {e}",
+                )
+            print(f"[{len(results)}/{len(jobs)}] {job.name}: {results[job.name].status}")
+    return [results[job.name] for job in jobs]
+
+
+def format_summary(results: List[BatchJobResult], wall_seconds: float) -> str:
+    """Per-job status and timing table for the CLI output."""
+    name_width = max([len("job")] + [len(r.name) for r in results])
+    lines = [f"{'job':<{name_width}}  {'status':<6}  {'seconds':>8}  detail"]
+    for r in results:
+        lines.append(
+            f"{r.name:<{name_width}}  {r.status:<6}  {r.seconds:>8.2f}  {r.error or r.log}"
+        )
+    failed = sum(1 for r in results if not r.ok)
+    job_seconds = sum(r.seconds for r in results)
+    lines.append(
+        f"{len(results) - failed} of {len(results)} jobs succeeded, {failed} failed. "
+        f"Wall time {wall_seconds:.2f}s, job time {job_seconds:.2f}s."
+    )
+    return "\n".join(lines)
+
+
+def results_as_dicts(results: List[BatchJobResult]) -> List[Dict[str, Any]]:
+    return [asdict(r) for r in results]
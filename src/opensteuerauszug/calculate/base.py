@@ -1,5 +1,20 @@
+import types
 from enum import Enum
-from typing import Any, List, Set, TypeVar, cast
+from typing import (
+    Annotated,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+    get_args,
+    get_origin,
+)
 from decimal import Decimal
 
 from opensteuerauszug.model.ech0196 import TaxStatement, BaseXmlModel, Security
@@ -27,6 +42,109 @@ class CalculationError(Exception):
         super().__init__(message)
 
 
+_NO_INDEX = object()
+
+
+class LazyPath:
+    """
+    Path of a model within the statement, e.g. ``listOfSecurities.depot[0].security[CH0012]``.
+
+    _process_model creates one for every model it visits, but the text is only
+    built (and then kept) when a handler actually uses it, typically for an
+    error or a modified field. It formats, compares and hashes like the
+    equivalent str, and other str methods are delegated to the text.
+    """
+
+    __slots__ = ("_parent", "_field", "_index", "_text")
+
+    def __init__(self, parent: "ModelPath", field: str, index: Any = _NO_INDEX):
+        self._parent = parent
+        self._field = field
+        self._index = index
+        self._text: Optional[str] = None
+
+    def __str__(self) -> str:
+        if self._text is None:
+            parent = str(self._parent)
+            text = f"{parent}.{self._field}" if parent else self._field
+            if self._index is not _NO_INDEX:
+                text = f"{text}[{self._index}]"
+            self._text = text
+        return self._text
+
+    def __format__(self, format_spec: str) -> str:
+        return format(str(self), format_spec)
+
+    def __repr__(self) -> str:
+        return repr(str(self))
+
+    def __bool__(self) -> bool:
+        return True  # Never empty, it always has a field name
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (LazyPath, str)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    def __add__(self, other: str) -> str:
+        return str(self) + other
+
+    def __radd__(self, other: str) -> str:
+        return other + str(self)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(str(self), name)
+
+
+# The path handed to handlers: "" for the root, a LazyPath below it
+ModelPath = Union[str, LazyPath]
+
+# A _handle_<ClassName> or _leave_<ClassName> method
+Handler = Callable[[Any, ModelPath], None]
+
+
+def _may_hold_model(annotation: Any) -> bool:
+    """Whether a field with this annotation can hold a BaseXmlModel or a list of them."""
+    origin = get_origin(annotation)
+    if origin is Annotated:
+        return _may_hold_model(get_args(annotation)[0])
+    if origin is Union or origin is types.UnionType:
+        return any(_may_hold_model(arg) for arg in get_args(annotation))
+    if origin is list:
+        args = get_args(annotation)
+        return not args or _may_hold_model(args[0])
+    if origin is not None:  # dict, tuple, Literal, ...: not traversed by _process_model
+        return False
+    if isinstance(annotation, type):
+        return (
+            issubclass(annotation, BaseXmlModel)
+            or issubclass(BaseXmlModel, annotation)
+            or annotation is list
+        )
+    return True  # Any, TypeVars, unresolved forward references: check at runtime
+
+
+# Model class -> names of its fields that may hold models, in field order
+_CHILD_FIELDS: Dict[type, Tuple[str, ...]] = {}
+
+
+def _child_fields(model_class: type) -> Tuple[str, ...]:
+    fields = _CHILD_FIELDS.get(model_class)
+    if fields is None:
+        fields = tuple(
+            name
+            for name, field_info in model_class.model_fields.items()  # type: ignore[attr-defined]
+            if not name.startswith('_')
+            and name != 'unknown_attrs'
+            and _may_hold_model(field_info.annotation)
+        )
+        _CHILD_FIELDS[model_class] = fields
+    return fields
+
+
 class BaseCalculator:
     """Base class for all calculators that process the tax statement model."""
 
@@ -34,6 +152,8 @@ class BaseCalculator:
         self.mode = mode
         self.errors: List[CalculationError] = []
         self.modified_fields: Set[str] = set()
+        # Model class -> bound _handle_<ClassName> and _leave_<ClassName> methods
+        self._handlers: Dict[type, Tuple[Optional[Handler], Optional[Handler]]] = {}
 
     def calculate(self, tax_statement: TaxStatement) -> TaxStatement:
         """
@@ -45,57 +165,97 @@ class BaseCalculator:
         Returns:
             The processed tax statement
         """
-        self.errors = []
-        self.modified_fields = set()
+        self._begin_calculation(tax_statement)
 
         # Process the tax statement
         self._process_tax_statement(tax_statement)
 
+        return self._finish_calculation(tax_statement)
+
+    def _begin_calculation(self, tax_statement: TaxStatement) -> None:
+        """
+        Reset the per-run state before the statement is traversed.
+
+        Subclasses extend this instead of overriding calculate(), so that a
+        CalculatorPipeline can run their traversal fused with other calculators.
+        """
+        self.errors = []
+        self.modified_fields = set()
+        self._handlers = {}
+
+    def _finish_calculation(self, tax_statement: TaxStatement) -> TaxStatement:
+        """Complete the run after the traversal, e.g. to report collected warnings."""
         return tax_statement
 
+    def _can_share_traversal(self) -> bool:
+        """
+        Whether a CalculatorPipeline may call this calculator's hooks from a
+        traversal shared with other calculators, i.e. the traversal itself is not
+        customized.
+        """
+        calculator_type = type(self)
+        return (
+            calculator_type._process_tax_statement is BaseCalculator._process_tax_statement
+            and calculator_type._process_model is BaseCalculator._process_model
+        )
+
+    def _resolve_handlers(self, model_type: type) -> Tuple[Optional[Handler], Optional[Handler]]:
+        """
+        The hooks of a model class: ``_handle_<ClassName>`` is called before and
+        ``_leave_<ClassName>`` after the nested models are processed.
+        """
+        name = model_type.__name__
+        return getattr(self, f"_handle_{name}", None), getattr(self, f"_leave_{name}", None)
+
     def _process_tax_statement(self, tax_statement: TaxStatement) -> None:
         """Process the main TaxStatement object. Subclasses can override this."""
         self._process_model(tax_statement, "")
 
-    def _process_model(self, model: BaseXmlModel, path_prefix: str) -> None:
+    def _process_model(self, model: BaseXmlModel, path_prefix: ModelPath) -> None:
         """
         Recursively process a model and its nested models using a visitor pattern.
 
+        The handlers of a model class and the fields that can hold nested models
+        are looked up once per class. Paths are passed as LazyPath and only
+        formatted when a handler uses them.
+
         Args:
             model: The model to process
             path_prefix: The path to this model from the root
         """
         # Call the appropriate handler method if it exists
         model_type = type(model)
-        handler_name = f"_handle_{model_type.__name__}"
-        handler = getattr(self, handler_name, None)
+        try:
+            handler, leave_handler = self._handlers[model_type]
+        except KeyError:
+            handler, leave_handler = self._handlers[model_type] = self._resolve_handlers(model_type)
 
         if handler:
             handler(cast(Any, model), path_prefix)
 
-        # Get all fields that are BaseXmlModel instances or lists of BaseXmlModel
-        for field_name, field_value in model.__dict__.items():
-            # Skip internal fields and unknown_attrs
-            if field_name.startswith('_') or field_name == 'unknown_attrs':
-                continue
-
-            field_path = f"{path_prefix}.{field_name}" if path_prefix else field_name
+        model_dict = model.__dict__
+        for field_name in _child_fields(model_type):
+            field_value = model_dict.get(field_name)
 
             # Process lists of models
             if isinstance(field_value, list):
                 for i, item in enumerate(field_value):
                     if isinstance(item, BaseXmlModel):
-                        readable_index = f"{i}"
+                        readable_index: Any = i
                         if isinstance(item, Security):
-                            readable_index = item.isin or item.valorNumber or f"{i}"
-                        item_path = f"{field_path}[{readable_index}]"
-                        self._process_model(item, item_path)
+                            readable_index = item.isin or item.valorNumber or i
+                        self._process_model(item, LazyPath(path_prefix, field_name, readable_index))
 
             # Process nested models
             elif isinstance(field_value, BaseXmlModel):
-                self._process_model(field_value, field_path)
+                self._process_model(field_value, LazyPath(path_prefix, field_name))
+
+        if leave_handler:
+            leave_handler(cast(Any, model), path_prefix)
 
-    def _set_field_value(self, model: BaseXmlModel, field_name: str, value: Any, path: str) -> None:
+    def _set_field_value(
+        self, model: BaseXmlModel, field_name: str, value: Any, path: ModelPath
+    ) -> None:
         """
         Set a field value according to the calculation mode.
 
@@ -28,6 +28,7 @@ class FillInTaxValueCalculator(KurslisteTaxValueCalculator):
         flag_override_provider: Optional[FlagOverrideProvider] = None,
         keep_existing_payments: bool = False,
         render_language: Language = DEFAULT_LANGUAGE,
+        workers: int = 1,
     ):
         super().__init__(
             mode,
@@ -35,6 +36,7 @@ class FillInTaxValueCalculator(KurslisteTaxValueCalculator):
             flag_override_provider=flag_override_provider,
             keep_existing_payments=keep_existing_payments,
             render_language=render_language,
+            workers=workers,
         )
         logger.info(
             "FillInTaxValueCalculator initialized with mode: %s and provider: %s",
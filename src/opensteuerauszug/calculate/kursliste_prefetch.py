@@ -0,0 +1,153 @@
+"""Warm the Kursliste caches for a whole tax statement before calculation.
+
+The tax value calculators look up securities and exchange rates one node at a
+time while visiting the statement. This step runs between ``CleanupCalculator``
+and the tax value calculators: it collects every identifier and every
+(currency, date) pair the later calculators will ask for, and resolves them
+up front with the batch APIs of :class:`KurslisteAccessor`.
+"""
+
+import logging
+import time
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Optional, Set, Tuple
+
+from opensteuerauszug.core.kursliste_manager import KurslisteManager
+from opensteuerauszug.model.ech0196 import (
+    BankAccountPayment,
+    BankAccountTaxValue,
+    LiabilityAccountPayment,
+    LiabilityAccountTaxValue,
+    Security,
+    SecurityPayment,
+    SecurityStock,
+    SecurityTaxValue,
+    TaxStatement,
+)
+from .base import BaseCalculator, CalculationMode
+
+logger = logging.getLogger(__name__)
+
+
+class KurslistePrefetchCalculator(BaseCalculator):
+    """
+    Collects all Kursliste lookups of a tax statement and resolves them in bulk.
+
+    The statement itself is never modified. After ``calculate`` the attributes
+    ``loaded_securities``, ``loaded_exchange_rates`` and ``elapsed_seconds``
+    describe what was loaded.
+    """
+
+    _CHF_CURRENCY = "CHF"
+
+    def __init__(self, kursliste_manager: KurslisteManager):
+        super().__init__(CalculationMode.VERIFY)
+        self.kursliste_manager = kursliste_manager
+        self._valors_by_year: Dict[int, Set[int]] = defaultdict(set)
+        self._isins_by_year: Dict[int, Dict[str, Optional[int]]] = defaultdict(dict)
+        self._rate_keys: Set[Tuple[str, date]] = set()
+        self.loaded_securities = 0
+        self.loaded_exchange_rates = 0
+        self.elapsed_seconds = 0.0
+        self._start = 0.0
+
+    def _begin_calculation(self, tax_statement: TaxStatement) -> None:
+        super()._begin_calculation(tax_statement)
+        self._start = time.perf_counter()
+        self._valors_by_year = defaultdict(set)
+        self._isins_by_year = defaultdict(dict)
+        self._rate_keys = set()
+        self.loaded_securities = 0
+        self.loaded_exchange_rates = 0
+
+    def _finish_calculation(self, tax_statement: TaxStatement) -> TaxStatement:
+        self._prefetch_securities()
+        self._prefetch_exchange_rates()
+
+        self.elapsed_seconds = time.perf_counter() - self._start
+        logger.info(
+            "Kursliste prefetch loaded %d securities and %d exchange rates in %.3fs",
+            self.loaded_securities,
+            self.loaded_exchange_rates,
+            self.elapsed_seconds,
+        )
+        return tax_statement
+
+    def _prefetch_securities(self) -> None:
+        for year in sorted(set(self._valors_by_year) | set(self._isins_by_year)):
+            accessor = self.kursliste_manager.get_kurslisten_for_year(year)
+            if not accessor:
+                continue
+            found_valors: Set[int] = set()
+            valors = self._valors_by_year.get(year)
+            if valors:
+                for valor, securities in accessor.get_securities_by_valors(valors).items():
+                    if securities:
+                        found_valors.add(valor)
+                        self.loaded_securities += len(securities)
+            # The calculators only fall back to the ISIN when the valor lookup misses.
+            isins = [
+                isin
+                for isin, valor in self._isins_by_year.get(year, {}).items()
+                if valor not in found_valors
+            ]
+            if isins:
+                for securities in accessor.get_securities_by_isins(isins).values():
+                    self.loaded_securities += len(securities)
+
+    def _prefetch_exchange_rates(self) -> None:
+        for currency, reference_date in sorted(self._rate_keys):
+            accessor = self.kursliste_manager.get_kurslisten_for_year(reference_date.year)
+            if not accessor:
+                continue
+            if accessor.get_exchange_rate(currency, reference_date) is not None:
+                self.loaded_exchange_rates += 1
+
+    def _add_rate(self, currency: Optional[str], reference_date: Optional[date]) -> None:
+        if currency and reference_date and currency != self._CHF_CURRENCY:
+            self._rate_keys.add((currency, reference_date))
+
+    def _handle_Security(self, security: Security, path_prefix: str) -> None:
+        # Mirrors the year selection of KurslisteTaxValueCalculator._handle_Security
+        lookup_year = None
+        if security.taxValue and security.taxValue.referenceDate:
+            lookup_year = security.taxValue.referenceDate.year
+        elif security.stock and security.stock[-1].referenceDate:
+            lookup_year = security.stock[-1].referenceDate.year
+        if lookup_year is None:
+            return
+
+        valor: Optional[int] = None
+        if security.valorNumber:
+            valor = int(security.valorNumber)
+            self._valors_by_year[lookup_year].add(valor)
+        if security.isin:
+            self._isins_by_year[lookup_year][security.isin] = valor
+
+    def _handle_SecurityTaxValue(self, sec_tax_value: SecurityTaxValue, path_prefix: str) -> None:
+        self._add_rate(sec_tax_value.balanceCurrency, sec_tax_value.referenceDate)
+
+    def _handle_SecurityStock(self, stock: SecurityStock, path_prefix: str) -> None:
+        self._add_rate(stock.balanceCurrency, stock.referenceDate)
+
+    def _handle_SecurityPayment(self, sec_payment: SecurityPayment, path_prefix: str) -> None:
+        self._add_rate(sec_payment.amountCurrency, sec_payment.paymentDate)
+
+    def _handle_BankAccountTaxValue(
+        self, ba_tax_value: BankAccountTaxValue, path_prefix: str
+    ) -> None:
+        self._add_rate(ba_tax_value.balanceCurrency, ba_tax_value.referenceDate)
+
+    def _handle_BankAccountPayment(self, ba_payment: BankAccountPayment, path_prefix: str) -> None:
+        self._add_rate(ba_payment.amountCurrency, ba_payment.paymentDate)
+
+    def _handle_LiabilityAccountTaxValue(
+        self, lia_tax_value: LiabilityAccountTaxValue, path_prefix: str
+    ) -> None:
+        self._add_rate(lia_tax_value.balanceCurrency, lia_tax_value.referenceDate)
+
+    def _handle_LiabilityAccountPayment(
+        self, lia_payment: LiabilityAccountPayment, path_prefix: str
+    ) -> None:
+        self._add_rate(lia_payment.amountCurrency, lia_payment.paymentDate)
@@ -1,6 +1,9 @@
+import copy
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import date, timedelta
 from decimal import Decimal
-from typing import Optional, List, Set
+from typing import Any, Optional, List, Set
 import logging
 
 from opensteuerauszug.core.exchange_rate_provider import ExchangeRateProvider
@@ -13,12 +16,14 @@ from opensteuerauszug.model.ech0196 import (
     SecurityPayment,
     SecurityStock,
     PaymentTypeOriginal,
+    TaxStatement,
+    ListOfSecurities,
 )
 from opensteuerauszug.model.kursliste import PaymentTypeESTV, SecurityGroupESTV
 from opensteuerauszug.model.critical_warning import CriticalWarning, CriticalWarningCategory
 from opensteuerauszug.core.position_reconciler import PositionReconciler
 from opensteuerauszug.core.constants import WITHHOLDING_TAX_RATE
-from .base import CalculationMode
+from .base import BaseCalculator, CalculationError, CalculationMode, ModelPath
 from .minimal_tax_value import MinimalTaxValueCalculator
 from opensteuerauszug.util.converters import security_tax_value_to_stock
 from opensteuerauszug.render.translations import get_text, DEFAULT_LANGUAGE, Language
@@ -42,6 +47,17 @@ def _has_intervening_event(d1: date, d2: date, event_dates: Set[date]) -> bool:
     return any(lo < d < hi for d in event_dates)
 
 
+@dataclass
+class _SecurityResult:
+    """What processing one security contributed to the shared calculator state."""
+
+    errors: List[CalculationError] = field(default_factory=list)
+    modified_fields: Set[str] = field(default_factory=set)
+    missing_kursliste_entries: List[str] = field(default_factory=list)
+    stock_split_warnings: List[dict] = field(default_factory=list)
+    previous_year_exdate_warnings: List[dict] = field(default_factory=list)
+
+
 # Known sign types that we explicitly handle. Any sign not in this set will raise an error.
 # Signs are defined in the ESTV Kursliste and have specific tax treatment meanings.
 # - KEP: Return of capital contributions (Rückzahlung Kapitaleinlagen) - non-taxable, skip payment
@@ -94,7 +110,14 @@ class KurslisteTaxValueCalculator(MinimalTaxValueCalculator):
         flag_override_provider: Optional[FlagOverrideProvider] = None,
         keep_existing_payments: bool = False,
         render_language: Language = DEFAULT_LANGUAGE,
+        workers: int = 1,
     ):
+        """
+        Args:
+            workers: Threads processing the securities of the statement in
+                parallel; 1 processes them one after the other in the traversal.
+                The result does not depend on the number of threads.
+        """
         super().__init__(
             mode, exchange_rate_provider, keep_existing_payments=keep_existing_payments
         )
@@ -114,11 +137,17 @@ class KurslisteTaxValueCalculator(MinimalTaxValueCalculator):
         self._stock_split_warnings: List[dict] = []
         self._previous_year_exdate_warnings = []
         self._all_securities: List[Security] = []
+        # Valor numbers of _all_securities when the run started
+        self._all_security_valors: List[Any] = []
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending_securities: List["Future[_SecurityResult]"] = []
 
     def _translate(self, key: str) -> str:
         return get_text(key, self.render_language)
 
-    def calculate(self, tax_statement):
+    def _begin_calculation(self, tax_statement: TaxStatement) -> None:
+        super()._begin_calculation(tax_statement)
         self._missing_kursliste_entries = []
         self._stock_split_warnings = []
         self._previous_year_exdate_warnings = []
@@ -128,7 +157,13 @@ class KurslisteTaxValueCalculator(MinimalTaxValueCalculator):
         if tax_statement.listOfSecurities:
             for depot in tax_statement.listOfSecurities.depot:
                 self._all_securities.extend(depot.security)
-        result = super().calculate(tax_statement)
+        # Securities may get their valor number from the Kursliste during the run. The
+        # split validation matches the valors as they were at the start, so its result
+        # does not depend on which securities have already been processed.
+        self._all_security_valors = [sec.valorNumber for sec in self._all_securities]
+
+    def _finish_calculation(self, tax_statement: TaxStatement) -> TaxStatement:
+        result = super()._finish_calculation(tax_statement)
         if self._missing_kursliste_entries:
             logger.warning("Missing Kursliste entries for securities:")
             for entry in self._missing_kursliste_entries:
@@ -166,6 +201,64 @@ class KurslisteTaxValueCalculator(MinimalTaxValueCalculator):
             )
         return result
 
+    def _can_share_traversal(self) -> bool:
+        return self.workers <= 1
+
+    def _process_tax_statement(self, tax_statement: TaxStatement) -> None:
+        if self.workers <= 1:
+            super()._process_tax_statement(tax_statement)
+            return
+        with ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="tax-value"
+        ) as executor:
+            self._executor = executor
+            self._pending_securities = []
+            try:
+                super()._process_tax_statement(tax_statement)
+            finally:
+                self._executor = None
+                self._pending_securities = []
+
+    def _process_model(self, model: Any, path_prefix: ModelPath) -> None:
+        """
+        With several workers, each Security is handed to the thread pool instead of
+        being traversed here. Their results are merged in statement order once the
+        whole list of securities has been submitted.
+        """
+        if self._executor is None:
+            super()._process_model(model, path_prefix)
+        elif type(model) is Security:
+            self._pending_securities.append(
+                self._executor.submit(self._calculate_security, model, path_prefix)
+            )
+        else:
+            super()._process_model(model, path_prefix)
+            if type(model) is ListOfSecurities:
+                for future in self._pending_securities:
+                    self._merge_security_result(future.result())
+                self._pending_securities = []
+
+    def _calculate_security(self, security: Security, path_prefix: ModelPath) -> _SecurityResult:
+        """Traverses one security with a copy of this calculator that has its own state."""
+        result = _SecurityResult()
+        worker = copy.copy(self)
+        worker._executor = None
+        worker._handlers = {}
+        worker.errors = result.errors
+        worker.modified_fields = result.modified_fields
+        worker._missing_kursliste_entries = result.missing_kursliste_entries
+        worker._stock_split_warnings = result.stock_split_warnings
+        worker._previous_year_exdate_warnings = result.previous_year_exdate_warnings
+        BaseCalculator._process_model(worker, security, path_prefix)
+        return result
+
+    def _merge_security_result(self, result: _SecurityResult) -> None:
+        self.errors.extend(result.errors)
+        self.modified_fields.update(result.modified_fields)
+        self._missing_kursliste_entries.extend(result.missing_kursliste_entries)
+        self._stock_split_warnings.extend(result.stock_split_warnings)
+        self._previous_year_exdate_warnings.extend(result.previous_year_exdate_warnings)
+
     def _handle_Security(self, security: Security, path_prefix: str) -> None:
         if security.securityCategory == "BOND":
             raise ValueError(
@@ -456,8 +549,8 @@ class KurslisteTaxValueCalculator(MinimalTaxValueCalculator):
 
             # 2. Validate the positive mutation on the new security
             new_security = None
-            for sec in self._all_securities:
-                if sec.valorNumber == valor_number_new:
+            for sec, valor in zip(self._all_securities, self._all_security_valors):
+                if valor == valor_number_new:
                     new_security = sec
                     break
 
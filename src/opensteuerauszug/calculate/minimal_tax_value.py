@@ -86,14 +86,13 @@ class MinimalTaxValueCalculator(BaseCalculator):
         chf_amount = amount * exchange_rate
         return chf_amount, exchange_rate
 
-    def calculate(self, tax_statement: TaxStatement) -> TaxStatement:
-        """
-        Processes the tax statement.
-        """
+    def _begin_calculation(self, tax_statement: TaxStatement) -> None:
+        super()._begin_calculation(tax_statement)
         self._current_account_is_type_A = None  # Reset state at the beginning of a calculation run
         self._current_security_is_type_A = None  # Reset state
         self._current_security_country = None  # Reset state
-        super().calculate(tax_statement)
+
+    def _finish_calculation(self, tax_statement: TaxStatement) -> TaxStatement:
         self.logger.info(
             "MinimalTaxValueCalculator: Finished processing. Errors: %s, Modified fields: %s",
             len(self.errors),
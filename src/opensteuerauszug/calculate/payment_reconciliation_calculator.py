@@ -7,6 +7,7 @@ from datetime import date
 from decimal import Decimal
 from typing import Dict, List, Optional
 
+from opensteuerauszug.calculate.base import BaseCalculator, CalculationMode, ModelPath
 from opensteuerauszug.model.critical_warning import CriticalWarningCategory
 from opensteuerauszug.model.ech0196 import (
     PaymentTypeOriginal,
@@ -44,7 +45,7 @@ class _KurslisteAgg:
     short_stock: Optional[bool] = None
 
 
-class PaymentReconciliationCalculator:
+class PaymentReconciliationCalculator(BaseCalculator):
     _COUNTRIES_WHERE_OVERWITHHOLDING_SUGGESTS_CALCULATION_ISSUE = {
         "GB",  # United Kingdom (0% WHT)
         "NL",  # Netherlands (15% - matches treaty)
@@ -80,22 +81,30 @@ class PaymentReconciliationCalculator:
         tolerance_frac: Decimal = Decimal("0.001"),
         allow_above_treaty_withholding: bool = False,
     ):
+        super().__init__(CalculationMode.VERIFY)
         self.tolerance_chf = tolerance_chf
         self.tolerance_frac = tolerance_frac
         self.allow_above_treaty_withholding = allow_above_treaty_withholding
+        self._report = PaymentReconciliationReport()
 
     def calculate(self, tax_statement: TaxStatement) -> TaxStatement:
-        report = PaymentReconciliationReport()
-
-        if not tax_statement.listOfSecurities or not tax_statement.listOfSecurities.depot:
-            tax_statement.payment_reconciliation_report = report
-            return tax_statement
-
-        for depot in tax_statement.listOfSecurities.depot:
-            for security in depot.security:
-                rows = self._reconcile_security(security)
-                report.rows.extend(rows)
-
+        # Standalone only the securities need visiting, not the whole statement
+        self._begin_calculation(tax_statement)
+        if tax_statement.listOfSecurities:
+            for depot in tax_statement.listOfSecurities.depot:
+                for security in depot.security:
+                    self._leave_Security(security, "")
+        return self._finish_calculation(tax_statement)
+
+    def _begin_calculation(self, tax_statement: TaxStatement) -> None:
+        super()._begin_calculation(tax_statement)
+        self._report = PaymentReconciliationReport()
+
+    def _leave_Security(self, security: Security, path_prefix: ModelPath) -> None:
+        self._report.rows.extend(self._reconcile_security(security))
+
+    def _finish_calculation(self, tax_statement: TaxStatement) -> TaxStatement:
+        report = self._report
         for row in report.rows:
             if row.status == "match":
                 report.match_count += 1
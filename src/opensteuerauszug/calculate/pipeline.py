@@ -0,0 +1,269 @@
+"""
+Running the calculators of a phase with as few traversals as possible.
+
+Every visitor calculator walks the whole TaxStatement. A CalculatorPipeline
+runs the hooks of several of them (``_handle_<ClassName>`` before and
+``_leave_<ClassName>`` after the nested models of a node) in one shared
+traversal, as long as their declared dependencies allow it:
+
+* ``after``: the step starts only once the named steps have completed, including
+  their ``_finish_calculation``. It always begins a new traversal.
+* ``after_each_node``: at every node the hooks of the step run after those of the
+  named steps, which may share its traversal. This is enough when a step only
+  reads what the earlier ones computed for the current node and the nodes
+  before it, e.g. a ``_leave_Security`` hook that needs the payments the tax
+  value calculator set on that security.
+
+Calculators that are not plain BaseCalculator visitors (such as CleanupCalculator
+or TotalCalculator, which walk the statement themselves, or a tax value calculator
+processing securities in parallel) run on their own. With fusion disabled every
+step runs on its own in the same order, which gives the same result and allows
+inspecting the statement between the steps.
+
+Usage::
+
+    pipeline = CalculatorPipeline()
+    pipeline.add("tax_value", KurslisteTaxValueCalculator(...))
+    pipeline.add("withholding_cap", WithholdingCapCalculator(), after_each_node=["tax_value"])
+    pipeline.add("total", TotalCalculator(...), after=["withholding_cap"])
+    statement = pipeline.run(statement)
+    print(pipeline.format_timings())
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from opensteuerauszug.model.ech0196 import TaxStatement
+
+from .base import BaseCalculator, Handler, ModelPath
+
+logger = logging.getLogger(__name__)
+
+# Anything with a calculate(TaxStatement) -> TaxStatement method
+Calculator = Any
+
+
+@dataclass
+class PipelineStep:
+    """A calculator registered with a CalculatorPipeline."""
+
+    name: str
+    calculator: Calculator
+    after: Tuple[str, ...] = ()
+    after_each_node: Tuple[str, ...] = ()
+    fuse: bool = True
+    on_done: Optional[Callable[[TaxStatement], None]] = None
+
+    @property
+    def fusable(self) -> bool:
+        """Whether the calculator can share a traversal through its hooks."""
+        return (
+            self.fuse
+            and isinstance(self.calculator, BaseCalculator)
+            and self.calculator._can_share_traversal()
+        )
+
+
+@dataclass
+class StepTiming:
+    """Time spent in one step of a pipeline run."""
+
+    name: str
+    seconds: float
+    traversal: int  # Number of the traversal the step ran in, starting at 1
+    fused_with: List[str] = field(default_factory=list)
+
+
+class _FusedPass(BaseCalculator):
+    """One traversal calling the hooks of several calculators at each node, in step order."""
+
+    def __init__(self, calculators: List[BaseCalculator], seconds: List[float]):
+        super().__init__()
+        self._calculators = calculators
+        self._seconds = seconds  # Time in the hooks per calculator, updated in place
+
+    def _resolve_handlers(self, model_type: type) -> Tuple[Optional[Handler], Optional[Handler]]:
+        handlers = [calculator._resolve_handlers(model_type) for calculator in self._calculators]
+        return (
+            self._chain([(i, h[0]) for i, h in enumerate(handlers) if h[0]]),
+            self._chain([(i, h[1]) for i, h in enumerate(handlers) if h[1]]),
+        )
+
+    def _chain(self, handlers: List[Tuple[int, Handler]]) -> Optional[Handler]:
+        if not handlers:
+            return None
+        seconds = self._seconds
+        perf_counter = time.perf_counter
+
+        def call_all(model: Any, path_prefix: ModelPath) -> None:
+            for index, handler in handlers:
+                start = perf_counter()
+                handler(model, path_prefix)
+                seconds[index] += perf_counter() - start
+
+        return call_all
+
+
+class CalculatorPipeline:
+    """
+    Calculators with explicit ordering dependencies, run in fused traversals.
+
+    Steps run in the order they were added unless a dependency requires
+    otherwise. After a run, ``timings`` holds the time of every step; for fused
+    steps that is the time spent in their own hooks, the remaining time of a
+    shared traversal is reported as ``traversal overhead``.
+    """
+
+    def __init__(self, fuse: bool = True):
+        """
+        Args:
+            fuse: Share traversals between steps where the dependencies allow.
+                When False every step runs on its own.
+        """
+        self.fuse = fuse
+        self.steps: Dict[str, PipelineStep] = {}
+        self.timings: List[StepTiming] = []
+        self.overhead_seconds = 0.0
+
+    def add(
+        self,
+        name: str,
+        calculator: Calculator,
+        after: Iterable[str] = (),
+        after_each_node: Iterable[str] = (),
+        fuse: bool = True,
+        on_done: Optional[Callable[[TaxStatement], None]] = None,
+    ) -> "CalculatorPipeline":
+        """
+        Registers a calculator.
+
+        Args:
+            name: Unique name of the step, used for dependencies and timings.
+            calculator: The calculator to run.
+            after: Steps that must have completed before this one starts.
+            after_each_node: Steps whose hooks must run before this one's at each
+                node; they may share a traversal with this step.
+            fuse: Allow this step to share a traversal with other steps.
+            on_done: Called with the statement once the step (and the traversal
+                it shares) has completed, e.g. to report its results.
+
+        Raises:
+            ValueError: If the name is already taken.
+        """
+        if name in self.steps:
+            raise ValueError(f"Duplicate calculator step '{name}'")
+        self.steps[name] = PipelineStep(
+            name, calculator, tuple(after), tuple(after_each_node), fuse, on_done
+        )
+        return self
+
+    def plan(self) -> List[List[PipelineStep]]:
+        """
+        The traversals a run performs, each a list of the steps it runs.
+
+        Raises:
+            ValueError: If a dependency names an unknown step or the dependencies
+                contain a cycle.
+        """
+        for step in self.steps.values():
+            for dependency in step.after + step.after_each_node:
+                if dependency not in self.steps:
+                    raise ValueError(
+                        f"Calculator step '{step.name}' depends on unknown step '{dependency}'"
+                    )
+
+        # Topological order, preferring the order in which the steps were added
+        ordered: List[PipelineStep] = []
+        done: set = set()
+        pending = list(self.steps.values())
+        while pending:
+            for step in pending:
+                if all(d in done for d in step.after + step.after_each_node):
+                    break
+            else:
+                raise ValueError(
+                    "Calculator steps have cyclic dependencies: "
+                    + ", ".join(step.name for step in pending)
+                )
+            pending.remove(step)
+            ordered.append(step)
+            done.add(step.name)
+
+        passes: List[List[PipelineStep]] = []
+        for step in ordered:
+            current = passes[-1] if passes else None
+            if (
+                self.fuse
+                and current
+                and step.fusable
+                and all(member.fusable for member in current)
+                and not any(member.name in step.after for member in current)
+            ):
+                current.append(step)
+            else:
+                passes.append([step])
+        return passes
+
+    def describe(self) -> str:
+        """One line listing the traversals, e.g. ``cleanup; tax_value + withholding_cap``."""
+        return "; ".join(" + ".join(step.name for step in steps) for steps in self.plan())
+
+    def run(self, tax_statement: TaxStatement) -> TaxStatement:
+        """Runs all steps on the statement and returns it."""
+        self.timings = []
+        self.overhead_seconds = 0.0
+        for number, steps in enumerate(self.plan(), start=1):
+            if len(steps) == 1:
+                logger.debug("Running calculator step %s", steps[0].name)
+                start = time.perf_counter()
+                tax_statement = steps[0].calculator.calculate(tax_statement)
+                self.timings.append(StepTiming(steps[0].name, time.perf_counter() - start, number))
+            else:
+                tax_statement = self._run_fused(steps, number, tax_statement)
+            for step in steps:
+                if step.on_done:
+                    step.on_done(tax_statement)
+        return tax_statement
+
+    def _run_fused(
+        self, steps: List[PipelineStep], number: int, tax_statement: TaxStatement
+    ) -> TaxStatement:
+        names = [step.name for step in steps]
+        logger.debug("Running calculator steps %s in one traversal", ", ".join(names))
+        calculators: List[BaseCalculator] = [step.calculator for step in steps]
+        seconds = [0.0] * len(steps)
+        pass_start = time.perf_counter()
+
+        for index, calculator in enumerate(calculators):
+            start = time.perf_counter()
+            calculator._begin_calculation(tax_statement)
+            seconds[index] += time.perf_counter() - start
+
+        _FusedPass(calculators, seconds)._process_tax_statement(tax_statement)
+
+        for index, calculator in enumerate(calculators):
+            start = time.perf_counter()
+            tax_statement = calculator._finish_calculation(tax_statement)
+            seconds[index] += time.perf_counter() - start
+
+        for step, step_seconds in zip(steps, seconds):
+            others = [name for name in names if name != step.name]
+            self.timings.append(StepTiming(step.name, step_seconds, number, others))
+        self.overhead_seconds += time.perf_counter() - pass_start - sum(seconds)
+        return tax_statement
+
+    def format_timings(self) -> str:
+        """Per-step timing table for the CLI output."""
+        traversals = len({timing.traversal for timing in self.timings})
+        lines = [f"Calculator timings ({traversals} traversal(s)):"]
+        width = max([len("traversal overhead")] + [len(t.name) for t in self.timings])
+        for timing in self.timings:
+            line = f"  {timing.name:<{width}}  {timing.seconds:8.3f}s"
+            if timing.fused_with:
+                line += f"  (fused with {', '.join(timing.fused_with)})"
+            lines.append(line)
+        if self.overhead_seconds:
+            lines.append(f"  {'traversal overhead':<{width}}  {self.overhead_seconds:8.3f}s")
+        return "\n".join(lines)
@@ -15,7 +15,9 @@ payment:
 
 The calculator is run as a separate step in the CALCULATE phase, before
 ``TotalCalculator``, so that it works regardless of whether payment
-reconciliation is enabled.
+reconciliation is enabled. It only looks at one security at a time, so a
+CalculatorPipeline can fuse it into the traversal of the tax value calculator:
+its ``_leave_Security`` hook runs once the payments of that security are set.
 """
 
 from __future__ import annotations
@@ -26,6 +28,7 @@ from datetime import date
 from decimal import Decimal
 from typing import Dict, List, Optional
 
+from opensteuerauszug.calculate.base import BaseCalculator, CalculationMode, ModelPath
 from opensteuerauszug.model.ech0196 import (
     Security,
     SecurityPayment,
@@ -35,22 +38,25 @@ from opensteuerauszug.model.ech0196 import (
 logger = logging.getLogger(__name__)
 
 
-class WithholdingCapCalculator:
+class WithholdingCapCalculator(BaseCalculator):
     """Cap Kursliste withholding to the broker's effective level."""
 
     def __init__(self, tolerance_chf: Decimal = Decimal("0.05")):
+        super().__init__(CalculationMode.OVERWRITE)
         self.tolerance_chf = tolerance_chf
         self.capped_securities: Dict[str, List[date]] = {}
 
     def calculate(self, tax_statement: TaxStatement) -> TaxStatement:
-        if not tax_statement.listOfSecurities or not tax_statement.listOfSecurities.depot:
-            return tax_statement
-
-        for depot in tax_statement.listOfSecurities.depot:
-            for security in depot.security:
-                self._apply_withholding_cap(security)
-
-        return tax_statement
+        # Standalone only the securities need visiting, not the whole statement
+        self._begin_calculation(tax_statement)
+        if tax_statement.listOfSecurities:
+            for depot in tax_statement.listOfSecurities.depot:
+                for security in depot.security:
+                    self._leave_Security(security, "")
+        return self._finish_calculation(tax_statement)
+
+    def _leave_Security(self, security: Security, path_prefix: ModelPath) -> None:
+        self._apply_withholding_cap(security)
 
     # ------------------------------------------------------------------
 
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from decimal import Decimal
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 from datetime import date
 
 
@@ -29,6 +29,54 @@ class ExchangeRateProvider(ABC):
         """
         pass
 
+    def get_exchange_rates(
+        self,
+        pairs: Iterable[Tuple[str, date]],
+        path_prefix_for_log: Optional[str] = None,
+    ) -> Dict[Tuple[str, date], Decimal]:
+        """
+        Returns the exchange rates for several (currency, reference_date) pairs.
+
+        The default implementation calls get_exchange_rate once per distinct pair;
+        providers with a cheaper bulk lookup override it.
+
+        Returns:
+            A dict mapping each distinct (currency, reference_date) pair to its rate.
+        """
+        rates: Dict[Tuple[str, date], Decimal] = {}
+        for currency, reference_date in pairs:
+            if (currency, reference_date) not in rates:
+                rates[(currency, reference_date)] = self.get_exchange_rate(
+                    currency, reference_date, path_prefix_for_log
+                )
+        return rates
+
+    def convert_many(
+        self,
+        amounts: Sequence[Optional[Decimal]],
+        currencies: Sequence[str],
+        dates: Sequence[date],
+        path_prefix_for_log: Optional[str] = None,
+    ) -> List[Optional[Decimal]]:
+        """
+        Converts amounts to CHF, the i-th amount in currencies[i] at the rate of dates[i].
+
+        None amounts stay None (their rate is still looked up). No quantization is performed.
+
+        Raises:
+            ValueError: If the sequences differ in length.
+        """
+        if not len(amounts) == len(currencies) == len(dates):
+            raise ValueError(
+                f"convert_many needs as many currencies ({len(currencies)}) and dates "
+                f"({len(dates)}) as amounts ({len(amounts)})."
+            )
+        rates = self.get_exchange_rates(zip(currencies, dates), path_prefix_for_log)
+        return [
+            None if amount is None else amount * rates[(currency, reference_date)]
+            for amount, currency, reference_date in zip(amounts, currencies, dates)
+        ]
+
 
 class DummyExchangeRateProvider(ExchangeRateProvider):
     """
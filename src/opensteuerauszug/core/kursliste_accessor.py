@@ -1,11 +1,14 @@
-from typing import Optional, List, Union
+from typing import Dict, Iterable, Optional, List, Union
 from datetime import date
 from decimal import Decimal
-from functools import lru_cache
 
 from .kursliste_db_reader import KurslisteDBReader
+from .kursliste_index import KurslisteIndex
+from .kursliste_xml_reader import KurslisteXmlReader
+from opensteuerauszug.util.instance_cache import CacheInfo, cached_methods, instance_lru_cache
 from opensteuerauszug.model.kursliste import (
     Kursliste,
+    Payment,
     Security,
     Sign,
     Da1Rate,
@@ -14,30 +17,72 @@ from opensteuerauszug.model.kursliste import (
     Da1RateType,
 )
 
+# Data sources answering lookups themselves, as opposed to a list of parsed Kurslisten
+_READERS = (KurslisteDBReader, KurslisteXmlReader)
+
 
 class KurslisteAccessor:
     """
     Provides a unified interface to access Kursliste data, whether it's from
-    a KurslisteDBReader (SQLite) or a list of Kursliste XML model objects.
-    Caches results of its methods.
+    a KurslisteDBReader (SQLite), a KurslisteXmlReader (offset-indexed XML) or a
+    list of Kursliste XML model objects.
+    Caches results of its methods per instance, each method in an LRU cache of
+    at most cache_size entries.
     """
 
+    # Entries per cached lookup method. A large portfolio references a few thousand
+    # securities and currency/date pairs; beyond that the least recently used
+    # results are dropped and looked up again from the data source.
+    DEFAULT_CACHE_SIZE = 4096
+
     # Removed _security_group_to_model_map
     # Removed _dict_to_security_model method
 
-    def __init__(self, data_source: Union[KurslisteDBReader, List[Kursliste]], tax_year: int):
+    def __init__(
+        self,
+        data_source: Union[KurslisteDBReader, KurslisteXmlReader, List[Kursliste]],
+        tax_year: int,
+        cache_size: Optional[int] = DEFAULT_CACHE_SIZE,
+    ):
         """
         Initializes the KurslisteAccessor.
 
         Args:
-            data_source: The data source, either a KurslisteDBReader instance or a list of Kursliste model objects.
+            data_source: The data source, either a KurslisteDBReader or KurslisteXmlReader
+                instance or a list of Kursliste model objects.
             tax_year: The primary tax year this accessor is responsible for.
                       Used mainly for security lookups that are year-specific.
+            cache_size: Maximum number of cached results per lookup method
+                (None for unbounded).
         """
         self.data_source = data_source
         self.tax_year = tax_year
+        self.cache_size = cache_size
+        # Bulk-loaded security lookups, filled by get_securities_by_isins/valors.
+        # A key that is present maps to the complete result for that identifier,
+        # an empty list meaning "known to be absent".
+        self._securities_by_isin: Dict[str, List[Security]] = {}
+        self._securities_by_valor: Dict[int, List[Security]] = {}
+        # Hash indexes over the XML Kurslisten, built on first use
+        self._indexes: Optional[List[KurslisteIndex]] = None
 
-    @lru_cache(maxsize=None)
+    def _xml_indexes(self) -> List[KurslisteIndex]:
+        """One KurslisteIndex per Kursliste of an XML data source, in data source order."""
+        if not isinstance(self.data_source, list):
+            return []
+        if self._indexes is None:
+            self._indexes = [
+                KurslisteIndex(kl_instance)
+                for kl_instance in self.data_source
+                if isinstance(kl_instance, Kursliste)
+            ]
+        return self._indexes
+
+    def _xml_indexes_for_tax_year(self) -> List[KurslisteIndex]:
+        """The indexes of the XML Kurslisten of the accessor's tax_year."""
+        return [index for index in self._xml_indexes() if index.kursliste.year == self.tax_year]
+
+    @instance_lru_cache
     def get_exchange_rate(self, currency: str, reference_date: date) -> Optional[Decimal]:
         """
         Retrieves the exchange rate for a given currency and date.
@@ -53,137 +98,174 @@ class KurslisteAccessor:
         if currency == "CHF":  # CHF is always 1:1 with itself
             return Decimal("1")
 
-        if isinstance(self.data_source, KurslisteDBReader):
+        if isinstance(self.data_source, _READERS):
             # KurslisteDBReader.get_exchange_rate is already cached
             return self.data_source.get_exchange_rate(currency, reference_date)
 
         elif isinstance(self.data_source, list):  # List[Kursliste]
             # Iterate through each Kursliste object (typically one, but could be multiple for the same year)
-            for kursliste_instance in self.data_source:
-                if not isinstance(kursliste_instance, Kursliste):
-                    continue  # Should not happen with correct type hints but good for safety
-
-                # Logic similar to _get_exchange_rate_from_xml_kursliste from KurslisteExchangeRateProvider
-                # The tax_year for comparison within XML rates should be based on the reference_date's year
-                xml_tax_year = reference_date.year
-
+            # The tax_year for comparison within XML rates should be based on the reference_date's year
+            xml_tax_year = reference_date.year
+            # denomination = Decimal(str(rate.denomination) if rate.denomination else 1)
+            denomination = Decimal(1)
+            for index in self._xml_indexes():
                 # End-of-Year Logic (only if date is exactly year-end)
                 if reference_date.month == 12 and reference_date.day == 31:
-                    if hasattr(kursliste_instance, 'exchangeRatesYearEnd'):
-                        for rate in kursliste_instance.exchangeRatesYearEnd:
-                            if rate.currency == currency and rate.year == xml_tax_year:
-                                # denomination = Decimal(str(rate.denomination) if rate.denomination else 1)
-                                denomination = Decimal(1)
-                                if rate.value is not None:
-                                    return Decimal(str(rate.value)) / denomination
-                                elif (
-                                    rate.valueMiddle is not None
-                                ):  # Fallback for certain year-end rates
-                                    return Decimal(str(rate.valueMiddle)) / denomination
+                    # Falls back to the middle value for certain year-end rates
+                    value = index.exchange_rates_year_end.get((currency, xml_tax_year))
+                    if value is not None:
+                        return Decimal(str(value)) / denomination
 
                 # Monthly Average Logic
-                if hasattr(kursliste_instance, 'exchangeRatesMonthly'):
-                    month_str = f"{reference_date.month:02d}"
-                    for rate in kursliste_instance.exchangeRatesMonthly:
-                        if (
-                            rate.currency == currency
-                            and rate.year == xml_tax_year
-                            and rate.month == month_str
-                        ):
-                            # denomination = Decimal(str(rate.denomination) if rate.denomination else 1)
-                            denomination = Decimal(1)
-                            if rate.value is not None:
-                                return Decimal(str(rate.value)) / denomination
+                month_str = f"{reference_date.month:02d}"
+                value = index.exchange_rates_monthly.get((currency, xml_tax_year, month_str))
+                if value is not None:
+                    return Decimal(str(value)) / denomination
 
                 # Daily Rate Logic
-                if hasattr(kursliste_instance, 'exchangeRates'):
-                    for rate in kursliste_instance.exchangeRates:
-                        if (
-                            rate.currency == currency and rate.date == reference_date
-                        ):  # Direct date match
-                            # denomination = Decimal(str(rate.denomination) if rate.denomination else 1)
-                            denomination = Decimal(1)
-                            if rate.value is not None:
-                                return Decimal(str(rate.value)) / denomination
+                value = index.exchange_rates_daily.get((currency, reference_date))
+                if value is not None:
+                    return Decimal(str(value)) / denomination
             return None  # No rate found in any Kursliste XML object in the list
 
         return None  # Should not be reached if data_source is correctly typed and handled above
 
-    @lru_cache(maxsize=None)
+    @instance_lru_cache
     def get_security_by_valor(self, valor_number: int) -> Optional[Security]:
         """
         Finds a single security by its VALOR number for the accessor's tax_year.
         Result is cached.
         """
-        if isinstance(self.data_source, KurslisteDBReader):
+        prefetched = self._securities_by_valor.get(valor_number)
+        if prefetched is not None:
+            return prefetched[0] if prefetched else None
+        if isinstance(self.data_source, _READERS):
             # KurslisteDBReader.find_security_by_valor now returns Optional[Security]
             return self.data_source.find_security_by_valor(valor_number, self.tax_year)
         elif isinstance(self.data_source, list):  # List[Kursliste]
-            for kl_instance in self.data_source:
-                if (
-                    kl_instance.year == self.tax_year
-                ):  # Ensure Kursliste year matches accessor's year context
-                    security = kl_instance.find_security_by_valor(valor_number)
-                    if security:
-                        return security  # Returns the first one found
+            for index in self._xml_indexes_for_tax_year():
+                securities = index.securities_by_valor.get(valor_number)
+                if securities:
+                    return securities[0]  # Returns the first one found
             return None
         return None
 
-    @lru_cache(maxsize=None)
+    @instance_lru_cache
     def get_security_by_isin(self, isin: str) -> Optional[Security]:
         """
         Finds a single security by its ISIN for the accessor's tax_year.
         Result is cached.
         """
-        if isinstance(self.data_source, KurslisteDBReader):
+        prefetched = self._securities_by_isin.get(isin)
+        if prefetched is not None:
+            return prefetched[0] if prefetched else None
+        if isinstance(self.data_source, _READERS):
             # KurslisteDBReader.find_security_by_isin now returns Optional[Security]
             return self.data_source.find_security_by_isin(isin, self.tax_year)
         elif isinstance(self.data_source, list):  # List[Kursliste]
-            for kl_instance in self.data_source:
-                if kl_instance.year == self.tax_year:
-                    security = kl_instance.find_security_by_isin(isin)
-                    if security:
-                        return security  # Returns the first one found
+            for index in self._xml_indexes_for_tax_year():
+                securities = index.securities_by_isin.get(isin)
+                if securities:
+                    return securities[0]  # Returns the first one found
+            return None
+        return None
+
+    @instance_lru_cache
+    def get_security_price(self, isin: str, price_date: Optional[date] = None) -> Optional[Decimal]:
+        """
+        Gets the tax value of the security with the given ISIN for the accessor's tax_year.
+        A daily price on price_date is preferred, otherwise the yearend price is used.
+        Result is cached.
+        """
+        if (
+            isinstance(self.data_source, KurslisteDBReader)
+            and self.data_source.has_security_prices
+        ):
+            return self.data_source.get_security_price(isin, self.tax_year, price_date)
+
+        # XML sources and databases without a security_prices table
+        security_model = self.get_security_by_isin(isin)
+        if not security_model:
             return None
+
+        # If a specific date is requested, try to find a daily price
+        if price_date and getattr(security_model, 'daily', None):
+            for daily_price_info in security_model.daily:
+                if daily_price_info.date == price_date:
+                    if daily_price_info.taxValueCHF is not None:
+                        return Decimal(str(daily_price_info.taxValueCHF))
+                    if daily_price_info.taxValue is not None:  # Fallback
+                        return Decimal(str(daily_price_info.taxValue))
+
+        # If no specific date, or if daily price for specific date not found, try year-end price.
+        yearend_price_list = getattr(security_model, 'yearend', None)
+        if yearend_price_list:
+            # yearend can be a list (e.g., for Share) or a single object (e.g., for Bond)
+            if not isinstance(yearend_price_list, list):
+                yearend_price_list = [yearend_price_list]
+            for ye_price_info in yearend_price_list:
+                if ye_price_info:
+                    if ye_price_info.taxValueCHF is not None:
+                        return Decimal(str(ye_price_info.taxValueCHF))
+                    if ye_price_info.taxValue is not None:  # Fallback
+                        return Decimal(str(ye_price_info.taxValue))
+
         return None
 
-    @lru_cache(maxsize=None)
+    @instance_lru_cache
+    def get_security_payments(self, isin: str) -> List[Payment]:
+        """
+        Gets the non-deleted Kursliste payments of the security with the given ISIN
+        for the accessor's tax_year. Result is cached.
+        """
+        if (
+            isinstance(self.data_source, KurslisteDBReader)
+            and self.data_source.has_security_payments
+        ):
+            return self.data_source.get_security_payments_by_isin(isin, self.tax_year)
+
+        # XML sources and databases without a security_payments table
+        security_model = self.get_security_by_isin(isin)
+        if not security_model:
+            return []
+        return [p for p in getattr(security_model, 'payment', []) if not p.deleted]
+
+    @instance_lru_cache
     def get_securities_by_valor(self, valor_number: int) -> List[Security]:
         """
         Finds all securities by VALOR number for the accessor's tax_year.
         Result is cached.
         """
-        if isinstance(self.data_source, KurslisteDBReader):
+        prefetched = self._securities_by_valor.get(valor_number)
+        if prefetched is not None:
+            return prefetched
+        if isinstance(self.data_source, _READERS):
             # KurslisteDBReader.find_securities_by_valor now returns List[Security]
             return self.data_source.find_securities_by_valor(valor_number, self.tax_year)
         elif isinstance(self.data_source, list):  # List[Kursliste]
             results: List[Security] = []
-            for kl_instance in self.data_source:
-                if kl_instance.year == self.tax_year:
-                    securities_from_xml = kl_instance.find_securities_by_valor(valor_number)
-                    results.extend(securities_from_xml)
+            for index in self._xml_indexes_for_tax_year():
+                results.extend(index.securities_by_valor.get(valor_number, []))
             return results
         return []  # Should not be reached if data_source is correctly typed
 
-    @lru_cache(maxsize=None)
+    @instance_lru_cache
     def get_sign_by_value(self, sign_value: str) -> Optional[Sign]:
         """
         Retrieves a Sign object by its sign_value for the accessor's tax_year.
         Result is cached.
         """
-        if isinstance(self.data_source, KurslisteDBReader):
+        if isinstance(self.data_source, _READERS):
             return self.data_source.get_sign_by_value(sign_value, self.tax_year)
         elif isinstance(self.data_source, list):  # List[Kursliste]
-            for kl_instance in self.data_source:
-                if kl_instance.year == self.tax_year:
-                    if hasattr(kl_instance, 'signs') and kl_instance.signs:
-                        for sign_obj in kl_instance.signs:
-                            if sign_obj.sign == sign_value:
-                                return sign_obj
+            for index in self._xml_indexes_for_tax_year():
+                sign_obj = index.signs_by_value.get(sign_value)
+                if sign_obj is not None:
+                    return sign_obj
             return None
         return None
 
-    @lru_cache(maxsize=None)
+    @instance_lru_cache
     def get_da1_rate(
         self,
         country: str,
@@ -199,7 +281,7 @@ class KurslisteAccessor:
         Result is cached.
         """
         candidates: List[Da1Rate] = []
-        if isinstance(self.data_source, KurslisteDBReader):
+        if isinstance(self.data_source, _READERS):
             # The DB reader returns all candidates matching country and security_group
             candidates = (
                 self.data_source.get_da1_rate(
@@ -208,11 +290,10 @@ class KurslisteAccessor:
                 or []
             )
         elif isinstance(self.data_source, list):  # List[Kursliste]
-            for kl_instance in self.data_source:
-                if kl_instance.year == self.tax_year and hasattr(kl_instance, 'da1Rates'):
-                    for rate_obj in kl_instance.da1Rates:
-                        if rate_obj.country == country and rate_obj.securityGroup == security_group:
-                            candidates.append(rate_obj)
+            for index in self._xml_indexes_for_tax_year():
+                candidates.extend(
+                    index.da1_rates_by_country_group.get((country, security_group), [])
+                )
 
         if not candidates:
             return None
@@ -252,20 +333,93 @@ class KurslisteAccessor:
         # Return the first valid candidate.
         return candidates[0]
 
-    @lru_cache(maxsize=None)
+    @instance_lru_cache
     def get_securities_by_isin(self, isin: str) -> List[Security]:
         """
         Finds all securities by ISIN for the accessor's tax_year.
         Result is cached.
         """
-        if isinstance(self.data_source, KurslisteDBReader):
+        prefetched = self._securities_by_isin.get(isin)
+        if prefetched is not None:
+            return prefetched
+        if isinstance(self.data_source, _READERS):
             # KurslisteDBReader.find_securities_by_isin now returns List[Security]
             return self.data_source.find_securities_by_isin(isin, self.tax_year)
         elif isinstance(self.data_source, list):  # List[Kursliste]
             results: List[Security] = []
-            for kl_instance in self.data_source:
-                if kl_instance.year == self.tax_year:
-                    securities_from_xml = kl_instance.find_securities_by_isin(isin)
-                    results.extend(securities_from_xml)
+            for index in self._xml_indexes_for_tax_year():
+                results.extend(index.securities_by_isin.get(isin, []))
             return results
         return []  # Should not be reached if data_source is correctly typed
+
+    def get_securities_by_isins(self, isins: Iterable[str]) -> Dict[str, List[Security]]:
+        """
+        Resolves many ISINs at once for the accessor's tax_year.
+
+        For a KurslisteDBReader source this issues a few set-based queries instead
+        of one query per ISIN. The results (including misses) are kept so that later
+        get_security_by_isin/get_securities_by_isin calls are served without I/O.
+
+        Returns:
+            A dict mapping every requested ISIN to its (possibly empty) list of securities.
+        """
+        missing = [i for i in dict.fromkeys(isins) if i and i not in self._securities_by_isin]
+        if missing:
+            if isinstance(self.data_source, _READERS):
+                found = self.data_source.find_securities_by_isins(missing, self.tax_year)
+            else:
+                found = {isin: self.get_securities_by_isin(isin) for isin in missing}
+            for isin in missing:
+                self._securities_by_isin[isin] = found.get(isin, [])
+        return {i: self._securities_by_isin[i] for i in isins if i in self._securities_by_isin}
+
+    def get_securities_by_valors(self, valor_numbers: Iterable[int]) -> Dict[int, List[Security]]:
+        """
+        Resolves many VALOR numbers at once for the accessor's tax_year.
+
+        Works like get_securities_by_isins, keyed by VALOR number.
+
+        Returns:
+            A dict mapping every requested VALOR number to its (possibly empty) list of securities.
+        """
+        requested = [int(v) for v in valor_numbers if v is not None]
+        missing = [v for v in dict.fromkeys(requested) if v not in self._securities_by_valor]
+        if missing:
+            if isinstance(self.data_source, _READERS):
+                found = self.data_source.find_securities_by_valors(missing, self.tax_year)
+            else:
+                found = {valor: self.get_securities_by_valor(valor) for valor in missing}
+            for valor in missing:
+                self._securities_by_valor[valor] = found.get(valor, [])
+        return {v: self._securities_by_valor[v] for v in requested}
+
+    def prefetched_security_count(self) -> int:
+        """Number of securities held by the bulk lookup maps of this accessor."""
+        return sum(len(v) for v in self._securities_by_isin.values()) + sum(
+            len(v) for v in self._securities_by_valor.values()
+        )
+
+    def cache_stats(self) -> Dict[str, CacheInfo]:
+        """Statistics of the lookup caches used so far, by method name."""
+        return {name: method.cache_info() for name, method in cached_methods(self).items()}
+
+    def cached_result_count(self) -> int:
+        """Number of results held by the lookup caches of this accessor."""
+        return sum(info.currsize for info in self.cache_stats().values())
+
+    def clear_prefetched(self) -> None:
+        """
+        Drops the bulk-loaded securities of this accessor.
+
+        Unlike the bounded lookup caches the bulk lookup maps grow with every
+        statement that is prefetched, so a long-lived accessor shared by several
+        runs must be cleared after each run.
+        """
+        self._securities_by_isin.clear()
+        self._securities_by_valor.clear()
+
+    def clear_caches(self) -> None:
+        """Drops all cached lookup results and bulk-loaded securities of this accessor."""
+        for method in cached_methods(self).values():
+            method.cache_clear()
+        self.clear_prefetched()
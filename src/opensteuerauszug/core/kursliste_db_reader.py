@@ -1,13 +1,17 @@
 import sqlite3
 import json
 import logging
-from typing import Optional, Dict as PyDict, List, Type, TypeVar
+import threading
+from typing import Any, Callable, Optional, Dict as PyDict, Iterable, List, Tuple, Type, TypeVar
+from typing import get_args
 from datetime import date
+from pathlib import Path
 from decimal import Decimal, InvalidOperation
 
 from pydantic import ValidationError
 from pydantic_xml import BaseXmlModel as PydanticXmlModel
 
+from opensteuerauszug.kursliste.blob_codec import construct_model, decode_model, is_binary_blob
 from opensteuerauszug.model.kursliste import (
     Security,
     Share,
@@ -21,6 +25,8 @@ from opensteuerauszug.model.kursliste import (
     Sign,
     Da1Rate,
     Da1RateType,
+    Payment,
+    PaymentTypeESTV,
     SecurityGroupESTV,
 )
 
@@ -32,8 +38,8 @@ _T = TypeVar('_T', bound=PydanticXmlModel)
 class KurslisteDBReader:
     """
     Reads security and exchange rate data from a Kursliste SQLite database.
-    Securities are stored as BLOBs (raw XML in v3+, JSON in legacy) and
-    deserialized into Pydantic models on read.
+    Securities are stored as BLOBs (binary encoded in v6+, raw XML in v3+, JSON in
+    legacy) and deserialized into Pydantic models on read.
     """
 
     _SECURITY_TYPE_MAP: PyDict[str, Type[Security]] = {
@@ -89,18 +95,81 @@ class KurslisteDBReader:
         # This map needs to be comprehensive for types stored.
     }
 
-    def __init__(self, db_path: str):
+    # Keep well below SQLITE_MAX_VARIABLE_NUMBER (999 on older SQLite builds).
+    _IN_CLAUSE_CHUNK_SIZE = 500
+
+    # security_payments column -> (Payment field, conversion of the stored value)
+    _PAYMENT_COLUMNS: PyDict[str, Tuple[str, Callable[[Any], Any]]] = {
+        "payment_id": ("id", int),
+        "deleted": ("deleted", bool),
+        "payment_number": ("paymentNumber", int),
+        "payment_date": ("paymentDate", date.fromisoformat),
+        "ex_date": ("exDate", date.fromisoformat),
+        "currency": ("currency", str),
+        "percent": ("percent", Decimal),
+        "payment_value": ("paymentValue", Decimal),
+        "exchange_rate": ("exchangeRate", Decimal),
+        "payment_value_chf": ("paymentValueCHF", Decimal),
+        "with_holding_tax": ("withHoldingTax", bool),
+        "undefined": ("undefined", bool),
+        "sign": ("sign", str),
+        "payment_type": ("paymentType", PaymentTypeESTV),
+        "tax_event": ("taxEvent", bool),
+        "variant": ("variant", int),
+        "capital_gain": ("capitalGain", bool),
+        "gratis": ("gratis", bool),
+        "coupon": ("coupon", str),
+    }
+
+    # Defaults for read_only mode. Converted Kursliste databases are a few hundred MB at
+    # most, so mapping 256 MiB covers the hot tables and indexes of a whole year.
+    DEFAULT_MMAP_SIZE = 256 * 1024 * 1024
+    DEFAULT_CACHE_SIZE_KIB = 16 * 1024
+
+    def __init__(
+        self,
+        db_path: str,
+        read_only: bool = False,
+        mmap_size: int = DEFAULT_MMAP_SIZE,
+        cache_size_kib: int = DEFAULT_CACHE_SIZE_KIB,
+    ):
         """
         Initializes the reader and connects to the SQLite database.
 
         Args:
             db_path: Path to the SQLite database file.
+            read_only: Open the database as an immutable, read-only file
+                (``mode=ro&immutable=1``). SQLite then skips locking and change
+                detection and reads pages through a memory map, so several processes
+                reading the same database share the OS page cache. The file must not be
+                modified while it is open in this mode.
+            mmap_size: Bytes of the database to memory-map in read_only mode (0 disables it).
+            cache_size_kib: Size of the SQLite page cache in KiB in read_only mode.
         """
         self.db_path = db_path
-        self.conn: Optional[sqlite3.Connection] = sqlite3.connect(self.db_path)
+        self.read_only = read_only
+        if read_only:
+            uri = f"{Path(db_path).resolve().as_uri()}?mode=ro&immutable=1"
+            self.conn: Optional[sqlite3.Connection] = sqlite3.connect(
+                uri, uri=True, check_same_thread=False
+            )
+            self.conn.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+            self.conn.execute(f"PRAGMA cache_size = {-int(cache_size_kib)}")
+        else:
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # The connection is shared by the threads of a parallel calculation; each
+        # query is executed and fetched under this lock.
+        self._query_lock = threading.Lock()
         self.conn.row_factory = sqlite3.Row  # Access columns by name
-        # Detect blob format from metadata (xml or json/legacy)
+        # Detect blob format from metadata (binary, xml or json/legacy)
         self._blob_format = self._read_blob_format()
+        self._decode_blob = self._blob_decoder(self._blob_format)
+        # Databases converted before schema version 4 have no security_prices table
+        self.has_security_prices = self._table_exists("security_prices")
+        # From schema version 5 payments live in security_payments instead of the security blob
+        self.has_security_payments = self._table_exists("security_payments")
+        # (currency, year) -> rate of every day of the year, see get_exchange_rate
+        self._exchange_rate_series: PyDict[Tuple[str, int], List[Optional[Decimal]]] = {}
 
     def _read_blob_format(self) -> str:
         """Read the blob_format metadata from the database. Returns 'json' for legacy databases."""
@@ -116,12 +185,35 @@ class KurslisteDBReader:
             logger.debug("Could not read blob_format from metadata, assuming legacy 'json' format.")
         return "json"  # Legacy databases used JSON blobs
 
+    @staticmethod
+    def _blob_decoder(blob_format: str) -> Callable[[bytes, Type[_T]], _T]:
+        """Returns the function turning a BLOB of the given format into a model instance."""
+        if blob_format == "binary":
+            # Objects that failed validation during conversion are stored as raw XML
+            return lambda blob_data, model_class: (
+                decode_model(blob_data, model_class)
+                if is_binary_blob(blob_data)
+                else model_class.from_xml(blob_data)
+            )
+        if blob_format == "xml":
+            return lambda blob_data, model_class: model_class.from_xml(blob_data)
+        return lambda blob_data, model_class: model_class.model_validate_json(
+            blob_data.decode('utf-8')
+        )
+
+    def _table_exists(self, table_name: str) -> bool:
+        """Check whether the database contains the given table."""
+        row = self._execute_query_fetchone(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name = ?", (table_name,)
+        )
+        return row is not None
+
     def _deserialize_object(
         self, blob_data: bytes, model_class: Type[_T], object_type_name: str
     ) -> Optional[_T]:
         """
         Generic deserializer for objects stored as BLOBs.
-        Handles both XML format (v3+) and legacy JSON format.
+        Handles the binary format (v6+), XML format (v3+) and legacy JSON format.
         """
         if not blob_data:
             return None
@@ -130,12 +222,7 @@ class KurslisteDBReader:
             return None
 
         try:
-            if self._blob_format == "xml":
-                instance = model_class.from_xml(blob_data)
-            else:
-                json_string = blob_data.decode('utf-8')
-                instance = model_class.model_validate_json(json_string)
-            return instance
+            return self._decode_blob(blob_data, model_class)
         except json.JSONDecodeError:
             print(
                 f"Warning: Failed to decode blob for type '{object_type_name}'. Data: {blob_data[:100]}..."
@@ -166,14 +253,124 @@ class KurslisteDBReader:
             blob_data, model_class, f"Security (Type: {type_identifier})"
         )
 
+    def _securities_from_rows(self, rows: List[sqlite3.Row]) -> List[Tuple[sqlite3.Row, Security]]:
+        """
+        Deserializes security rows and re-attaches the payments stored in security_payments.
+        Rows that cannot be deserialized are skipped.
+        """
+        pairs = []
+        for row in rows:
+            sec = self._deserialize_security(
+                row["security_object_blob"], row["security_type_identifier"]
+            )
+            if sec:
+                pairs.append((row, sec))
+        if self.has_security_payments and pairs:
+            with_payments = [sec for _, sec in pairs if "payment" in type(sec).model_fields]
+            payments = self._fetch_payments(
+                {str(sec.id): self._payment_class(type(sec)) for sec in with_payments},
+                include_deleted=True,
+            )
+            for sec in with_payments:
+                sec.payment = payments.get(str(sec.id), [])
+        return pairs
+
+    @staticmethod
+    def _payment_class(security_class: Type[Security]) -> Optional[Type[Payment]]:
+        """The Payment subclass used by the ``payment`` list of a security class."""
+        field = security_class.model_fields.get("payment")
+        if field is None:
+            return None
+        args = get_args(field.annotation)
+        return args[0] if args else None
+
+    def _build_payment(self, row: sqlite3.Row, payment_class: Type[Payment]) -> Optional[Payment]:
+        """
+        Builds a payment from a security_payments row.
+
+        Rows with a payment_object_blob carry details the columns do not cover and are
+        parsed from their XML. All other rows are constructed from the columns without
+        validation, the values having been validated against the schema on export.
+        """
+        if row["payment_object_blob"] is not None:
+            return self._deserialize_object(row["payment_object_blob"], payment_class, "Payment")
+        values = {}
+        try:
+            for column, (field_name, convert) in self._PAYMENT_COLUMNS.items():
+                raw = row[column]
+                if raw is not None and field_name in payment_class.model_fields:
+                    values[field_name] = convert(raw)
+        except (ValueError, InvalidOperation) as e:
+            print(f"Warning: Could not convert payment row {row['payment_id']}: {e}")
+            return None
+        return construct_model(payment_class, values)
+
+    def _fetch_payments(
+        self, payment_classes: PyDict[str, Optional[Type[Payment]]], include_deleted: bool
+    ) -> PyDict[str, List[Payment]]:
+        """
+        Loads the payments of many securities, keyed by kl_id, in document order.
+
+        Args:
+            payment_classes: Maps each kl_id to the Payment subclass of its security.
+            include_deleted: Whether payments flagged as deleted are returned.
+        """
+        results: PyDict[str, List[Payment]] = {}
+        kl_ids = [kl_id for kl_id, cls in payment_classes.items() if cls is not None]
+        deleted_filter = "" if include_deleted else "AND deleted IS NOT 1"
+        for start in range(0, len(kl_ids), self._IN_CLAUSE_CHUNK_SIZE):
+            chunk = kl_ids[start : start + self._IN_CLAUSE_CHUNK_SIZE]
+            placeholders = ", ".join("?" for _ in chunk)
+            query = f"""
+                SELECT * FROM security_payments
+                WHERE kl_id IN ({placeholders}) {deleted_filter}
+                ORDER BY id
+            """
+            for row in self._execute_query_fetchall(query, tuple(chunk)):
+                payment_class = payment_classes[row["kl_id"]]
+                if payment_class is None:
+                    continue
+                payment = self._build_payment(row, payment_class)
+                if payment is not None:
+                    results.setdefault(row["kl_id"], []).append(payment)
+        return results
+
+    def get_security_payments_by_isin(
+        self, isin: str, tax_year: int, include_deleted: bool = False
+    ) -> List[Payment]:
+        """
+        Retrieves the payments of the first security with the given ISIN, without
+        deserializing the security blob.
+
+        Only valid if has_security_payments is True; callers must fall back to the
+        security model for older databases.
+        """
+        query = """
+            SELECT kl_id, security_type_identifier
+            FROM securities
+            WHERE isin = ? AND tax_year = ?
+            LIMIT 1
+        """
+        row = self._execute_query_fetchone(query, (isin, tax_year))
+        if row is None:
+            return []
+        security_class = self._SECURITY_TYPE_MAP.get(row["security_type_identifier"])
+        if security_class is None:
+            return []
+        payments = self._fetch_payments(
+            {row["kl_id"]: self._payment_class(security_class)}, include_deleted
+        )
+        return payments.get(row["kl_id"], [])
+
     def _execute_query_fetchone(self, query: str, params: tuple = ()) -> Optional[sqlite3.Row]:
         """Helper to execute a query and fetch one result."""
         if self.conn is None:
             return None
         try:
-            cursor = self.conn.cursor()
-            cursor.execute(query, params)
-            return cursor.fetchone()
+            with self._query_lock:
+                cursor = self.conn.cursor()
+                cursor.execute(query, params)
+                return cursor.fetchone()
         except sqlite3.Error as e:
             print(f"SQLite error: {e} in query: {query} with params: {params}")
             return None
@@ -183,9 +380,10 @@ class KurslisteDBReader:
         if self.conn is None:
             return []
         try:
-            cursor = self.conn.cursor()
-            cursor.execute(query, params)
-            return cursor.fetchall()
+            with self._query_lock:
+                cursor = self.conn.cursor()
+                cursor.execute(query, params)
+                return cursor.fetchall()
         except sqlite3.Error as e:
             print(f"SQLite error: {e} in query: {query} with params: {params}")
             return []  # Return empty list on error
@@ -210,9 +408,7 @@ class KurslisteDBReader:
         # valor_number in DB is TEXT, so ensure input valor_number is passed as string for query
         row = self._execute_query_fetchone(query, (str(valor_number), tax_year))
         if row:
-            return self._deserialize_security(
-                row["security_object_blob"], row["security_type_identifier"]
-            )
+            return next((sec for _, sec in self._securities_from_rows([row])), None)
         return None
 
     def find_securities_by_valor(self, valor_number: int, tax_year: int) -> List[Security]:
@@ -226,14 +422,7 @@ class KurslisteDBReader:
             WHERE valor_number = ? AND tax_year = ?
         """
         rows = self._execute_query_fetchall(query, (str(valor_number), tax_year))
-        securities = []
-        for row in rows:
-            sec = self._deserialize_security(
-                row["security_object_blob"], row["security_type_identifier"]
-            )
-            if sec:
-                securities.append(sec)
-        return securities
+        return [sec for _, sec in self._securities_from_rows(rows)]
 
     def find_security_by_isin(self, isin: str, tax_year: int) -> Optional[Security]:
         """
@@ -248,9 +437,7 @@ class KurslisteDBReader:
         """
         row = self._execute_query_fetchone(query, (isin, tax_year))
         if row:
-            return self._deserialize_security(
-                row["security_object_blob"], row["security_type_identifier"]
-            )
+            return next((sec for _, sec in self._securities_from_rows([row])), None)
         return None
 
     def find_securities_by_isin(self, isin: str, tax_year: int) -> List[Security]:
@@ -264,19 +451,107 @@ class KurslisteDBReader:
             WHERE isin = ? AND tax_year = ?
         """
         rows = self._execute_query_fetchall(query, (isin, tax_year))
-        securities = []
-        for row in rows:
-            sec = self._deserialize_security(
-                row["security_object_blob"], row["security_type_identifier"]
+        return [sec for _, sec in self._securities_from_rows(rows)]
+
+    def _find_securities_by_column(
+        self, column: str, keys: List[str], tax_year: int
+    ) -> PyDict[str, List[Security]]:
+        """
+        Resolves many securities with chunked ``IN (...)`` queries on an indexed column.
+
+        Rows are returned in the same order the single-key lookups see them, so the
+        first entry of each list matches what ``find_security_by_*`` would return.
+        """
+        results: PyDict[str, List[Security]] = {}
+        unique_keys = list(dict.fromkeys(keys))
+        for start in range(0, len(unique_keys), self._IN_CLAUSE_CHUNK_SIZE):
+            chunk = unique_keys[start : start + self._IN_CLAUSE_CHUNK_SIZE]
+            placeholders = ", ".join("?" for _ in chunk)
+            query = f"""
+                SELECT {column} AS lookup_key, security_object_blob, security_type_identifier
+                FROM securities
+                WHERE {column} IN ({placeholders}) AND tax_year = ?
+                ORDER BY {column}, rowid
+            """
+            rows = self._execute_query_fetchall(query, (*chunk, tax_year))
+            for row, sec in self._securities_from_rows(rows):
+                results.setdefault(row["lookup_key"], []).append(sec)
+        return results
+
+    def find_securities_by_isins(
+        self, isins: Iterable[str], tax_year: int
+    ) -> PyDict[str, List[Security]]:
+        """
+        Finds the securities for many ISINs in a few set-based queries.
+
+        Returns:
+            A dict mapping each ISIN that was found to its list of securities.
+            ISINs without a match are absent from the result.
+        """
+        return self._find_securities_by_column("isin", [i for i in isins if i], tax_year)
+
+    def find_securities_by_valors(
+        self, valor_numbers: Iterable[int], tax_year: int
+    ) -> PyDict[int, List[Security]]:
+        """
+        Finds the securities for many VALOR numbers in a few set-based queries.
+
+        Returns:
+            A dict mapping each VALOR number that was found to its list of securities.
+            VALOR numbers without a match are absent from the result.
+        """
+        # valor_number in DB is TEXT, so query with strings and map back to ints
+        by_text = self._find_securities_by_column(
+            "valor_number", [str(v) for v in valor_numbers if v is not None], tax_year
+        )
+        return {int(valor): secs for valor, secs in by_text.items()}
+
+    def get_security_price(
+        self, isin: str, tax_year: int, price_date: Optional[date] = None
+    ) -> Optional[Decimal]:
+        """
+        Retrieves the tax value of the first security with the given ISIN from the
+        security_prices table, without deserializing the security blob.
+
+        A daily price on price_date takes precedence over the yearend price. For
+        each entry taxValueCHF is preferred over taxValue.
+
+        Only valid if has_security_prices is True; callers must fall back to the
+        security model for older databases.
+
+        Returns:
+            The price as a Decimal, or None if the security has no usable price.
+        """
+        query = """
+            SELECT tax_value_chf, tax_value
+            FROM security_prices
+            WHERE kl_id = (
+                SELECT kl_id FROM securities WHERE isin = ? AND tax_year = ? LIMIT 1
             )
-            if sec:
-                securities.append(sec)
-        return securities
+            AND (kind = 'yearend' OR (kind = 'daily' AND date = ?))
+            AND (tax_value_chf IS NOT NULL OR tax_value IS NOT NULL)
+            ORDER BY kind = 'yearend', id
+            LIMIT 1
+        """
+        date_iso = price_date.isoformat() if price_date else None
+        row = self._execute_query_fetchone(query, (isin, tax_year, date_iso))
+        if row is None:
+            return None
+        value = row["tax_value_chf"] if row["tax_value_chf"] is not None else row["tax_value"]
+        try:
+            return Decimal(value)
+        except InvalidOperation:
+            print(f"Warning: Could not convert security price '{value}' to Decimal.")
+            return None
 
     def get_exchange_rate(self, currency_code: str, reference_date: date) -> Optional[Decimal]:
         """
         Retrieves the most relevant exchange rate for a given currency and date.
-        Searches daily, then monthly, then year-end rates.
+        Searches daily, then monthly, then year-end rates; on December 31st the
+        year-end rate takes precedence.
+
+        The first lookup for a currency and year loads all its rates of that year
+        (see _exchange_rate_series), later lookups are a list index.
 
         Args:
             currency_code: The 3-letter currency code (e.g., "USD").
@@ -285,89 +560,85 @@ class KurslisteDBReader:
         Returns:
             The exchange rate as a Decimal, or None if not found.
         """
-        rate_value = None
+        key = (currency_code, reference_date.year)
+        series = self._exchange_rate_series.get(key)
+        if series is None:
+            series = self._load_exchange_rate_series(currency_code, reference_date.year)
+            self._exchange_rate_series[key] = series
+        return series[reference_date.timetuple().tm_yday - 1]
+
+    @staticmethod
+    def _rate_per_unit(row: Optional[sqlite3.Row], kind: str) -> Optional[Decimal]:
+        """Rate of an exchange rate row divided by its denomination, None if unusable."""
+        if row is None or row["rate"] is None:
+            return None
+        try:
+            denomination = Decimal(1)
+            if row["denomination"]:
+                denomination = Decimal(str(row["denomination"]))
+            return Decimal(str(row["rate"])) / denomination
+        except InvalidOperation:
+            print(f"Warning: Could not convert {kind} rate '{row['rate']}' to Decimal.")
+            return None
 
-        query_year_end = """
-            SELECT rate, denomination FROM exchange_rates_year_end
-            WHERE currency_code = ? AND year = ? AND tax_year = ?
-            ORDER BY id DESC LIMIT 1
+    def _load_exchange_rate_series(self, currency_code: str, year: int) -> List[Optional[Decimal]]:
         """
+        Resolves the exchange rate of every day of a year for one currency.
 
-        # Prefer year-end rate on December 31st
-        if reference_date.month == 12 and reference_date.day == 31:
-            row_year_end = self._execute_query_fetchone(
-                query_year_end, (currency_code, reference_date.year, reference_date.year)
-            )
-            if row_year_end and row_year_end["rate"] is not None:
-                try:
-                    denomination = Decimal(1)
-                    if row_year_end["denomination"]:
-                        denomination = Decimal(str(row_year_end["denomination"]))
-                    return Decimal(str(row_year_end["rate"])) / denomination
-                except InvalidOperation:
-                    print(
-                        f"Warning: Could not convert year_end rate '{row_year_end['rate']}' to Decimal."
-                    )
-
-        # 1. Try daily rates
-        date_iso = reference_date.isoformat()
-        query_daily = """
-            SELECT rate, denomination FROM exchange_rates_daily
-            WHERE currency_code = ? AND date = ? AND tax_year = ?
-            ORDER BY id DESC LIMIT 1
-        """
-        # Assuming tax_year in exchange_rates_daily refers to the year of the Kursliste publication
-        # For daily rates, matching the reference_date's year seems most logical.
-        row_daily = self._execute_query_fetchone(
-            query_daily, (currency_code, date_iso, reference_date.year)
-        )
-        if row_daily and row_daily["rate"] is not None:
-            try:
-                denomination = Decimal(1)
-                if row_daily["denomination"]:
-                    denomination = Decimal(str(row_daily["denomination"]))
-                return Decimal(str(row_daily["rate"])) / denomination
-            except InvalidOperation:
-                print(f"Warning: Could not convert daily rate '{row_daily['rate']}' to Decimal.")
-
-        # 2. Try monthly rates if daily not found or rate is None
-        month_str = reference_date.strftime("%m")  # Format month as "01", "02", etc.
-        query_monthly = """
-            SELECT rate, denomination FROM exchange_rates_monthly
-            WHERE currency_code = ? AND year = ? AND month = ? AND tax_year = ?
-            ORDER BY id DESC LIMIT 1
-        """
-        # tax_year in exchange_rates_monthly should also match the reference_date's year
-        row_monthly = self._execute_query_fetchone(
-            query_monthly, (currency_code, reference_date.year, month_str, reference_date.year)
-        )
-        if row_monthly and row_monthly["rate"] is not None:
-            try:
-                denomination = Decimal(1)
-                if row_monthly["denomination"]:
-                    denomination = Decimal(str(row_monthly["denomination"]))
-                return Decimal(str(row_monthly["rate"])) / denomination
-            except InvalidOperation:
-                print(
-                    f"Warning: Could not convert monthly rate '{row_monthly['rate']}' to Decimal."
-                )
-
-        # 3. Try year-end rates if monthly not found or rate is None
-        row_year_end = self._execute_query_fetchone(
-            query_year_end, (currency_code, reference_date.year, reference_date.year)
+        Returns one entry per day of the year (index = day of year - 1) holding the
+        rate get_exchange_rate returns for that day, denomination already applied.
+        Rates are matched on the year of the day, like the tax_year of the Kursliste
+        they come from. Where several rows exist for a day, month or year the one
+        inserted last wins.
+        """
+        # Rows come in id order, so later rows overwrite earlier ones
+        daily_rows: PyDict[str, sqlite3.Row] = {}
+        for row in self._execute_query_fetchall(
+            """
+            SELECT date, rate, denomination FROM exchange_rates_daily
+            WHERE currency_code = ? AND tax_year = ?
+            ORDER BY id
+            """,
+            (currency_code, year),
+        ):
+            daily_rows[row["date"]] = row
+        monthly_rows: PyDict[str, sqlite3.Row] = {}
+        for row in self._execute_query_fetchall(
+            """
+            SELECT month, rate, denomination FROM exchange_rates_monthly
+            WHERE currency_code = ? AND year = ? AND tax_year = ?
+            ORDER BY id
+            """,
+            (currency_code, year, year),
+        ):
+            monthly_rows[row["month"]] = row
+        year_end = self._rate_per_unit(
+            self._execute_query_fetchone(
+                """
+                SELECT rate, denomination FROM exchange_rates_year_end
+                WHERE currency_code = ? AND year = ? AND tax_year = ?
+                ORDER BY id DESC LIMIT 1
+                """,
+                (currency_code, year, year),
+            ),
+            "year_end",
         )
-        if row_year_end and row_year_end["rate"] is not None:
-            try:
-                denomination = Decimal(1)
-                if row_year_end["denomination"]:
-                    denomination = Decimal(str(row_year_end["denomination"]))
-                return Decimal(str(row_year_end["rate"])) / denomination
-            except InvalidOperation:
-                print(
-                    f"Warning: Could not convert year_end rate '{row_year_end['rate']}' to Decimal."
-                )
 
-        return None  # If no rate found or convertible rate is None
+        monthly = {
+            month: self._rate_per_unit(row, "monthly") for month, row in monthly_rows.items()
+        }
+        first_day = date(year, 1, 1).toordinal()
+        series: List[Optional[Decimal]] = []
+        for ordinal in range(first_day, date(year, 12, 31).toordinal() + 1):
+            day = date.fromordinal(ordinal)
+            if day.month == 12 and day.day == 31 and year_end is not None:
+                series.append(year_end)
+                continue
+            rate = self._rate_per_unit(daily_rows.get(day.isoformat()), "daily")
+            if rate is None:
+                rate = monthly.get(f"{day.month:02d}")
+            series.append(rate if rate is not None else year_end)
+        return series
 
     def close(self):
         """Closes the database connection."""
@@ -397,6 +668,23 @@ class KurslisteDBReader:
             return self._deserialize_object(row["sign_object_blob"], Sign, "Sign")
         return None
 
+    def get_signs(self, tax_year: int) -> List[Sign]:
+        """Retrieves all Sign objects of a tax year, in the order of the Kursliste."""
+        rows = self._execute_query_fetchall(
+            "SELECT sign_object_blob FROM signs WHERE tax_year = ? ORDER BY rowid", (tax_year,)
+        )
+        signs = (self._deserialize_object(row[0], Sign, "Sign") for row in rows)
+        return [sign for sign in signs if sign is not None]
+
+    def get_da1_rates(self, tax_year: int) -> List[Da1Rate]:
+        """Retrieves all Da1Rate objects of a tax year, in the order of the Kursliste."""
+        rows = self._execute_query_fetchall(
+            "SELECT da1_rate_object_blob FROM da1_rates WHERE tax_year = ? ORDER BY rowid",
+            (tax_year,),
+        )
+        rates = (self._deserialize_object(row[0], Da1Rate, "Da1Rate") for row in rows)
+        return [rate for rate in rates if rate is not None]
+
     def get_da1_rate(
         self,
         country: str,
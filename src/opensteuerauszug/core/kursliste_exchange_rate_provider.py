@@ -1,5 +1,5 @@
 from decimal import Decimal
-from typing import Optional
+from typing import Dict, Iterable, Optional, Tuple
 from datetime import date
 
 from .exchange_rate_provider import ExchangeRateProvider
@@ -27,8 +27,43 @@ class KurslisteExchangeRateProvider(ExchangeRateProvider):
                 return rate
 
         # If accessor is None, or accessor.get_exchange_rate returned None
-        raise ValueError(
-            f"Exchange rate for {currency} on {reference_date} not found in any Kursliste source for tax year {tax_year}."
+        raise self._rate_not_found(currency, reference_date)
+
+    def get_exchange_rates(
+        self,
+        pairs: Iterable[Tuple[str, date]],
+        path_prefix_for_log: Optional[str] = None,
+    ) -> Dict[Tuple[str, date], Decimal]:
+        """
+        Returns the exchange rates for several (currency, reference_date) pairs.
+
+        Pairs are deduplicated and grouped by year, so the manager is asked for the
+        Kursliste of each year once and CHF needs no lookup at all.
+
+        Raises:
+            ValueError: For the first pair without a rate, as get_exchange_rate does.
+        """
+        rates: Dict[Tuple[str, date], Decimal] = {}
+        pairs_by_year: Dict[int, Dict[Tuple[str, date], None]] = {}
+        for currency, reference_date in pairs:
+            if currency == "CHF":
+                rates[(currency, reference_date)] = Decimal("1")
+            else:
+                pairs_by_year.setdefault(reference_date.year, {})[(currency, reference_date)] = None
+
+        for tax_year, year_pairs in pairs_by_year.items():
+            accessor = self.kursliste_manager.get_kurslisten_for_year(tax_year)
+            for currency, reference_date in year_pairs:
+                rate = accessor.get_exchange_rate(currency, reference_date) if accessor else None
+                if rate is None:
+                    raise self._rate_not_found(currency, reference_date)
+                rates[(currency, reference_date)] = rate
+        return rates
+
+    @staticmethod
+    def _rate_not_found(currency: str, reference_date: date) -> ValueError:
+        return ValueError(
+            f"Exchange rate for {currency} on {reference_date} not found in any Kursliste source for tax year {reference_date.year}."
         )
 
 
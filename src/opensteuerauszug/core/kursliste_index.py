@@ -0,0 +1,108 @@
+"""
+Hash indexes over an in-memory Kursliste.
+
+The Kursliste model keeps securities, rates and signs in plain lists, so every
+lookup on an XML-loaded Kursliste is a linear scan. KurslisteIndex builds the
+dictionaries KurslisteAccessor needs once per Kursliste instance, each on first
+use, and resolves lookups with the same precedence as the scans: the first
+matching entry in document order (and for securities in the order bonds,
+shares, funds, derivatives, coins/bullions, currency notes, LIBOR/swaps) wins.
+The index does not observe changes to the Kursliste after it was built.
+"""
+
+from datetime import date
+from decimal import Decimal
+from functools import cached_property
+from typing import Dict, List, Tuple
+
+from opensteuerauszug.model.kursliste import (
+    Da1Rate,
+    Kursliste,
+    Security,
+    SecurityGroupESTV,
+    Sign,
+)
+
+
+class KurslisteIndex:
+    """Lazily built lookup tables for one Kursliste instance."""
+
+    def __init__(self, kursliste: Kursliste):
+        self.kursliste = kursliste
+
+    def _all_securities(self) -> List[Security]:
+        # Same order as the Kursliste.find_security_* scans
+        kl = self.kursliste
+        return [
+            security
+            for security_list in (
+                kl.bonds,
+                kl.shares,
+                kl.funds,
+                kl.derivatives,
+                kl.coinBullions,
+                kl.currencyNotes,
+                kl.liborSwaps,
+            )
+            for security in security_list
+        ]
+
+    @cached_property
+    def securities_by_valor(self) -> Dict[int, List[Security]]:
+        index: Dict[int, List[Security]] = {}
+        for security in self._all_securities():
+            if security.valorNumber is not None:
+                index.setdefault(security.valorNumber, []).append(security)
+        return index
+
+    @cached_property
+    def securities_by_isin(self) -> Dict[str, List[Security]]:
+        index: Dict[str, List[Security]] = {}
+        for security in self._all_securities():
+            if security.isin is not None:
+                index.setdefault(security.isin, []).append(security)
+        return index
+
+    @cached_property
+    def exchange_rates_daily(self) -> Dict[Tuple[str, date], Decimal]:
+        """(currency, date) -> value of the first daily rate with a value."""
+        index: Dict[Tuple[str, date], Decimal] = {}
+        for rate in self.kursliste.exchangeRates:
+            if rate.value is not None:
+                index.setdefault((rate.currency, rate.date), rate.value)
+        return index
+
+    @cached_property
+    def exchange_rates_monthly(self) -> Dict[Tuple[str, int, str], Decimal]:
+        """(currency, year, two-digit month) -> value of the first monthly rate with a value."""
+        index: Dict[Tuple[str, int, str], Decimal] = {}
+        for rate in self.kursliste.exchangeRatesMonthly:
+            if rate.value is not None:
+                index.setdefault((rate.currency, rate.year, rate.month), rate.value)
+        return index
+
+    @cached_property
+    def exchange_rates_year_end(self) -> Dict[Tuple[str, int], Decimal]:
+        """(currency, year) -> value (or middle value) of the first year-end rate having one."""
+        index: Dict[Tuple[str, int], Decimal] = {}
+        for rate in self.kursliste.exchangeRatesYearEnd:
+            value = rate.value if rate.value is not None else rate.valueMiddle
+            if value is not None:
+                index.setdefault((rate.currency, rate.year), value)
+        return index
+
+    @cached_property
+    def signs_by_value(self) -> Dict[str, Sign]:
+        index: Dict[str, Sign] = {}
+        for sign in self.kursliste.signs:
+            index.setdefault(sign.sign, sign)
+        return index
+
+    @cached_property
+    def da1_rates_by_country_group(
+        self,
+    ) -> Dict[Tuple[str, SecurityGroupESTV], List[Da1Rate]]:
+        index: Dict[Tuple[str, SecurityGroupESTV], List[Da1Rate]] = {}
+        for rate in self.kursliste.da1Rates:
+            index.setdefault((rate.country, rate.securityGroup), []).append(rate)
+        return index
@@ -7,14 +7,16 @@ for different tax years.
 
 import re
 import datetime
+import threading
 import defusedxml.ElementTree as ET
 from decimal import Decimal
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterable, List, Optional, Union
 
 from opensteuerauszug.model.kursliste import Kursliste, Payment
 from .kursliste_db_reader import KurslisteDBReader
 from .kursliste_accessor import KurslisteAccessor
+from .kursliste_xml_reader import KurslisteXmlReader
 
 
 class KurslisteManager:
@@ -22,12 +24,45 @@ class KurslisteManager:
     Manages KurslisteAccessors for different tax years.
 
     This class loads Kursliste data (prioritizing SQLite over XML), wraps it
-    in a KurslisteAccessor, and provides methods to retrieve data.
+    in a KurslisteAccessor, and provides methods to retrieve data. Years found by
+    load_directory are only opened when they are first requested.
     """
 
-    def __init__(self):
-        """Initialize an empty KurslisteManager."""
+    def __init__(
+        self,
+        read_only: bool = False,
+        mmap_size: int = KurslisteDBReader.DEFAULT_MMAP_SIZE,
+        cache_size_kib: int = KurslisteDBReader.DEFAULT_CACHE_SIZE_KIB,
+        index_xml: bool = False,
+        accessor_cache_size: Optional[int] = KurslisteAccessor.DEFAULT_CACHE_SIZE,
+    ):
+        """
+        Initialize an empty KurslisteManager.
+
+        Args:
+            read_only: Open SQLite Kurslisten as immutable, memory-mapped read-only files
+                (see KurslisteDBReader). Only use this when no other process rewrites the
+                databases while they are open.
+            mmap_size: Bytes of each database to memory-map in read_only mode.
+            cache_size_kib: SQLite page cache size per database in KiB in read_only mode.
+            index_xml: Read years that only have XML files through a byte-offset index
+                (see KurslisteXmlReader) instead of parsing the whole file into memory.
+            accessor_cache_size: Cached results per lookup method of each year's
+                KurslisteAccessor (None for unbounded).
+        """
         self.kurslisten: Dict[int, KurslisteAccessor] = {}  # Changed type hint
+        # Files found by load_directory for years that have not been loaded yet:
+        # year -> {"xml": [...], "sqlite": [...]}
+        self._catalog: Dict[int, Dict[str, List[Path]]] = {}
+        # XML files each loaded year was read from
+        self.loaded_files: Dict[int, List[Path]] = {}
+        self.read_only = read_only
+        self.mmap_size = mmap_size
+        self.cache_size_kib = cache_size_kib
+        self.index_xml = index_xml
+        self.accessor_cache_size = accessor_cache_size
+        # Serializes lazy loading when calculator threads request years concurrently
+        self._load_lock = threading.Lock()
 
     def _get_year_from_filename(self, filename: str) -> Optional[int]:
         """
@@ -47,7 +82,7 @@ class KurslisteManager:
     def _get_year_from_xml_content(self, file_path: Path) -> Optional[int]:
         """
         Extracts the year from XML content by reading the 'year' attribute of the root element.
-        This is used as a fallback when filename doesn't contain a year.
+        Only the start of the root element is parsed.
 
         Args:
             file_path: Path to the XML file
@@ -75,11 +110,13 @@ class KurslisteManager:
 
     def load_directory(self, directory_path: Union[str, Path]) -> None:
         """
-        Load Kursliste data (SQLite DBs or XML files) from the specified directory.
-        Prioritizes SQLite DBs (e.g., kursliste_YYYY.sqlite) if found for a year.
-        Otherwise, loads XML files for that year.
+        Catalog the Kursliste data (SQLite DBs or XML files) in the specified directory.
 
-        For XML files, tries to extract year from filename first, then from XML content if needed.
+        Only the year of each file is determined here (from the filename for SQLite
+        files, from the root element for XML files, falling back to the filename if the
+        root element carries no year). A year is opened or
+        parsed on its first get_kurslisten_for_year call, or eagerly via preload.
+        Years that are already loaded or cataloged keep their existing source.
 
         Args:
             directory_path: Path to directory containing Kursliste XML files
@@ -102,11 +139,16 @@ class KurslisteManager:
             if file_path.suffix == ".sqlite":
                 year = self._get_year_from_filename(file_path.name)
 
-            # For XML files, try filename first, then XML content
+            # For XML files the content is authoritative, the filename is the fallback
             elif file_path.suffix == ".xml":
-                year = self._get_year_from_filename(file_path.name)
+                filename_year = self._get_year_from_filename(file_path.name)
+                year = self._get_year_from_xml_content(file_path)
                 if year is None:
-                    year = self._get_year_from_xml_content(file_path)
+                    year = filename_year
+                elif filename_year is not None and filename_year != year:
+                    print(
+                        f"Warning: Year mismatch for {file_path.name}. Extracted year: {filename_year}, XML content year: {year}. Using XML content year: {year}."
+                    )
 
             if year:
                 year_file_map.setdefault(year, {"xml": [], "sqlite": []})
@@ -115,77 +157,118 @@ class KurslisteManager:
                 elif file_path.suffix == ".sqlite":
                     year_file_map[year]["sqlite"].append(file_path)
 
-        for year, files in sorted(year_file_map.items()):
-            if year in self.kurslisten:  # Already processed (e.g. by a DB for this year)
+        for year, files in year_file_map.items():
+            if year in self.kurslisten or year in self._catalog:
                 continue
+            self._catalog[year] = files
 
-            sqlite_files = files["sqlite"]
-            xml_files = files["xml"]
+    def preload(self, years: Optional[Iterable[int]] = None) -> None:
+        """
+        Open or parse the cataloged Kursliste data of the given years now.
 
-            # Prioritize SQLite DB
-            # Use the first SQLite file found for that year (e.g. kursliste_YYYY.sqlite)
-            db_loaded_for_year = False
-            data_source: Optional[Union[KurslisteDBReader, List[Kursliste]]] = (
-                None  # Initialize data_source
-            )
+        Args:
+            years: Tax years to load. Defaults to every cataloged year.
+        """
+        for year in sorted(self._catalog if years is None else set(years)):
+            self.get_kurslisten_for_year(year)
 
-            if sqlite_files:
-                # Attempt to find a specifically named SQLite file first
-                expected_db_name = f"kursliste_{year}.sqlite"
-                db_to_load = None
-                for f_sqlite in sqlite_files:
-                    if f_sqlite.name == expected_db_name:
-                        db_to_load = f_sqlite
-                        break
-                if not db_to_load:  # If not found, take the first sqlite file for that year
-                    db_to_load = sqlite_files[0]
-
-                data_source: Optional[Union[KurslisteDBReader, List[Kursliste]]] = None
+    def _load_year(self, year: int, files: Dict[str, List[Path]]) -> Optional[KurslisteAccessor]:
+        """
+        Create the accessor for one cataloged year, preferring SQLite over XML.
+
+        XML files whose content no longer matches the cataloged year are skipped.
+        """
+        sqlite_files = files["sqlite"]
+        xml_files = files["xml"]
+
+        # Prioritize SQLite DB
+        # Use the first SQLite file found for that year (e.g. kursliste_YYYY.sqlite)
+        data_source: Optional[Union[KurslisteDBReader, KurslisteXmlReader, List[Kursliste]]] = None
+
+        if sqlite_files:
+            # Attempt to find a specifically named SQLite file first
+            expected_db_name = f"kursliste_{year}.sqlite"
+            db_to_load = None
+            for f_sqlite in sqlite_files:
+                if f_sqlite.name == expected_db_name:
+                    db_to_load = f_sqlite
+                    break
+            if not db_to_load:  # If not found, take the first sqlite file for that year
+                db_to_load = sqlite_files[0]
+
+            try:
+                print(f"Loading KurslisteDBReader for year {year} from {db_to_load.name}")
+                data_source = KurslisteDBReader(
+                    str(db_to_load),
+                    read_only=self.read_only,
+                    mmap_size=self.mmap_size,
+                    cache_size_kib=self.cache_size_kib,
+                )
+            except Exception as e:
+                print(
+                    f"Error loading KurslisteDBReader from {db_to_load.name} for year {year}: {e}"
+                )
+                # Fallback to XML if DB loading fails for some reason
+                data_source = None
+
+        if data_source is None and xml_files and self.index_xml:
+            data_source = self._open_indexed_xml(year, xml_files)
+
+        if data_source is None and xml_files:  # Fallback to XML files
+            loaded_xmls_for_year: List[Kursliste] = []
+            for xml_file_path in xml_files:
                 try:
-                    print(f"Loading KurslisteDBReader for year {year} from {db_to_load.name}")
-                    data_source = KurslisteDBReader(str(db_to_load))
-                    db_loaded_for_year = True
+                    print(f"Loading Kursliste XML for year {year} from {xml_file_path.name}")
+                    kursliste_obj = Kursliste.from_xml_file(xml_file_path, denylist=set())
+
+                    if kursliste_obj.year != year:
+                        # Cataloged by its root element, so only if the file changed since
+                        print(
+                            f"Warning: Skipping {xml_file_path.name} for year {year}, its content is for year {kursliste_obj.year}."
+                        )
+                        continue
+
+                    loaded_xmls_for_year.append(kursliste_obj)
+                    self.loaded_files.setdefault(year, []).append(xml_file_path)
                 except Exception as e:
                     print(
-                        f"Error loading KurslisteDBReader from {db_to_load.name} for year {year}: {e}"
+                        f"Error loading Kursliste XML from {xml_file_path.name} for year {year}: {e}"
                     )
-                    # Fallback to XML if DB loading fails for some reason
-                    db_loaded_for_year = False  # Ensure this is reset
-                    data_source = None  # Clear data_source from failed DB attempt
-
-            if not db_loaded_for_year and xml_files:  # Fallback to XML files
-                loaded_xmls_for_year: List[Kursliste] = []
-                for xml_file_path in xml_files:
-                    try:
-                        print(f"Loading Kursliste XML for year {year} from {xml_file_path.name}")
-                        kursliste_obj = Kursliste.from_xml_file(xml_file_path, denylist=set())
-
-                        if kursliste_obj.year != year:
-                            # This situation might indicate a mismatch between extracted year and XML content.
-                            # We'll use the XML content year as authoritative.
-                            print(
-                                f"Warning: Year mismatch for {xml_file_path.name}. Extracted year: {year}, XML content year: {kursliste_obj.year}. Using XML content year: {kursliste_obj.year}."
-                            )
-                            # Update the year_file_map to use the correct year from XML content
-                            actual_year = kursliste_obj.year
-                            if actual_year != year:
-                                # Move this file to the correct year bucket
-                                year_file_map.setdefault(actual_year, {"xml": [], "sqlite": []})
-                                year_file_map[actual_year]["xml"].append(xml_file_path)
-                                # We'll process this in a later iteration, skip for now
-                                continue
-
-                        loaded_xmls_for_year.append(kursliste_obj)
-                    except Exception as e:
-                        print(
-                            f"Error loading Kursliste XML from {xml_file_path.name} for year {year}: {e}"
-                        )
 
-                if loaded_xmls_for_year:
-                    data_source = loaded_xmls_for_year
+            if loaded_xmls_for_year:
+                data_source = loaded_xmls_for_year
+
+        if data_source:
+            return KurslisteAccessor(data_source, year, cache_size=self.accessor_cache_size)
+        return None
 
-            if data_source:
-                self.kurslisten[year] = KurslisteAccessor(data_source, year)
+    def _open_indexed_xml(self, year: int, xml_files: List[Path]) -> Optional[KurslisteXmlReader]:
+        """
+        Open the first XML file of a year through its offset index.
+        """
+        for xml_file_path in xml_files:
+            try:
+                print(f"Indexing Kursliste XML for year {year} from {xml_file_path.name}")
+                reader = KurslisteXmlReader(str(xml_file_path))
+            except Exception as e:
+                print(
+                    f"Error indexing Kursliste XML from {xml_file_path.name} for year {year}: {e}"
+                )
+                continue
+            if reader.tax_year != year:
+                print(
+                    f"Warning: Skipping {xml_file_path.name} for year {year}, its content is for year {reader.tax_year}."
+                )
+                reader.close()
+                continue
+            if len(xml_files) > 1:
+                print(
+                    f"Warning: Only {xml_file_path.name} is used for year {year}, "
+                    f"indexed XML reads one file per year."
+                )
+            self.loaded_files.setdefault(year, []).append(xml_file_path)
+            return reader
+        return None
 
     def _load_kursliste_from_file(
         self, file_path: Path
@@ -214,19 +297,33 @@ class KurslisteManager:
         Args:
             tax_year: The tax year to retrieve the accessor for.
 
+        Cataloged years are loaded on the first call.
+
         Returns:
             KurslisteAccessor for the specified year, or None if not found.
         """
+        if tax_year not in self.kurslisten:
+            with self._load_lock:
+                files = self._catalog.get(tax_year)
+                if tax_year not in self.kurslisten and files is not None:
+                    accessor = self._load_year(tax_year, files)
+                    if accessor is not None:
+                        self.kurslisten[tax_year] = accessor
+                    # Uncatalog only after the accessor is stored, so a concurrent
+                    # caller never sees the year as neither loaded nor cataloged.
+                    self._catalog.pop(tax_year, None)
         return self.kurslisten.get(tax_year)
 
     def get_available_years(self) -> List[int]:
         """
         Get a list of all tax years for which Kursliste data is available.
 
+        This includes cataloged years that have not been loaded yet.
+
         Returns:
             List of available tax years, sorted
         """
-        return sorted(self.kurslisten.keys())
+        return sorted(set(self.kurslisten) | set(self._catalog))
 
     def ensure_year_available(
         self, required_year: int, kursliste_dir: Optional[Path] = None
@@ -242,6 +339,8 @@ class KurslisteManager:
         Raises:
             ValueError: If the required year is not available with helpful error message
         """
+        # Load the year so a cataloged file that cannot be read is reported here
+        self.get_kurslisten_for_year(required_year)
         available_years = self.get_available_years()
         if required_year not in available_years:
             available_years_str = (
@@ -259,8 +358,8 @@ class KurslisteManager:
     ) -> Optional[Decimal]:
         """
         Get the price of a security for a specific tax year and ISIN.
-        If price_date is provided, it attempts to find the price for that specific date.
-        Otherwise, behavior might depend on the underlying data source (e.g., year-end price).
+        If price_date is provided, it attempts to find the daily price for that specific date.
+        Otherwise, or if there is no daily price for that date, the year-end price is used.
 
         Args:
             tax_year: The tax year to retrieve the price for.
@@ -271,50 +370,11 @@ class KurslisteManager:
             Price as Decimal if available, otherwise None.
         """
         accessor = self.get_kurslisten_for_year(tax_year)
-
         if not accessor:
             return None
 
-        # KurslisteAccessor.get_security_by_isin returns Optional[Security]
-        # The Security object is a Pydantic model from opensteuerauszug.model.kursliste
-        security_model = accessor.get_security_by_isin(isin)
-
-        if not security_model:
-            return None
-
-        # Price extraction logic from the Pydantic Security model instance
-        # This logic is similar to what was previously in the XML path
-
-        # If a specific date is requested, try to find a daily price
-        if price_date:
-            if hasattr(security_model, 'daily') and security_model.daily:
-                for daily_price_info in security_model.daily:
-                    if daily_price_info.date == price_date:
-                        if daily_price_info.taxValueCHF is not None:
-                            return Decimal(str(daily_price_info.taxValueCHF))
-                        if daily_price_info.taxValue is not None:  # Fallback
-                            return Decimal(str(daily_price_info.taxValue))
-                        # If only percent is available, one might need nominal value and quotation type logic
-                        # For now, sticking to taxValueCHF and taxValue.
-            # If specific date price not found in daily, we might fall through to year-end if desired,
-            # or return None if strict daily price for that date is required.
-            # Current logic will fall through to year-end. If strict daily wanted, return None here.
-
-        # If no specific date, or if daily price for specific date not found, try year-end price.
-        if hasattr(security_model, 'yearend') and security_model.yearend:
-            # security_model.yearend can be a list (e.g., for Share) or a single object (e.g., for Bond)
-            yearend_price_list = security_model.yearend
-            if not isinstance(yearend_price_list, list):
-                yearend_price_list = [yearend_price_list]  # Ensure it's iterable
-
-            for ye_price_info in yearend_price_list:
-                if ye_price_info:  # Ensure the yearend price object itself is not None
-                    if ye_price_info.taxValueCHF is not None:
-                        return Decimal(str(ye_price_info.taxValueCHF))
-                    if ye_price_info.taxValue is not None:  # Fallback
-                        return Decimal(str(ye_price_info.taxValue))
-
-        return None  # No suitable price found in the security model
+        # Indexed query on converted databases, model scan for XML and older databases
+        return accessor.get_security_price(isin, price_date)
 
     def get_security_payments(self, tax_year: int, isin: str) -> List["Payment"]:
         """Retrieve payment records for a security from the Kursliste."""
@@ -322,9 +382,4 @@ class KurslisteManager:
         if not accessor:
             return []
 
-        security_model = accessor.get_security_by_isin(isin)
-        if not security_model:
-            return []
-
-        payments = getattr(security_model, 'payment', [])
-        return [p for p in payments if not p.deleted]
+        return accessor.get_security_payments(isin)
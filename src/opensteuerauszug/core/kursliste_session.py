@@ -0,0 +1,275 @@
+"""
+One Kursliste session per run.
+
+The CALCULATE and VERIFY phases both need the Kursliste of the same directory.
+A KurslisteSession owns the KurslisteManager and exchange rate provider for a
+directory, so every phase of a run shares the opened databases and the warm
+accessor caches instead of cataloging and opening the directory again.
+"""
+
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .kursliste_accessor import KurslisteAccessor
+from .kursliste_db_reader import KurslisteDBReader
+from .kursliste_exchange_rate_provider import KurslisteExchangeRateProvider
+from .kursliste_manager import KurslisteManager
+from .kursliste_xml_reader import KurslisteXmlReader
+
+try:  # Not available on Windows and in the browser build
+    import resource
+except ImportError:  # pragma: no cover - platform dependent
+    resource = None  # type: ignore[assignment]
+
+
+@dataclass
+class KurslisteYearFootprint:
+    """Memory held for one loaded Kursliste year."""
+
+    year: int
+    source: str  # "sqlite", "xml" (parsed into memory) or "xml-index" (KurslisteXmlReader)
+    file_bytes: int  # Size of the database or XML files on disk
+    mapped_bytes: int  # Bytes of the database SQLite may memory-map (0 for XML)
+    page_cache_limit_bytes: int  # Upper bound of the SQLite page cache (0 for XML)
+    prefetched_securities: int  # Securities held by the accessor's bulk lookup maps
+
+
+@dataclass
+class KurslisteMemoryFootprint:
+    """Snapshot of the memory a KurslisteSession holds."""
+
+    years: List[KurslisteYearFootprint] = field(default_factory=list)
+    cataloged_years: List[int] = field(default_factory=list)  # Found but not loaded yet
+    cached_results: int = 0  # Entries in the KurslisteAccessor lookup caches
+    cache_hits: int = 0
+    cache_misses: int = 0
+    cache_evictions: int = 0
+    peak_rss_bytes: Optional[int] = None  # Peak resident set size of the process
+
+    def format(self) -> str:
+        """Human readable multi-line summary for the CLI output."""
+        lines = [
+            f"Kursliste memory footprint: {len(self.years)} year(s) loaded, "
+            f"{self.cached_results} cached lookup results"
+            f" ({self.cache_hits} hits, {self.cache_misses} misses,"
+            f" {self.cache_evictions} evictions)"
+        ]
+        for year in self.years:
+            line = (
+                f"  {year.year}: {year.source}, {year.file_bytes / 2**20:.1f} MiB on disk, "
+                f"{year.prefetched_securities} prefetched securities"
+            )
+            if year.source == "sqlite":
+                line += (
+                    f", up to {year.mapped_bytes / 2**20:.1f} MiB mapped"
+                    f" + {year.page_cache_limit_bytes / 2**20:.1f} MiB page cache"
+                )
+            lines.append(line)
+        if self.cataloged_years:
+            lines.append("  Not loaded: " + ", ".join(str(year) for year in self.cataloged_years))
+        if self.peak_rss_bytes is not None:
+            lines.append(f"  Process peak RSS: {self.peak_rss_bytes / 2**20:.1f} MiB")
+        return "\n".join(lines)
+
+
+class KurslisteSession:
+    """
+    The Kursliste data of one directory, shared by all phases of a run.
+
+    The directory is cataloged once on creation. Years are loaded lazily by the
+    manager and stay open, with their caches, until close() is called.
+    """
+
+    def __init__(
+        self,
+        kursliste_dir: Path,
+        read_only: bool = False,
+        mmap_size: int = KurslisteDBReader.DEFAULT_MMAP_SIZE,
+        cache_size_kib: int = KurslisteDBReader.DEFAULT_CACHE_SIZE_KIB,
+        index_xml: bool = False,
+        accessor_cache_size: Optional[int] = KurslisteAccessor.DEFAULT_CACHE_SIZE,
+    ):
+        """
+        Catalogs the Kursliste files of a directory.
+
+        Args:
+            kursliste_dir: Directory containing the Kursliste SQLite or XML files.
+            read_only: Open SQLite Kurslisten immutable and memory-mapped
+                (see KurslisteDBReader).
+            mmap_size: Bytes of each database to memory-map in read_only mode.
+            cache_size_kib: SQLite page cache size per database in KiB in read_only mode.
+            index_xml: Read XML-only years through a byte-offset index instead of
+                parsing them into memory (see KurslisteXmlReader).
+            accessor_cache_size: Cached results per lookup method of each year's
+                KurslisteAccessor (None for unbounded).
+
+        Raises:
+            ValueError: If kursliste_dir is not a directory.
+        """
+        self.kursliste_dir = kursliste_dir
+        self.manager = KurslisteManager(
+            read_only=read_only,
+            mmap_size=mmap_size,
+            cache_size_kib=cache_size_kib,
+            index_xml=index_xml,
+            accessor_cache_size=accessor_cache_size,
+        )
+        self.manager.load_directory(kursliste_dir)
+        self.exchange_rate_provider = KurslisteExchangeRateProvider(self.manager)
+
+    def ensure_year_available(self, required_year: int) -> None:
+        """Loads the required year, raising ValueError if there is no Kursliste for it."""
+        self.manager.ensure_year_available(required_year, self.kursliste_dir)
+
+    def memory_footprint(self) -> KurslisteMemoryFootprint:
+        """Reports what the session currently holds in memory."""
+        footprint = KurslisteMemoryFootprint(
+            cataloged_years=[
+                year
+                for year in self.manager.get_available_years()
+                if year not in self.manager.kurslisten
+            ],
+            peak_rss_bytes=_peak_rss_bytes(),
+        )
+        for year, accessor in sorted(self.manager.kurslisten.items()):
+            for info in accessor.cache_stats().values():
+                footprint.cached_results += info.currsize
+                footprint.cache_hits += info.hits
+                footprint.cache_misses += info.misses
+                footprint.cache_evictions += info.evictions
+            prefetched = accessor.prefetched_security_count()
+            data_source = accessor.data_source
+            if isinstance(data_source, KurslisteDBReader):
+                file_bytes = _file_size(Path(data_source.db_path))
+                footprint.years.append(
+                    KurslisteYearFootprint(
+                        year=year,
+                        source="sqlite",
+                        file_bytes=file_bytes,
+                        mapped_bytes=(
+                            min(file_bytes, self.manager.mmap_size) if data_source.read_only else 0
+                        ),
+                        page_cache_limit_bytes=_page_cache_limit_bytes(data_source),
+                        prefetched_securities=prefetched,
+                    )
+                )
+            else:
+                footprint.years.append(
+                    KurslisteYearFootprint(
+                        year=year,
+                        source=(
+                            "xml-index" if isinstance(data_source, KurslisteXmlReader) else "xml"
+                        ),
+                        file_bytes=sum(
+                            _file_size(path) for path in self.manager.loaded_files.get(year, [])
+                        ),
+                        mapped_bytes=0,
+                        page_cache_limit_bytes=0,
+                        prefetched_securities=prefetched,
+                    )
+                )
+        return footprint
+
+    def clear_prefetched(self) -> None:
+        """Drops the securities bulk-loaded for the last run, keeping the bounded caches."""
+        for accessor in self.manager.kurslisten.values():
+            accessor.clear_prefetched()
+
+    def close(self) -> None:
+        """Closes the SQLite connections and indexed XML files of all loaded years."""
+        for accessor in self.manager.kurslisten.values():
+            if isinstance(accessor.data_source, (KurslisteDBReader, KurslisteXmlReader)):
+                accessor.data_source.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class KurslisteSessionPool:
+    """
+    Open KurslisteSessions kept across several runs in one process.
+
+    The batch command hands a pool to every job a worker process runs, so all of
+    them share one warm session per Kursliste directory and set of options.
+    """
+
+    def __init__(self):
+        self._sessions: Dict[Tuple, KurslisteSession] = {}
+
+    def get(
+        self,
+        kursliste_dir: Path,
+        read_only: bool = False,
+        mmap_size: int = KurslisteDBReader.DEFAULT_MMAP_SIZE,
+        cache_size_kib: int = KurslisteDBReader.DEFAULT_CACHE_SIZE_KIB,
+        index_xml: bool = False,
+        accessor_cache_size: Optional[int] = KurslisteAccessor.DEFAULT_CACHE_SIZE,
+    ) -> KurslisteSession:
+        """Returns the pooled session for these arguments, creating it on first use."""
+        key = (
+            Path(kursliste_dir).resolve(),
+            read_only,
+            mmap_size,
+            cache_size_kib,
+            index_xml,
+            accessor_cache_size,
+        )
+        session = self._sessions.get(key)
+        if session is None:
+            session = KurslisteSession(
+                kursliste_dir,
+                read_only=read_only,
+                mmap_size=mmap_size,
+                cache_size_kib=cache_size_kib,
+                index_xml=index_xml,
+                accessor_cache_size=accessor_cache_size,
+            )
+            self._sessions[key] = session
+        return session
+
+    def end_job(self) -> None:
+        """
+        Releases what one job loaded into the pooled sessions.
+
+        The sessions stay open with their bounded lookup caches; the securities
+        prefetched for the job's statement are dropped so they do not pile up
+        over the jobs of a worker.
+        """
+        for session in self._sessions.values():
+            session.clear_prefetched()
+
+    def close(self) -> None:
+        """Closes all pooled sessions."""
+        for session in self._sessions.values():
+            session.close()
+        self._sessions.clear()
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def _page_cache_limit_bytes(reader: KurslisteDBReader) -> int:
+    """Configured SQLite page cache size of a reader's connection."""
+    if reader.conn is None:
+        return 0
+    cache_size = reader.conn.execute("PRAGMA cache_size").fetchone()[0]
+    if cache_size < 0:  # Negative values are KiB
+        return -cache_size * 1024
+    return cache_size * reader.conn.execute("PRAGMA page_size").fetchone()[0]
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
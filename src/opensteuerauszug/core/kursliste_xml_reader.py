@@ -0,0 +1,406 @@
+"""
+Reads a Kursliste XML file through a byte-offset index instead of parsing it whole.
+
+Loading a Kursliste XML into pydantic models needs many times the file size in
+memory. KurslisteXmlReader makes a single streaming pass over the file and
+records where each top-level security, sign and DA-1 rate element starts and
+ends, keyed by VALOR, ISIN, sign value or (country, security group). Exchange
+rates are small and are kept as attribute values. A lookup seeks to the
+recorded byte range and parses just that fragment.
+
+The index is stored next to the XML as ``<name>.xml.idx.json`` and rebuilt when
+the XML file changes (size or modification time) or the index format version
+differs. The reader offers the lookup methods of KurslisteDBReader that
+KurslisteAccessor uses, so an accessor can use either as its data source.
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+from typing import (
+    IO,
+    Any,
+    Dict as PyDict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+from xml.parsers import expat
+from xml.sax.saxutils import quoteattr
+
+import lxml.etree as ET
+from pydantic_xml import BaseXmlModel as PydanticXmlModel
+
+from opensteuerauszug.kursliste.converter import serialize_element_to_xml_bytes
+from opensteuerauszug.model.kursliste import (
+    KURSLISTE_NS_2_0,
+    Bond,
+    CoinBullion,
+    CurrencyNote,
+    Da1Rate,
+    Da1RateType,
+    Derivative,
+    Fund,
+    LiborSwap,
+    Security,
+    SecurityGroupESTV,
+    SecurityTypeESTV,
+    Share,
+    Sign,
+)
+
+logger = logging.getLogger(__name__)
+
+_T = TypeVar('_T', bound=PydanticXmlModel)
+
+INDEX_FORMAT_VERSION = 1
+INDEX_SUFFIX = ".idx.json"
+
+# Security element tag -> model class, in the order Kursliste.find_securities_* scans them
+_SECURITY_CLASSES: PyDict[str, Type[Security]] = {
+    "bond": Bond,
+    "share": Share,
+    "fund": Fund,
+    "derivative": Derivative,
+    "coinBullion": CoinBullion,
+    "currencyNote": CurrencyNote,
+    "liborSwap": LiborSwap,
+}
+_SECURITY_ORDER = {tag: position for position, tag in enumerate(_SECURITY_CLASSES)}
+
+# (tag, start offset, end offset, valor number or None, ISIN or None)
+_SecurityEntry = Tuple[str, int, int, Optional[int], Optional[str]]
+
+
+def index_path_for(xml_path: Path) -> Path:
+    """Path of the sidecar index of a Kursliste XML file."""
+    return xml_path.with_name(xml_path.name + INDEX_SUFFIX)
+
+
+def _local_name(name: str) -> str:
+    return name.rsplit(":", 1)[-1]
+
+
+def build_offset_index(xml_path: Path) -> PyDict[str, Any]:
+    """
+    Scans a Kursliste XML file once and returns its offset index as a JSON-able dict.
+
+    Uses expat because it reports the byte position of every start tag. An element
+    is taken to end where the next top-level element (or the closing root tag)
+    starts, so a recorded range may carry trailing whitespace or comments.
+    """
+    stat = xml_path.stat()
+    index: PyDict[str, Any] = {
+        "version": INDEX_FORMAT_VERSION,
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "year": None,
+        "namespace_declarations": {},
+        "securities": [],
+        "signs": [],
+        "da1_rates": [],
+        "exchange_rates": [],
+        "exchange_rates_monthly": [],
+        "exchange_rates_year_end": [],
+    }
+    parser = expat.ParserCreate()
+    depth = 0
+    # Top-level element whose end offset is not known yet: (list, entry, end offset position)
+    pending: Optional[Tuple[List[List[Any]], List[Any], int]] = None
+
+    def close_pending() -> None:
+        nonlocal pending
+        if pending is not None:
+            entries, entry, end_position = pending
+            entry[end_position] = parser.CurrentByteIndex
+            entries.append(entry)
+            pending = None
+
+    def start_element(name: str, attrs: PyDict[str, str]) -> None:
+        nonlocal depth, pending
+        depth += 1
+        if depth == 1:
+            index["namespace_declarations"] = {
+                key: value
+                for key, value in attrs.items()
+                if key == "xmlns" or key.startswith("xmlns:")
+            }
+            if attrs.get("year"):
+                index["year"] = int(attrs["year"])
+            return
+        if depth != 2:
+            return
+        close_pending()
+        tag = _local_name(name)
+        start = parser.CurrentByteIndex
+        if tag in _SECURITY_CLASSES:
+            valor = attrs.get("valorNumber")
+            pending = (
+                index["securities"],
+                [tag, start, None, int(valor) if valor else None, attrs.get("isin")],
+                2,
+            )
+        elif tag == "sign":
+            pending = (index["signs"], [attrs.get("sign"), start, None], 2)
+        elif tag == "da1Rate":
+            pending = (
+                index["da1_rates"],
+                [attrs.get("country"), attrs.get("securityGroup"), start, None],
+                3,
+            )
+        elif tag == "exchangeRate":
+            index["exchange_rates"].append(
+                [attrs.get("currency"), attrs.get("date"), attrs.get("value")]
+            )
+        elif tag == "exchangeRateMonthly":
+            index["exchange_rates_monthly"].append(
+                [
+                    attrs.get("currency"),
+                    int(attrs["year"]),
+                    attrs.get("month"),
+                    attrs.get("value"),
+                ]
+            )
+        elif tag == "exchangeRateYearEnd":
+            index["exchange_rates_year_end"].append(
+                [
+                    attrs.get("currency"),
+                    int(attrs["year"]),
+                    attrs.get("value"),
+                    attrs.get("valueMiddle"),
+                ]
+            )
+
+    def end_element(name: str) -> None:
+        nonlocal depth
+        if depth == 1:
+            close_pending()
+        depth -= 1
+
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    with xml_path.open("rb") as f:
+        parser.ParseFile(f)
+    return index
+
+
+class KurslisteXmlReader:
+    """
+    Security, sign, DA-1 and exchange rate lookups on a Kursliste XML file
+    through a byte-offset index. Only the fragments that are looked up are parsed.
+    """
+
+    def __init__(self, xml_path: str, write_index: bool = True):
+        """
+        Opens the XML file and loads (or builds) its offset index.
+
+        Args:
+            xml_path: Path to the Kursliste XML file.
+            write_index: Store a newly built index next to the XML file. A directory
+                that is not writable only costs the rebuild on the next start.
+        """
+        self.xml_path = Path(xml_path)
+        self.index_path = index_path_for(self.xml_path)
+        index = self._load_index()
+        if index is None:
+            index = build_offset_index(self.xml_path)
+            if write_index:
+                self._write_index(index)
+
+        self.tax_year: Optional[int] = index["year"]
+        namespaces = index["namespace_declarations"]
+        self._needs_ns_rewrite = KURSLISTE_NS_2_0 in namespaces.values()
+        declarations = "".join(f" {key}={quoteattr(value)}" for key, value in namespaces.items())
+        self._wrapper_start = f"<fragment{declarations}>".encode("utf-8")
+
+        self._securities: List[_SecurityEntry] = [tuple(entry) for entry in index["securities"]]
+        self._securities_by_valor: PyDict[int, List[int]] = {}
+        self._securities_by_isin: PyDict[str, List[int]] = {}
+        # Same precedence as Kursliste.find_securities_*: by security type, then document order
+        order = sorted(
+            range(len(self._securities)),
+            key=lambda i: (_SECURITY_ORDER[self._securities[i][0]], i),
+        )
+        for i in order:
+            _, _, _, valor, isin = self._securities[i]
+            if valor is not None:
+                self._securities_by_valor.setdefault(valor, []).append(i)
+            if isin is not None:
+                self._securities_by_isin.setdefault(isin, []).append(i)
+
+        self._signs: PyDict[str, Tuple[int, int]] = {}
+        for sign_value, start, end in index["signs"]:
+            self._signs.setdefault(sign_value, (start, end))
+        self._da1_rates: PyDict[Tuple[str, str], List[Tuple[int, int]]] = {}
+        for country, group, start, end in index["da1_rates"]:
+            self._da1_rates.setdefault((country, group), []).append((start, end))
+
+        # First rate having a value per key, like the scans over the Kursliste lists
+        self._rates_daily: PyDict[Tuple[str, str], str] = {}
+        for currency, day, value in index["exchange_rates"]:
+            if value is not None:
+                self._rates_daily.setdefault((currency, day), value)
+        self._rates_monthly: PyDict[Tuple[str, int, str], str] = {}
+        for currency, year, month, value in index["exchange_rates_monthly"]:
+            if value is not None:
+                self._rates_monthly.setdefault((currency, year, month), value)
+        self._rates_year_end: PyDict[Tuple[str, int], str] = {}
+        for currency, year, value, value_middle in index["exchange_rates_year_end"]:
+            value = value if value is not None else value_middle
+            if value is not None:
+                self._rates_year_end.setdefault((currency, year), value)
+
+        self._file: Optional[IO[bytes]] = self.xml_path.open("rb")
+        self._file_lock = threading.Lock()  # Seek and read must not interleave between threads
+
+    def _load_index(self) -> Optional[PyDict[str, Any]]:
+        """The stored index, or None if it is missing, unreadable or stale."""
+        try:
+            with self.index_path.open("r", encoding="utf-8") as f:
+                index = json.load(f)
+            stat = self.xml_path.stat()
+        except (OSError, ValueError):
+            return None
+        if (
+            index.get("version") != INDEX_FORMAT_VERSION
+            or index.get("source_size") != stat.st_size
+            or index.get("source_mtime_ns") != stat.st_mtime_ns
+        ):
+            return None
+        return index
+
+    def _write_index(self, index: PyDict[str, Any]) -> None:
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        try:
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump(index, f, separators=(",", ":"))
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            logger.warning("Could not write Kursliste index %s: %s", self.index_path, e)
+
+    def _parse_fragment(self, start: int, end: int, model_class: Type[_T]) -> Optional[_T]:
+        """Parses the element stored at [start, end) of the XML file."""
+        if self._file is None:
+            raise RuntimeError("KurslisteXmlReader is closed.")
+        with self._file_lock:
+            self._file.seek(start)
+            fragment = self._file.read(end - start)
+        try:
+            wrapper = ET.fromstring(
+                self._wrapper_start + fragment + b"</fragment>",
+                parser=ET.XMLParser(resolve_entities=False, no_network=True),
+            )
+            element = next(child for child in wrapper if isinstance(child.tag, str))
+            xml_bytes = serialize_element_to_xml_bytes(element, self._needs_ns_rewrite)
+            if xml_bytes is None:
+                raise ValueError("element could not be serialized")
+            return model_class.from_xml(xml_bytes)
+        except Exception as e:
+            print(
+                f"Warning: Could not parse {model_class.__name__} at bytes {start}-{end} "
+                f"of {self.xml_path.name}: {e}"
+            )
+            return None
+
+    def _security(self, i: int) -> Optional[Security]:
+        tag, start, end, _, _ = self._securities[i]
+        return self._parse_fragment(start, end, _SECURITY_CLASSES[tag])
+
+    def _securities_at(self, positions: List[int]) -> List[Security]:
+        return [sec for sec in (self._security(i) for i in positions) if sec is not None]
+
+    def find_security_by_valor(self, valor_number: int, tax_year: int) -> Optional[Security]:
+        securities = self.find_securities_by_valor(valor_number, tax_year)
+        return securities[0] if securities else None
+
+    def find_securities_by_valor(self, valor_number: int, tax_year: int) -> List[Security]:
+        if tax_year != self.tax_year:
+            return []
+        return self._securities_at(self._securities_by_valor.get(int(valor_number), []))
+
+    def find_security_by_isin(self, isin: str, tax_year: int) -> Optional[Security]:
+        securities = self.find_securities_by_isin(isin, tax_year)
+        return securities[0] if securities else None
+
+    def find_securities_by_isin(self, isin: str, tax_year: int) -> List[Security]:
+        if tax_year != self.tax_year:
+            return []
+        return self._securities_at(self._securities_by_isin.get(isin, []))
+
+    def find_securities_by_isins(
+        self, isins: Iterable[str], tax_year: int
+    ) -> PyDict[str, List[Security]]:
+        """ISINs without a match are absent from the result, as with KurslisteDBReader."""
+        found = {isin: self.find_securities_by_isin(isin, tax_year) for isin in isins if isin}
+        return {isin: securities for isin, securities in found.items() if securities}
+
+    def find_securities_by_valors(
+        self, valor_numbers: Iterable[int], tax_year: int
+    ) -> PyDict[int, List[Security]]:
+        """VALOR numbers without a match are absent from the result."""
+        found = {
+            int(valor): self.find_securities_by_valor(valor, tax_year)
+            for valor in valor_numbers
+            if valor is not None
+        }
+        return {valor: securities for valor, securities in found.items() if securities}
+
+    def get_exchange_rate(self, currency_code: str, reference_date: date) -> Optional[Decimal]:
+        """
+        Year-end rate on 31 December, else the monthly average, else the daily rate;
+        the same precedence as the accessor applies to a parsed Kursliste.
+        """
+        value = None
+        if reference_date.month == 12 and reference_date.day == 31:
+            value = self._rates_year_end.get((currency_code, reference_date.year))
+        if value is None:
+            value = self._rates_monthly.get(
+                (currency_code, reference_date.year, f"{reference_date.month:02d}")
+            )
+        if value is None:
+            value = self._rates_daily.get((currency_code, reference_date.isoformat()))
+        return Decimal(value) if value is not None else None
+
+    def get_sign_by_value(self, sign_value: str, tax_year: int) -> Optional[Sign]:
+        position = self._signs.get(sign_value)
+        if position is None or tax_year != self.tax_year:
+            return None
+        return self._parse_fragment(*position, Sign)
+
+    def get_da1_rate(
+        self,
+        country: str,
+        security_group: SecurityGroupESTV,
+        tax_year: int,
+        security_type: Optional[SecurityTypeESTV] = None,
+        da1_rate_type: Optional[Da1RateType] = None,
+        reference_date: Optional[date] = None,
+    ) -> Optional[List[Da1Rate]]:
+        """
+        All DA-1 rates of a country and security group, in document order.
+        Like KurslisteDBReader.get_da1_rate, the remaining criteria are left to the caller.
+        """
+        if tax_year != self.tax_year:
+            return []
+        positions = self._da1_rates.get((country, security_group.value), [])
+        rates = [self._parse_fragment(start, end, Da1Rate) for start, end in positions]
+        return [rate for rate in rates if rate is not None]
+
+    def close(self):
+        """Closes the XML file."""
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -2,7 +2,7 @@ import bisect
 import logging
 from dataclasses import dataclass
 from datetime import date
-from typing import List, Optional, Tuple
+from typing import Iterable, List, Optional, Tuple
 from decimal import Decimal
 from opensteuerauszug.model.ech0196 import SecurityStock, CurrencyId
 from opensteuerauszug.util.sorting import sort_security_stocks
@@ -36,6 +36,9 @@ class PositionReconciler:
         """
         self.identifier = identifier
         self.sorted_stocks: List[SecurityStock] = sort_security_stocks(initial_stocks)
+        # Lookup index for synthesize_position_at_date, built lazily by _ensure_index
+        self._indexed_stocks: Optional[List[SecurityStock]] = None
+        self._indexed_len = 0
 
     def check_consistency(
         self,
@@ -161,6 +164,70 @@ class PositionReconciler:
 
         return is_consistent, log_messages
 
+    def _ensure_index(self) -> None:
+        """
+        Builds the lookup index over sorted_stocks on first use.
+
+        For every event it records the quantity after that event as seen by the
+        forward path (the latest balance plus the mutations applied since) and the
+        index of the latest balance up to it. Before the first balance it records
+        the quantity reached by un-applying mutations from that balance, and for
+        statements without any balance the running sum starting at zero. The sums
+        are accumulated in the same order as a linear walk would, so synthesized
+        quantities are identical to it, including their Decimal exponent.
+
+        The index is rebuilt if sorted_stocks is replaced or grows.
+        """
+        stocks = self.sorted_stocks
+        if self._indexed_stocks is stocks and self._indexed_len == len(stocks):
+            return
+
+        count = len(stocks)
+        dates = [s.referenceDate for s in stocks]
+        # forward[i]: position after event i, None while no balance has been seen
+        forward: List[Optional[Decimal]] = [None] * count
+        # last_balance[k]: index of the latest balance among stocks[:k], -1 if none
+        last_balance = [-1] * (count + 1)
+        current: Optional[Decimal] = None
+        latest = -1
+        for i, stock in enumerate(stocks):
+            if not stock.mutation:
+                current = stock.quantity
+                latest = i
+            elif current is not None:
+                current += stock.quantity
+            forward[i] = current
+            last_balance[i + 1] = latest
+
+        first_balance = next((i for i, s in enumerate(stocks) if not s.mutation), -1)
+        # backward[i]: position at the start of event i (i < first_balance), reached
+        # by un-applying the mutations from the first balance down to event i
+        backward: List[Decimal] = []
+        if first_balance >= 0:
+            backward = [Decimal("0")] * first_balance
+            current = stocks[first_balance].quantity
+            for i in range(first_balance - 1, -1, -1):
+                current -= stocks[i].quantity
+                backward[i] = current
+
+        # from_zero[k]: sum of the first k mutations when there is no balance at all
+        from_zero: List[Decimal] = []
+        if first_balance == -1:
+            current = Decimal("0")
+            from_zero.append(current)
+            for stock in stocks:
+                current += stock.quantity
+                from_zero.append(current)
+
+        self._dates = dates
+        self._forward = forward
+        self._last_balance = last_balance
+        self._first_balance = first_balance
+        self._backward = backward
+        self._from_zero = from_zero
+        self._indexed_stocks = stocks
+        self._indexed_len = count
+
     def synthesize_position_at_date(
         self, target_date: date, print_log: bool = False, assume_zero_if_no_balances: bool = False
     ) -> Optional[ReconciledQuantity]:
@@ -168,6 +235,9 @@ class PositionReconciler:
         Calculates the position (quantity) at the START of the target_date.
         This means mutations on target_date itself are not included.
 
+        The lookup is a binary search in an index built once per reconciler, so
+        calling this for many dates does not rescan the stock events each time.
+
         Args:
             target_date: The date for which to synthesize the position.
             print_log: If True, prints log messages to console as they are generated.
@@ -177,8 +247,6 @@ class PositionReconciler:
         Returns:
             A ReconciledQuantity object if successful, None otherwise.
         """
-        # Use a separate log for synthesis to avoid interference if called multiple times
-        synthesis_log: List[str] = []
         log_prefix = f"[{self.identifier}]"
 
         def _synth_log(msg, level=logging.DEBUG):
@@ -192,49 +260,36 @@ class PositionReconciler:
             _synth_log(f"{log_prefix} Cannot synthesize position for {target_date}: No stock data.")
             return None
 
-        last_balance_event: Optional[SecurityStock] = None
-        last_balance_idx = -1
+        self._ensure_index()
+        stocks = self.sorted_stocks
 
-        # Find the latest balance (mutation=False) that is effective at or before the START of target_date.
-        # A balance on target_date itself is the state at the START of target_date.
+        # All stocks[:idx] have referenceDate <= target_date, all stocks[:before] have
+        # referenceDate < target_date. A balance on target_date itself is the state at
+        # the START of target_date, mutations on it are not applied.
+        idx = bisect.bisect_right(self._dates, target_date)
+        before = bisect.bisect_left(self._dates, target_date, hi=idx)
 
-        # Use bisect to find the point where dates go strictly > target_date
-        # All stocks[:idx] have referenceDate <= target_date
-        # All stocks[idx:] have referenceDate > target_date
-        idx = bisect.bisect_right(self.sorted_stocks, target_date, key=lambda s: s.referenceDate)
+        # Latest balance (mutation=False) effective at or before the START of target_date
+        last_balance_idx = self._last_balance[idx]
 
-        # Search backwards from idx-1 for the first balance event
-        for i in range(idx - 1, -1, -1):
-            stock = self.sorted_stocks[i]
-            if not stock.mutation:
-                last_balance_event = stock
-                last_balance_idx = i
-                break
-
-        if last_balance_event is not None:
+        if last_balance_idx >= 0:
             # --- Forward Synthesis Path ---
-            current_quantity = last_balance_event.quantity
+            last_balance_event = stocks[last_balance_idx]
             current_currency = last_balance_event.balanceCurrency
-            effective_balance_date = last_balance_event.referenceDate
-
             _synth_log(
-                f"{log_prefix} Synthesizing FORWARD for START of {target_date}: Starting from balance on {effective_balance_date}, Qty: {current_quantity} ({current_currency})."
+                f"{log_prefix} Synthesizing FORWARD for START of {target_date}: Starting from balance on {last_balance_event.referenceDate}, Qty: {last_balance_event.quantity} ({current_currency})."
             )
 
-            # Apply mutations that occurred strictly AFTER the effective_balance_date
-            # AND strictly BEFORE the target_date.
-            for i in range(last_balance_idx + 1, len(self.sorted_stocks)):
-                mutation_event = self.sorted_stocks[i]
-
-                if mutation_event.referenceDate >= target_date:
-                    break
-
-                if mutation_event.mutation:
-                    delta_quantity = mutation_event.quantity
-                    current_quantity += delta_quantity
+            # Mutations strictly AFTER the balance and strictly BEFORE target_date
+            last_applied = max(last_balance_idx, before - 1)
+            if print_log:
+                for i in range(last_balance_idx + 1, last_applied + 1):
+                    mutation_event = stocks[i]
                     _synth_log(
-                        f"{log_prefix} Synthesizing FORWARD for {target_date}: Applied mutation on {mutation_event.referenceDate}, Name='{mutation_event.name or 'N/A'}', Qty Change={delta_quantity}. New Qty: {current_quantity}."
+                        f"{log_prefix} Synthesizing FORWARD for {target_date}: Applied mutation on {mutation_event.referenceDate}, Name='{mutation_event.name or 'N/A'}', Qty Change={mutation_event.quantity}. New Qty: {self._forward[i]}."
                     )
+            current_quantity = self._forward[last_applied]
+            assert current_quantity is not None
 
             _synth_log(
                 f"{log_prefix} Synthesized FORWARD position for START of {target_date}: Final Qty: {current_quantity} ({current_currency})."
@@ -242,93 +297,96 @@ class PositionReconciler:
             return ReconciledQuantity(
                 reference_date=target_date, quantity=current_quantity, currency=current_currency
             )
-        else:
-            # --- Attempt Backward Synthesis Path ---
-            _synth_log(
-                f"{log_prefix} No balance found at or before {target_date}. Attempting BACKWARD synthesis."
-            )
 
-            first_future_balance_event: Optional[SecurityStock] = None
-            first_future_balance_idx = -1
-
-            # Find the earliest balance (mutation=False) strictly AFTER target_date
-            # We can start searching from idx, since self.sorted_stocks[idx] is the first event > target_date
-            for i in range(idx, len(self.sorted_stocks)):
-                stock = self.sorted_stocks[i]
-                if not stock.mutation:
-                    first_future_balance_event = stock
-                    first_future_balance_idx = i
-                    break  # Found the earliest one
-
-            if first_future_balance_event is None:
-                # If there are NO balance items at all in the entire sorted_stocks list,
-                # we assume an initial balance of 0 before any of the provided mutations.
-                if assume_zero_if_no_balances and not any(
-                    not s.mutation for s in self.sorted_stocks
-                ):
-                    _synth_log(
-                        f"{log_prefix} No balance items found for security. Assuming initial quantity 0."
-                    )
-                    current_quantity = Decimal("0")
-                    current_currency = (
-                        self.sorted_stocks[0].balanceCurrency if self.sorted_stocks else None
-                    )
+        # --- Attempt Backward Synthesis Path ---
+        _synth_log(
+            f"{log_prefix} No balance found at or before {target_date}. Attempting BACKWARD synthesis."
+        )
 
-                    # Apply mutations that occurred strictly BEFORE the target_date.
-                    for mutation_event in self.sorted_stocks:
-                        if mutation_event.referenceDate >= target_date:
-                            break
-                        if mutation_event.mutation:
-                            delta_quantity = mutation_event.quantity
-                            current_quantity += delta_quantity
-                            _synth_log(
-                                f"{log_prefix} Synthesizing from zero: Applied mutation on {mutation_event.referenceDate}, Name='{mutation_event.name or 'N/A'}', Qty Change={delta_quantity}. New Qty: {current_quantity}."
-                            )
-
-                    _synth_log(
-                        f"{log_prefix} Synthesized from zero for START of {target_date}: Final Qty: {current_quantity} ({current_currency})."
-                    )
-                    return ReconciledQuantity(
-                        reference_date=target_date,
-                        quantity=current_quantity,
-                        currency=current_currency,
-                    )
+        # No balance at or before target_date, so the earliest balance strictly AFTER
+        # target_date is the first balance of all.
+        first_future_balance_idx = self._first_balance
 
+        if first_future_balance_idx == -1:
+            # If there are NO balance items at all, we assume an initial balance of 0
+            # before any of the provided mutations.
+            if assume_zero_if_no_balances:
                 _synth_log(
-                    f"{log_prefix} Cannot synthesize BACKWARD for {target_date}: No balance (mutation=False) found after this date to serve as a starting point."
+                    f"{log_prefix} No balance items found for security. Assuming initial quantity 0."
                 )
-                return None
+                current_currency = stocks[0].balanceCurrency
 
-            current_quantity = first_future_balance_event.quantity
-            current_currency = first_future_balance_event.balanceCurrency
-            effective_future_balance_date = first_future_balance_event.referenceDate
+                # Mutations strictly BEFORE the target_date
+                if print_log:
+                    for i in range(before):
+                        mutation_event = stocks[i]
+                        _synth_log(
+                            f"{log_prefix} Synthesizing from zero: Applied mutation on {mutation_event.referenceDate}, Name='{mutation_event.name or 'N/A'}', Qty Change={mutation_event.quantity}. New Qty: {self._from_zero[i + 1]}."
+                        )
+                current_quantity = self._from_zero[before]
+
+                _synth_log(
+                    f"{log_prefix} Synthesized from zero for START of {target_date}: Final Qty: {current_quantity} ({current_currency})."
+                )
+                return ReconciledQuantity(
+                    reference_date=target_date,
+                    quantity=current_quantity,
+                    currency=current_currency,
+                )
 
             _synth_log(
-                f"{log_prefix} Synthesizing BACKWARD for START of {target_date}: Starting from future balance on {effective_future_balance_date}, Qty: {current_quantity} ({current_currency})."
+                f"{log_prefix} Cannot synthesize BACKWARD for {target_date}: No balance (mutation=False) found after this date to serve as a starting point."
             )
+            return None
 
-            # Iterate backward from the event *before* first_future_balance_event
-            # down to events that are still at or after target_date.
-            # Mutations on target_date are unapplied because they happen during
-            # target_date and are therefore not part of the start-of-day position.
-            for i in range(first_future_balance_idx - 1, -1, -1):
-                mutation_event = self.sorted_stocks[i]
-
-                if mutation_event.referenceDate < target_date:
-                    # We've gone too far back.
-                    break
-
-                # Only consider mutations that happened between target_date and effective_future_balance_date
-                if mutation_event.mutation:  # Is a transaction/mutation
-                    delta_quantity = mutation_event.quantity
-                    current_quantity -= delta_quantity  # Un-apply the mutation
-                    _synth_log(
-                        f"{log_prefix} Synthesizing BACKWARD for {target_date}: Un-applied mutation on {mutation_event.referenceDate}, Name='{mutation_event.name or 'N/A'}', Qty Change={-delta_quantity}. New Qty: {current_quantity}."
-                    )
+        first_future_balance_event = stocks[first_future_balance_idx]
+        current_currency = first_future_balance_event.balanceCurrency
 
-            logger.debug(
-                f"{log_prefix} Synthesized BACKWARD position for START of {target_date}: Final Qty: {current_quantity} ({current_currency})."
-            )
-            return ReconciledQuantity(
-                reference_date=target_date, quantity=current_quantity, currency=current_currency
+        _synth_log(
+            f"{log_prefix} Synthesizing BACKWARD for START of {target_date}: Starting from future balance on {first_future_balance_event.referenceDate}, Qty: {first_future_balance_event.quantity} ({current_currency})."
+        )
+
+        # Un-apply the mutations from the one before the balance down to target_date.
+        # Mutations on target_date are unapplied because they happen during
+        # target_date and are therefore not part of the start-of-day position.
+        if print_log:
+            for i in range(first_future_balance_idx - 1, before - 1, -1):
+                mutation_event = stocks[i]
+                _synth_log(
+                    f"{log_prefix} Synthesizing BACKWARD for {target_date}: Un-applied mutation on {mutation_event.referenceDate}, Name='{mutation_event.name or 'N/A'}', Qty Change={-mutation_event.quantity}. New Qty: {self._backward[i]}."
+                )
+        if before < first_future_balance_idx:
+            current_quantity = self._backward[before]
+        else:
+            current_quantity = first_future_balance_event.quantity
+
+        logger.debug(
+            f"{log_prefix} Synthesized BACKWARD position for START of {target_date}: Final Qty: {current_quantity} ({current_currency})."
+        )
+        return ReconciledQuantity(
+            reference_date=target_date, quantity=current_quantity, currency=current_currency
+        )
+
+    def positions_at(
+        self,
+        target_dates: Iterable[date],
+        print_log: bool = False,
+        assume_zero_if_no_balances: bool = False,
+    ) -> List[Optional[ReconciledQuantity]]:
+        """
+        Synthesizes the positions at the START of several dates.
+
+        Equivalent to calling synthesize_position_at_date for each date, sharing
+        the index between the lookups.
+
+        Returns:
+            The results in the order of target_dates, None where synthesis failed.
+        """
+        return [
+            self.synthesize_position_at_date(
+                target_date,
+                print_log=print_log,
+                assume_zero_if_no_balances=assume_zero_if_no_balances,
             )
+            for target_date in target_dates
+        ]
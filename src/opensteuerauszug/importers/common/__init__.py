@@ -26,6 +26,7 @@ from .postprocess import (
     fold_cash_payments,
 )
 from .security_name import SecurityNameRegistry
+from .security_positions import SecurityPositionAccumulator
 from .stock_aggregation import aggregate_mutations
 from .types import CashPositionData, SecurityNameMetadata, SecurityPositionData
 
@@ -33,6 +34,7 @@ __all__ = [
     "CashAccountEntry",
     "CashPositionData",
     "PositionHints",
+    "SecurityPositionAccumulator",
     "SecurityPositionData",
     "SecurityNameMetadata",
     "SecurityNameRegistry",
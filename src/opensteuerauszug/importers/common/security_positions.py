@@ -0,0 +1,107 @@
+"""Per-security accumulator with a lookup by depot and symbol.
+
+Importers collect stocks and payments per ``SecurityPosition`` in a
+``defaultdict`` of :class:`SecurityPositionData`.  Cash transactions only
+carry the account and the broker's security id, so the importers used to
+find the matching position by scanning every key, once per transaction.
+
+``SecurityPositionAccumulator`` is that ``defaultdict`` with a secondary
+index on ``(depot, symbol)``, kept up to date on every insertion and
+removal, so the lookup is a single dict access.
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Tuple
+
+from opensteuerauszug.model.position import SecurityPosition
+
+from .types import SecurityPositionData
+
+_MISSING = object()
+
+
+def _new_security_position_data() -> SecurityPositionData:
+    return SecurityPositionData({"stocks": [], "payments": []})
+
+
+class SecurityPositionAccumulator(defaultdict):
+    """``defaultdict[SecurityPosition, SecurityPositionData]`` indexed by depot and symbol.
+
+    Several positions may share a depot and symbol (e.g. one built from a
+    trade and one from a cash transaction with a different description);
+    :meth:`find` returns the one inserted first, as a scan in insertion
+    order would.
+    """
+
+    def __init__(self, items: Iterable[Tuple[SecurityPosition, SecurityPositionData]] = ()):
+        super().__init__(_new_security_position_data)
+        self._by_depot_symbol: Dict[Tuple[str, str], SecurityPosition] = {}
+        self.update(items)
+
+    def find(self, depot: str, symbol: object) -> SecurityPosition | None:
+        """Return the first position with the given depot and symbol, if any.
+
+        *symbol* is compared as a string, so numeric broker ids (e.g. IBKR
+        conids) match the symbol they were stored under.
+        """
+        return self._by_depot_symbol.get((depot, str(symbol)))
+
+    def __setitem__(self, key: SecurityPosition, value: SecurityPositionData) -> None:
+        super().__setitem__(key, value)
+        self._index(key)
+
+    def __delitem__(self, key: SecurityPosition) -> None:
+        super().__delitem__(key)
+        self._unindex(key)
+
+    def pop(self, key: SecurityPosition, default: Any = _MISSING) -> Any:
+        if key not in self:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        value = self[key]
+        del self[key]
+        return value
+
+    def popitem(self) -> Tuple[SecurityPosition, SecurityPositionData]:
+        key, value = super().popitem()
+        self._unindex(key)
+        return key, value
+
+    def setdefault(self, key: SecurityPosition, default: Any = None) -> Any:
+        if key not in self:
+            super().__setitem__(key, default)
+            self._index(key)
+        return super().__getitem__(key)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        entries: Dict[SecurityPosition, SecurityPositionData] = dict(*args, **kwargs)
+        for key, value in entries.items():
+            super().__setitem__(key, value)
+            self._index(key)
+
+    def clear(self) -> None:
+        super().clear()
+        self._by_depot_symbol.clear()
+
+    def copy(self) -> "SecurityPositionAccumulator":
+        return SecurityPositionAccumulator(self.items())
+
+    __copy__ = copy
+
+    def __reduce__(self):
+        return (type(self), (list(self.items()),))
+
+    def _index(self, key: SecurityPosition) -> None:
+        self._by_depot_symbol.setdefault((key.depot, key.symbol), key)
+
+    def _unindex(self, key: SecurityPosition) -> None:
+        index_key = (key.depot, key.symbol)
+        if self._by_depot_symbol.get(index_key) != key:
+            return
+        del self._by_depot_symbol[index_key]
+        # Fall back to the next position with the same depot and symbol, if any
+        for position in self:
+            if (position.depot, position.symbol) == index_key:
+                self._by_depot_symbol[index_key] = position
+                break
@@ -33,7 +33,7 @@ from opensteuerauszug.config.models import FidelityAccountSettings
 from opensteuerauszug.importers.common import (
     CashPositionData,
     SecurityNameRegistry,
-    SecurityPositionData,
+    SecurityPositionAccumulator,
     aggregate_mutations,
     apply_withholding_tax_fields,
     build_client,
@@ -333,14 +333,11 @@ class FidelityImporter:
 
     def _find_processed_security_position(
         self,
-        processed_security_positions: Dict[SecurityPosition, SecurityPositionData],
+        processed_security_positions: SecurityPositionAccumulator,
         account_id: str,
         security_id: object,
     ) -> SecurityPosition | None:
-        for position in processed_security_positions:
-            if position.depot == account_id and position.symbol == str(security_id):
-                return position
-        return None
+        return processed_security_positions.find(account_id, security_id)
 
     def _build_cash_transaction_security_position(
         self,
@@ -424,9 +421,7 @@ class FidelityImporter:
         security_name_registry = SecurityNameRegistry()
 
         # Key: SecurityPosition or tuple for cash. Value: dict with 'stocks', 'payments'
-        processed_security_positions: defaultdict[SecurityPosition, SecurityPositionData] = (
-            defaultdict(lambda: SecurityPositionData({'stocks': [], 'payments': []}))
-        )
+        processed_security_positions = SecurityPositionAccumulator()
 
         processed_cash_positions: defaultdict[tuple, CashPositionData] = defaultdict(
             lambda: CashPositionData({'stocks': [], 'payments': []})
@@ -24,7 +24,7 @@ from opensteuerauszug.importers.common import (
     CashPositionData,
     PositionHints,
     SecurityNameRegistry,
-    SecurityPositionData,
+    SecurityPositionAccumulator,
     aggregate_mutations,
     apply_withholding_tax_fields,
     augment_list_of_bank_accounts,
@@ -245,14 +245,11 @@ class IbkrImporter:
 
     def _find_processed_security_position(
         self,
-        processed_security_positions: Dict[SecurityPosition, SecurityPositionData],
+        processed_security_positions: SecurityPositionAccumulator,
         account_id: str,
         security_id: object,
     ) -> SecurityPosition | None:
-        for position in processed_security_positions:
-            if position.depot == account_id and position.symbol == str(security_id):
-                return position
-        return None
+        return processed_security_positions.find(account_id, security_id)
 
     def _build_cash_transaction_security_position(
         self,
@@ -304,7 +301,7 @@ class IbkrImporter:
     def _import_corrections_flex_files(
         self,
         corrections_filenames: Sequence[str],
-        processed_security_positions: Dict[SecurityPosition, SecurityPositionData],
+        processed_security_positions: SecurityPositionAccumulator,
     ) -> None:
         corrections_flex_statements = self._parse_flex_statements(
             corrections_filenames,
@@ -437,9 +434,7 @@ class IbkrImporter:
             )
 
         # Key: SecurityPosition or tuple for cash. Value: dict with 'stocks', 'payments'
-        processed_security_positions: defaultdict[SecurityPosition, SecurityPositionData] = (
-            defaultdict(lambda: {'stocks': [], 'payments': []})
-        )
+        processed_security_positions = SecurityPositionAccumulator()
 
         # Best-name-wins registry for security display names.
         security_name_registry = SecurityNameRegistry()
@@ -8,6 +8,8 @@ from opensteuerauszug.config.paths import resolve_kursliste_dir, get_app_data_di
 from opensteuerauszug.model.kursliste import KurslisteMetadata
 from .converter import (
     CONVERTER_SCHEMA_VERSION,
+    BLOB_FORMAT,
+    BLOB_FORMATS,
     convert_kursliste_xml_to_sqlite,
     read_kursliste_metadata,
     read_metadata_value,
@@ -107,6 +109,11 @@ def convert(
         "-o",
         help="Output SQLite file. Defaults to input filename with .sqlite extension.",
     ),
+    blob_format: str = typer.Option(
+        BLOB_FORMAT,
+        "--blob-format",
+        help=f"Encoding of the stored objects: {' or '.join(BLOB_FORMATS)}.",
+    ),
 ):
     """
     Convert a Kursliste XML file to SQLite format.
@@ -118,7 +125,7 @@ def convert(
 
     try:
         logging.info(f"Converting {input_xml} to {output_sqlite}...")
-        convert_kursliste_xml_to_sqlite(input_xml, output_sqlite)
+        convert_kursliste_xml_to_sqlite(input_xml, output_sqlite, blob_format=blob_format)
         logging.info(f"Successfully converted to {output_sqlite}")
     except Exception as e:
         logging.error(f"Error converting Kursliste: {e}")
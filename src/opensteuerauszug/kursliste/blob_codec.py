@@ -0,0 +1,209 @@
+"""
+Compact binary encoding of Kursliste model objects for the SQLite BLOB columns.
+
+Decoding XML blobs means a full lxml parse plus pydantic validation for every
+security that is read. The binary format stores the already validated field
+values instead, so the reader can rebuild the objects with ``model_construct``.
+
+Layout of a blob: ``b"KLB"``, one format version byte, then a ``marshal`` dump
+of the encoded model. A model is encoded as a dict of the fields that were set
+when it was parsed (so defaults and ``model_fields_set`` survive the round
+trip). Values are reduced to marshal-able primitives: Decimal as its string,
+dates as ordinals, datetimes as ISO strings, enums as their value. The decoder
+restores the Python types from the field annotations of the target class.
+"""
+
+import datetime
+import marshal
+import types
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from typing import (
+    Annotated,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+    get_args,
+    get_origin,
+)
+
+from pydantic import BaseModel
+
+BINARY_BLOB_MAGIC = b"KLB"
+BINARY_BLOB_VERSION = 1
+BINARY_BLOB_HEADER = BINARY_BLOB_MAGIC + bytes([BINARY_BLOB_VERSION])
+
+# marshal format version 4 is available from Python 3.4 on and shares repeated
+# interned strings (the field names) within one blob.
+_MARSHAL_VERSION = 4
+
+_M = TypeVar('_M', bound=BaseModel)
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return {name: _encode_value(getattr(value, name)) for name in value.model_fields_set}
+    if isinstance(value, list):
+        return [_encode_value(item) for item in value]
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime.datetime):  # Before date, datetime is a date subclass
+        return value.isoformat()
+    if isinstance(value, datetime.date):
+        return value.toordinal()
+    return value
+
+
+def encode_model(instance: BaseModel) -> bytes:
+    """Encodes a validated model instance as a binary blob."""
+    return BINARY_BLOB_HEADER + marshal.dumps(_encode_value(instance), _MARSHAL_VERSION)
+
+
+def is_binary_blob(blob_data: bytes) -> bool:
+    """Whether the blob was written by encode_model (any format version)."""
+    return blob_data[: len(BINARY_BLOB_MAGIC)] == BINARY_BLOB_MAGIC
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _value_decoder(annotation: Any) -> Callable[[Any], Any]:
+    """Builds the function restoring a value encoded by _encode_value for a field annotation."""
+    origin = get_origin(annotation)
+    if origin is Annotated:
+        return _value_decoder(get_args(annotation)[0])
+    if origin is Union or origin is types.UnionType:
+        members = [a for a in get_args(annotation) if a is not type(None)]
+        if len(members) != 1:
+            return _identity
+        inner = _value_decoder(members[0])
+        if inner is _identity:
+            return _identity
+        return lambda value: None if value is None else inner(value)
+    if origin in (list, List):
+        args = get_args(annotation)
+        item_decoder = _value_decoder(args[0]) if args else _identity
+        if item_decoder is _identity:
+            return list
+        return lambda value: [item_decoder(item) for item in value]
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            return lambda value: _decode_model(annotation, value)
+        if issubclass(annotation, Enum):
+            return annotation
+        if issubclass(annotation, bool):
+            return _identity
+        if issubclass(annotation, Decimal):
+            return Decimal
+        if issubclass(annotation, datetime.datetime):
+            return datetime.datetime.fromisoformat
+        if issubclass(annotation, datetime.date):
+            return datetime.date.fromordinal
+    return _identity
+
+
+@lru_cache(maxsize=None)
+def _decode_plan(model_class: Type[BaseModel]) -> Dict[str, Callable[[Any], Any]]:
+    """Field name -> value decoder for a model class. Built once per class."""
+    return {
+        name: _value_decoder(field.annotation) for name, field in model_class.model_fields.items()
+    }
+
+
+_NO_DEFAULT = object()
+
+# (name, default, default factory) of one model field
+_FieldSpec = Tuple[str, Any, Optional[Callable[[], Any]]]
+
+
+@lru_cache(maxsize=None)
+def _construct_spec(
+    model_class: Type[BaseModel],
+) -> Optional[Tuple[_FieldSpec, ...]]:
+    """
+    (name, default, default factory) of every field of a model class, in field order.
+
+    None if instances cannot be built by assigning ``__dict__`` directly, because the
+    class has private attributes, extra fields, aliases or a post-init hook.
+    """
+    if (
+        model_class.__private_attributes__
+        or model_class.__pydantic_post_init__
+        or model_class.__pydantic_root_model__
+        or model_class.model_config.get('extra') == 'allow'
+    ):
+        return None
+    spec: List[_FieldSpec] = []
+    for name, field in model_class.model_fields.items():
+        if field.alias not in (None, name) or field.validation_alias is not None:
+            return None
+        if field.default_factory is not None:
+            spec.append((name, _NO_DEFAULT, cast(Callable[[], Any], field.default_factory)))
+        elif field.is_required():
+            spec.append((name, _NO_DEFAULT, None))
+        else:
+            spec.append((name, field.default, None))
+    return tuple(spec)
+
+
+def construct_model(model_class: Type[_M], values: Dict[str, Any]) -> _M:
+    """
+    Creates a model instance from already typed values without validation.
+
+    Equivalent to ``model_class.model_construct(**values)``. For plain models the
+    instance is assembled from a per-class field spec: pydantic's model_construct
+    walks all field infos (and inspects every default factory) on each call, which
+    dominates the decoding cost.
+    """
+    spec = _construct_spec(model_class)
+    if spec is None:
+        return model_class.model_construct(**values)
+    fields: Dict[str, Any] = {}
+    for name, default, factory in spec:
+        if name in values:
+            fields[name] = values[name]
+        elif factory is not None:
+            fields[name] = factory()
+        elif default is not _NO_DEFAULT:
+            fields[name] = default
+    instance = model_class.__new__(model_class)
+    object.__setattr__(instance, '__dict__', fields)
+    object.__setattr__(instance, '__pydantic_fields_set__', set(values))
+    object.__setattr__(instance, '__pydantic_extra__', None)
+    object.__setattr__(instance, '__pydantic_private__', None)
+    return instance
+
+
+def _decode_model(model_class: Type[_M], encoded: Dict[str, Any]) -> _M:
+    plan = _decode_plan(model_class)
+    values = {name: plan[name](value) for name, value in encoded.items() if name in plan}
+    return construct_model(model_class, values)
+
+
+def decode_model(blob_data: bytes, model_class: Type[_M]) -> _M:
+    """
+    Decodes a binary blob into an instance of model_class without validation.
+
+    Raises:
+        ValueError: If the blob is not a binary blob of a supported format version.
+    """
+    if not is_binary_blob(blob_data):
+        raise ValueError("Not a binary Kursliste blob")
+    version = blob_data[len(BINARY_BLOB_MAGIC)]
+    if version != BINARY_BLOB_VERSION:
+        raise ValueError(f"Unsupported binary Kursliste blob version {version}")
+    encoded = marshal.loads(blob_data[len(BINARY_BLOB_HEADER) :])
+    return _decode_model(model_class, encoded)
@@ -1,20 +1,74 @@
 import sqlite3
 import os
 import lxml.etree as ET
-from typing import Optional, Union
+from typing import Dict, Optional, Type, Union, get_args
 from pathlib import Path
 
 from opensteuerauszug.model.kursliste import (
+    Bond,
+    CoinBullion,
+    CurrencyNote,
+    Da1Rate,
+    Derivative,
+    Fund,
     KurslisteMetadata,
     KURSLISTE_NS_2_0,
     KURSLISTE_NS_2_2,
+    LiborSwap,
+    Share,
+    Sign,
 )
+from .blob_codec import encode_model
 
-CONVERTER_SCHEMA_VERSION = "3"
+CONVERTER_SCHEMA_VERSION = "6"
 KURSLISTE_METADATA_KEY = "kursliste_metadata"
 
-# Blob format identifier: "xml" means blobs are raw XML bytes (parsed via from_xml).
-BLOB_FORMAT = "xml"
+# Blob format identifiers:
+# "xml" means blobs are raw XML bytes (parsed via from_xml).
+# "binary" means blobs are encoded with blob_codec.encode_model; elements that cannot be
+# validated at conversion time are kept as raw XML bytes, the reader detects this per blob.
+BLOB_FORMATS = ("xml", "binary")
+BLOB_FORMAT = "binary"
+
+# Model classes of the elements stored as blobs, used by the binary blob format
+_BLOB_MODEL_CLASSES = {
+    'share': Share,
+    'bond': Bond,
+    'fund': Fund,
+    'derivative': Derivative,
+    'coinBullion': CoinBullion,
+    'currencyNote': CurrencyNote,
+    'liborSwap': LiborSwap,
+    'sign': Sign,
+    'da1Rate': Da1Rate,
+}
+
+# Payment attributes stored as columns of the security_payments table (attribute -> column).
+# Boolean attributes are stored as INTEGER 0/1, everything else as the original attribute text.
+PAYMENT_COLUMN_ATTRIBUTES = {
+    'id': 'payment_id',
+    'deleted': 'deleted',
+    'paymentNumber': 'payment_number',
+    'paymentDate': 'payment_date',
+    'exDate': 'ex_date',
+    'currency': 'currency',
+    'percent': 'percent',
+    'paymentValue': 'payment_value',
+    'exchangeRate': 'exchange_rate',
+    'paymentValueCHF': 'payment_value_chf',
+    'withHoldingTax': 'with_holding_tax',
+    'undefined': 'undefined',
+    'sign': 'sign',
+    'paymentType': 'payment_type',
+    'taxEvent': 'tax_event',
+    'variant': 'variant',
+    'capitalGain': 'capital_gain',
+    'gratis': 'gratis',
+    'coupon': 'coupon',
+}
+PAYMENT_BOOLEAN_ATTRIBUTES = frozenset(
+    ['deleted', 'withHoldingTax', 'undefined', 'taxEvent', 'capitalGain', 'gratis']
+)
 
 
 def create_schema(conn):
@@ -98,6 +152,51 @@ def create_schema(conn):
         )
     """)
 
+    # Security Prices Table - yearend/daily tax values of each security, so price lookups
+    # do not need to deserialize the security blob. Values are TEXT for Decimal precision.
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS security_prices (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kl_id TEXT, -- References securities.kl_id
+            date TEXT, -- Date of a daily price; December 31st of the tax year for yearend prices
+            kind TEXT, -- 'yearend' or 'daily'
+            tax_value TEXT,
+            tax_value_chf TEXT,
+            tax_year INTEGER
+        )
+    """)
+
+    # Security Payments Table - payments of each security, stored outside of the security blob.
+    # Payments with child elements (remarks, legends) or attributes without a column keep their
+    # raw XML in payment_object_blob; for all others the columns hold the complete payment.
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS security_payments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kl_id TEXT, -- References securities.kl_id
+            payment_id TEXT,
+            deleted INTEGER,
+            payment_number TEXT,
+            payment_date TEXT,
+            ex_date TEXT,
+            currency TEXT,
+            percent TEXT,
+            payment_value TEXT, -- TEXT to preserve Decimal precision
+            exchange_rate TEXT,
+            payment_value_chf TEXT,
+            with_holding_tax INTEGER,
+            undefined INTEGER,
+            sign TEXT,
+            payment_type TEXT,
+            tax_event INTEGER,
+            variant TEXT,
+            capital_gain INTEGER,
+            gratis INTEGER,
+            coupon TEXT,
+            tax_year INTEGER,
+            payment_object_blob BLOB
+        )
+    """)
+
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS metadata (
             key TEXT PRIMARY KEY,
@@ -123,6 +222,16 @@ def create_idx(conn):
         "CREATE INDEX IF NOT EXISTS idx_securities_valor_tax_year ON securities (valor_number, tax_year);"
     )
 
+    # Add index for security prices
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_security_prices_kl_id_kind_date ON security_prices (kl_id, kind, date);"
+    )
+
+    # Add index for security payments
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_security_payments_kl_id_ex_date ON security_payments (kl_id, ex_date);"
+    )
+
     # Add index for signs
     cursor.execute(
         "CREATE INDEX IF NOT EXISTS idx_signs_value_tax_year ON signs (sign_value, tax_year);"
@@ -180,6 +289,103 @@ def serialize_element_to_xml_bytes(elem, needs_ns_rewrite):
         return None
 
 
+def extract_security_price_rows(elem, kl_id, tax_year, daily_tag, yearend_tag):
+    """
+    Extract the daily and yearend tax values of a security element as security_prices rows.
+
+    The attribute text is stored unchanged so the values stay exact decimals.
+    Rows are returned in document order, which the reader relies on to pick the
+    same entry as a scan over the parsed security model.
+    """
+    rows = []
+    yearend_date = f"{tax_year}-12-31" if tax_year is not None else None
+    for child in elem:
+        if child.tag == daily_tag:
+            kind = 'daily'
+            price_date = child.get('date')
+        elif child.tag == yearend_tag:
+            kind = 'yearend'
+            price_date = yearend_date
+        else:
+            continue
+        rows.append(
+            (
+                kl_id,
+                price_date,
+                kind,
+                child.get('taxValue'),
+                child.get('taxValueCHF'),
+                tax_year,
+            )
+        )
+    return rows
+
+
+def _xml_bool_to_int(value):
+    if value is None:
+        return None
+    return 1 if value.strip() in ('true', '1') else 0
+
+
+def extract_security_payment_rows(
+    elem, kl_id, tax_year, payment_tag, needs_ns_rewrite, payment_class=None, blob_format="xml"
+):
+    """
+    Extract the payment children of a security element as security_payments rows.
+
+    Returns the rows in document order together with the payment elements, so the
+    caller can remove them from the security before serializing it.
+    """
+    rows = []
+    payment_elems = [child for child in elem if child.tag == payment_tag]
+    for child in payment_elems:
+        attrib = child.attrib
+        values = []
+        for attr_name in PAYMENT_COLUMN_ATTRIBUTES:
+            value = attrib.get(attr_name)
+            if attr_name in PAYMENT_BOOLEAN_ATTRIBUTES:
+                value = _xml_bool_to_int(value)
+            values.append(value)
+        has_details = len(child) > 0 or any(a not in PAYMENT_COLUMN_ATTRIBUTES for a in attrib)
+        blob_data = (
+            serialize_element_to_blob(child, needs_ns_rewrite, payment_class, blob_format)
+            if has_details
+            else None
+        )
+        rows.append((kl_id, *values, tax_year, blob_data))
+    return rows, payment_elems
+
+
+def _payment_model_class(security_class) -> Optional[Type]:
+    field = security_class.model_fields.get('payment')
+    if field is None:
+        return None
+    args = get_args(field.annotation)
+    return args[0] if args else None
+
+
+_PAYMENT_MODEL_CLASSES: Dict[str, Optional[Type]] = {
+    tag: _payment_model_class(cls) for tag, cls in _BLOB_MODEL_CLASSES.items()
+}
+
+
+def serialize_element_to_blob(elem, needs_ns_rewrite, model_class, blob_format):
+    """
+    Serialize an lxml element for storage in the given blob format.
+
+    For the binary format the element is validated into model_class once, here, so that
+    reads can skip parsing and validation. If that fails the raw XML bytes are stored
+    and the element is handled (and reported) by the reader as before.
+    """
+    xml_bytes = serialize_element_to_xml_bytes(elem, needs_ns_rewrite)
+    if xml_bytes is None or blob_format != "binary" or model_class is None:
+        return xml_bytes
+    try:
+        return encode_model(model_class.from_xml(xml_bytes))
+    except Exception:
+        return xml_bytes
+
+
 def read_conversion_metadata(db_file_path: Union[str, Path]) -> dict[str, str]:
     db_path = Path(db_file_path)
     if not db_path.exists():
@@ -240,6 +446,7 @@ def convert_kursliste_xml_to_sqlite(
     xml_file_path: Union[str, Path],
     db_file_path: Union[str, Path],
     kursliste_metadata: Optional[KurslisteMetadata] = None,
+    blob_format: str = BLOB_FORMAT,
 ) -> bool:
     """
     Streaming conversion function that processes XML without loading entire file into memory.
@@ -251,11 +458,16 @@ def convert_kursliste_xml_to_sqlite(
     Args:
         xml_file_path: Path to the Kursliste XML file
         db_file_path: Path to the SQLite database file to create
+        kursliste_metadata: Optional metadata of the downloaded Kursliste to store
+        blob_format: One of BLOB_FORMATS; "binary" validates every object once during
+            conversion so that reading it later is cheaper
 
     Returns:
         True if successful, raises exception if failed
     """
     xml_file_path = str(xml_file_path)
+    if blob_format not in BLOB_FORMATS:
+        raise ValueError(f"Unknown blob format '{blob_format}', expected one of {BLOB_FORMATS}")
     conn = None
     try:
         if not os.path.isfile(xml_file_path):
@@ -304,6 +516,8 @@ def convert_kursliste_xml_to_sqlite(
 
         # Batch lists for executemany
         securities_batch = []
+        security_prices_batch = []
+        security_payments_batch = []
         exchange_rates_daily_batch = []
         exchange_rates_monthly_batch = []
         exchange_rates_year_end_batch = []
@@ -316,6 +530,16 @@ def convert_kursliste_xml_to_sqlite(
                 kl_id, valor_number, isin, tax_year,
                 security_type_identifier, security_object_blob
             ) VALUES (?, ?, ?, ?, ?, ?)"""
+        sql_security_prices = """
+            INSERT INTO security_prices (
+                kl_id, date, kind, tax_value, tax_value_chf, tax_year
+            ) VALUES (?, ?, ?, ?, ?, ?)"""
+        payment_columns = ", ".join(PAYMENT_COLUMN_ATTRIBUTES.values())
+        payment_placeholders = ", ".join("?" for _ in range(len(PAYMENT_COLUMN_ATTRIBUTES) + 3))
+        sql_security_payments = f"""
+            INSERT INTO security_payments (
+                kl_id, {payment_columns}, tax_year, payment_object_blob
+            ) VALUES ({payment_placeholders})"""
         sql_exchange_daily = """
             INSERT INTO exchange_rates_daily (
                 currency_code, date, rate, denomination, tax_year, source_file
@@ -341,6 +565,12 @@ def convert_kursliste_xml_to_sqlite(
             if securities_batch:
                 cursor.executemany(sql_securities, securities_batch)
                 securities_batch.clear()
+            if security_prices_batch:
+                cursor.executemany(sql_security_prices, security_prices_batch)
+                security_prices_batch.clear()
+            if security_payments_batch:
+                cursor.executemany(sql_security_payments, security_payments_batch)
+                security_payments_batch.clear()
             if exchange_rates_daily_batch:
                 cursor.executemany(sql_exchange_daily, exchange_rates_daily_batch)
                 exchange_rates_daily_batch.clear()
@@ -385,6 +615,10 @@ def convert_kursliste_xml_to_sqlite(
             else:
                 ns_qualified_tags[t] = t
 
+        daily_tag = f'{{{namespace}}}daily' if namespace else 'daily'
+        yearend_tag = f'{{{namespace}}}yearend' if namespace else 'yearend'
+        payment_tag = f'{{{namespace}}}payment' if namespace else 'payment'
+
         # Write metadata
         if tax_year is not None:
             cursor.execute(
@@ -402,7 +636,7 @@ def convert_kursliste_xml_to_sqlite(
         )
         cursor.execute(
             "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
-            ("blob_format", BLOB_FORMAT),
+            ("blob_format", blob_format),
         )
 
         # Main pass: only subscribe to 'end' events to avoid processing millions
@@ -427,12 +661,31 @@ def convert_kursliste_xml_to_sqlite(
                 isin = elem.get('isin')
                 security_type = elem.get('securityType')
 
-                blob_data = serialize_element_to_xml_bytes(elem, needs_ns_rewrite)
+                # Payments go to their own table; the reader re-attaches them on load
+                payment_rows, payment_elems = extract_security_payment_rows(
+                    elem,
+                    kl_id,
+                    tax_year,
+                    payment_tag,
+                    needs_ns_rewrite,
+                    _PAYMENT_MODEL_CLASSES[tag],
+                    blob_format,
+                )
+                for payment_elem in payment_elems:
+                    elem.remove(payment_elem)
+
+                blob_data = serialize_element_to_blob(
+                    elem, needs_ns_rewrite, _BLOB_MODEL_CLASSES[tag], blob_format
+                )
 
                 if blob_data:
                     securities_batch.append(
                         (kl_id, valor_number, isin, tax_year, security_type, blob_data)
                     )
+                    security_prices_batch.extend(
+                        extract_security_price_rows(elem, kl_id, tax_year, daily_tag, yearend_tag)
+                    )
+                    security_payments_batch.extend(payment_rows)
 
                 counts[tag] += 1
                 batch_count += 1
@@ -488,7 +741,7 @@ def convert_kursliste_xml_to_sqlite(
             elif tag == 'sign':
                 kl_id = elem.get('id')
                 sign_value = elem.get('sign')
-                blob_data = serialize_element_to_xml_bytes(elem, needs_ns_rewrite)
+                blob_data = serialize_element_to_blob(elem, needs_ns_rewrite, Sign, blob_format)
                 if blob_data:
                     signs_batch.append((kl_id, sign_value, tax_year, source_file_name, blob_data))
                     counts['sign'] += 1
@@ -499,7 +752,7 @@ def convert_kursliste_xml_to_sqlite(
                 kl_id = elem.get('id')
                 country = elem.get('country')
                 security_group = elem.get('securityGroup')
-                blob_data = serialize_element_to_xml_bytes(elem, needs_ns_rewrite)
+                blob_data = serialize_element_to_blob(elem, needs_ns_rewrite, Da1Rate, blob_format)
                 if blob_data:
                     da1_rates_batch.append(
                         (kl_id, country, security_group, tax_year, source_file_name, blob_data)
@@ -1,7 +1,7 @@
 """Pydantic models for eCH-0196 Tax Statement standard."""
 
 from pydantic import BaseModel, Field, field_validator, StringConstraints, AfterValidator
-from pydantic import ConfigDict
+from pydantic import ConfigDict, PrivateAttr
 from pydantic_core import PydanticUndefined
 from typing import (
     ClassVar,
@@ -16,7 +16,11 @@ from typing import (
     get_args,
     Literal,
     Annotated,
+    Callable,
+    NamedTuple,
+    Tuple,
 )
+from copy import deepcopy
 from datetime import date, datetime
 from enum import Enum
 from decimal import Decimal
@@ -24,6 +28,7 @@ import lxml.etree as ET
 from inspect import isclass
 import logging
 import re
+import zlib
 
 from .critical_warning import CriticalWarning
 from .payment_reconciliation import PaymentReconciliationReport
@@ -428,8 +433,8 @@ class BaseXmlModel(BaseModel):
 
         This method helps with type checking when iterating over lxml elements.
         """
-        # Use xpath to get all child elements - this is safer for typing
-        return element.xpath('./*')
+        # Element children only, skipping comments and processing instructions
+        return list(element.iterchildren(ET.Element))
 
     @classmethod
     def _parse_attributes(
@@ -452,82 +457,28 @@ class BaseXmlModel(BaseModel):
             strict if strict is not None else cls.model_config.get('strict_parsing', False)
         )
 
+        plan = _xml_parse_plan(cls)
         data = {}
-        known_attrs = {
-            field_info.alias or name
-            for name, field_info in cls.model_fields.items()
-            if isinstance(field_info.json_schema_extra, dict)
-            and field_info.json_schema_extra.get("is_attribute")
-        }
         unknown_attrs = {}
         for name, value in element.attrib.items():
-            # Find the field corresponding to this attribute name
-            field_name = next(
-                (fn for fn, fi in cls.model_fields.items() if (fi.alias or fn) == name), None
-            )
-
-            if field_name:
-                field_info = cls.model_fields[field_name]
-                field_type = field_info.annotation
-                origin_type = get_origin(field_type)
-                type_args = get_args(field_type)
-                is_annotated = origin_type is Annotated
-
-                # Handle Optional[T]
-                actual_type = field_type
-                if origin_type is Union and type(None) in type_args:
-                    actual_type = next((t for t in type_args if t is not type(None)), str)  # type: ignore # Use str as fallback
-                    origin_type = get_origin(
-                        actual_type
-                    )  # Re-check origin after stripping Optional
-                    type_args = get_args(actual_type)
-                    is_annotated = origin_type is Annotated
-                    if actual_type is None:
-                        actual_type = str  # Fallback if only Optional[None]
-
-                # If it was Annotated[T, ...], get the base type T
-                base_type = actual_type
-                if is_annotated:
-                    base_type = type_args[0]
-                    origin_type = get_origin(base_type)  # Use origin of base type for checks
-
+            attribute = plan.attributes.get(name)
+            if attribute is not None:
                 try:
-                    parsed_value: Any = None
-                    # Check for Literal origin *before* trying to call the type
-                    if origin_type is Literal:
-                        parsed_value = value  # Assign string directly for Literal
-                    elif base_type == Decimal:
-                        parsed_value = Decimal(value)
-                    elif base_type == int:
-                        parsed_value = int(value)
-                    elif base_type == date:
-                        parsed_value = date.fromisoformat(value)
-                    elif base_type == datetime:
-                        parsed_value = datetime.fromisoformat(value)
-                    elif base_type == bool:
-                        parsed_value = value.lower() in ('true', '1')
-                    elif base_type == bytes:  # Handle base64Binary
-                        # TODO: Implement base64 decoding if needed for fileData
-                        parsed_value = value  # Store as string for now
-                    else:
-                        # Assume string or custom type derived from string
-                        # Check if base_type is callable before calling
-                        parsed_value = base_type(value) if callable(base_type) else value
-                    data[field_name] = parsed_value
+                    data[attribute.field_name] = attribute.parse(value)
                 except (ValueError, TypeError) as e:
                     logger.warning(
                         "Could not parse attribute '%s'='%s' as %s: %s",
                         name,
                         value,
-                        base_type,
+                        attribute.target_type,
                         e,
                     )
                     if strict_mode:
                         raise ValueError(
-                            f"Could not parse attribute '{name}'='{value}' as {base_type}: {e}"
+                            f"Could not parse attribute '{name}'='{value}' as {attribute.target_type}: {e}"
                         )
                     unknown_attrs[name] = value
-            elif name not in known_attrs:
+            elif name not in plan.known_attributes:
                 # Check for XML namespace declarations if needed (e.g., xmlns:prefix=\"...\")
                 if not (
                     name.startswith('{http://www.w3.org/2000/xmlns/}')
@@ -541,35 +492,22 @@ class BaseXmlModel(BaseModel):
         return data
 
     def _build_attributes(self, element: ET._Element):
-        for name, field_info in self.__class__.model_fields.items():
-            if isinstance(field_info.json_schema_extra, dict) and field_info.json_schema_extra.get(
-                "is_attribute"
-            ):
-                value = getattr(self, name, None)
-                # print(f"Building attribute {name} with value {value}")
-                if value is not None:
-                    attr_name = field_info.alias or name
-                    # Basic type conversion to string
-                    str_value: str
-                    if isinstance(value, (date, datetime)):
-                        str_value = value.isoformat()
-                    elif isinstance(value, bool):
-                        if value:
-                            str_value = "1"
-                        else:
-                            if field_info.default is PydanticUndefined:
-                                str_value = "0"
-                            else:
-                                continue
-                    elif isinstance(value, bytes):
-                        # TODO: Implement base64 encoding if needed for fileData
-                        raise NotImplementedError("Base64 encoding is not implemented")
-                    elif isinstance(value, Decimal):
-                        # Format Decimal as a plain string to avoid scientific notation and remove trailing zeros
-                        str_value = format(value.normalize(), "f")
-                    else:
-                        str_value = str(value)
-                    element.set(attr_name, str_value)
+        # Field values live in the instance __dict__; reading it directly avoids an
+        # attribute lookup per (mostly unset) attribute field
+        values = self.__dict__
+        for name, attr_name, has_default in _xml_build_plan(self.__class__).attributes:
+            value = values.get(name)
+            if value is None:
+                continue
+            # Basic type conversion to string
+            if isinstance(value, bool):
+                if value:
+                    element.set(attr_name, "1")
+                elif not has_default:
+                    element.set(attr_name, "0")
+                continue
+            format_value = _ATTRIBUTE_FORMATTERS.get(type(value), _format_attribute_value)
+            element.set(attr_name, format_value(value))
         # Add unknown attributes back for round-tripping
         for name, value in self.unknown_attrs.items():
             # Avoid writing xmlns attributes if they are handled by lxml nsmap
@@ -597,335 +535,135 @@ class BaseXmlModel(BaseModel):
             strict if strict is not None else cls.model_config.get('strict_parsing', False)
         )
 
-        data = {}
-        # All child element fields that aren't marked as attributes
-        # Map from tag -> field name
-        tag_map = {}
-        element_fields = []
+        children = _xml_parse_plan(cls).children
+        data: Dict[str, Any] = {}
         unknown_elements = []
 
-        for name, field_info in cls.model_fields.items():
-            # Skip attributes
-            if isinstance(field_info.json_schema_extra, dict) and field_info.json_schema_extra.get(
-                "is_attribute"
-            ):
-                continue
-            # Skip fields to exclude at XML level
-            if field_info.exclude:
-                continue
-            tag_name = None
-            tag_ns = None
-            # Check field extra info (or class extra) for tag name
-            if field_info.json_schema_extra:
-                extra_info = field_info.json_schema_extra
-                # Tag name from field's extra info
-                if isinstance(extra_info, dict) and 'tag_name' in extra_info:
-                    tag_name = extra_info.get('tag_name')
-                # Namespace from field's extra info
-                if isinstance(extra_info, dict) and 'tag_namespace' in extra_info:
-                    tag_ns = extra_info.get('tag_namespace')
-
-            # Fallback: use field name or alias for tag name
-            if not tag_name:
-                tag_name = field_info.alias or name
-
-            # If namespace provided, use qualified tag with namespace
-            if tag_ns:
-                if tag_ns in NS_MAP:
-                    ns_pfx = NS_MAP[tag_ns]
-                    qualified_tag = f"{{{ns_pfx}}}{tag_name}"
-                else:
-                    qualified_tag = f"{{{tag_ns}}}{tag_name}"
-            else:
-                qualified_tag = tag_name
-
-            element_fields.append((name, field_info))
-            tag_map[qualified_tag] = name
-
-        # Process all child elements
         for child in cls._iter_element(element):
-            if child.tag in tag_map:
-                field_name = tag_map[child.tag]
-                field_info = cls.model_fields[field_name]
-                field_type = field_info.annotation
-                origin_type = get_origin(field_type)
-
-                # Handle Optional[T]
-                actual_type = field_type
-                if origin_type is Union and type(None) in get_args(field_type):
-                    # Extract the actual type from Optional[T]
-                    non_none_types = [t for t in get_args(field_type) if t is not type(None)]
-                    if non_none_types:
-                        actual_type = non_none_types[0]  # Use first non-None type
-                        origin_type = get_origin(actual_type)
-                        inner_args = get_args(actual_type)
-                        # If the actual_type is a class with _from_xml_element, we can parse it
-                        if isclass(actual_type) and hasattr(actual_type, '_from_xml_element'):
-                            try:
-                                parsed_item = actual_type._from_xml_element(
-                                    child, strict=strict_mode
-                                )
-                                data[field_name] = parsed_item
-                                continue  # Successfully parsed Optional[Class] field
-                            except Exception as e:
-                                logger.warning(
-                                    "Failed to parse child element <%s> as %s: %s",
-                                    child.tag,
-                                    actual_type,
-                                    e,
-                                )
-                                if strict_mode:
-                                    raise ValueError(
-                                        f"Failed to parse child element <{child.tag}> as {actual_type}: {e}"
-                                    )
-                                unknown_elements.append(child)
-                                continue
-
-                # Handle Literal type
-                if origin_type is Literal:
-                    # For Literals, we just use the text value directly
-                    if child.text:
-                        literal_values = get_args(field_type)
-                        child_text = child.text.strip()
-                        if child_text in literal_values:
-                            data[field_name] = child_text
-                        else:
-                            error_msg = f"Invalid value '{child_text}' for Literal field, expected one of: {literal_values}"
-                            logger.warning(error_msg)
-                            if strict_mode:
-                                raise ValueError(error_msg)
-                            unknown_elements.append(child)
-                    continue
+            plan = children.get(child.tag)
+            if plan is None:
+                # Handle unknown elements / ##other namespace elements
+                if strict_mode:
+                    raise ValueError(
+                        f"Unknown element <{child.tag}> in namespace {child.nsmap} - content '{child.text}'"
+                    )
+                unknown_elements.append(child)  # Store the raw lxml element
+                continue
 
-                # List handling
-                if origin_type in (list, List):
-                    item_type = get_args(field_type)[0]
-                    if not isclass(item_type):
-                        # Handle List[Union[..]] etc.
-                        item_origin = get_origin(item_type)
-                        if item_origin:
-                            item_type = get_args(item_type)[
-                                0
-                            ]  # Use first type arg (might need refinement)
-
-                    # For simple types, extract the plain text value if present
-                    if item_type in (str, int, float, bool, Decimal, date, datetime):
-                        if child.text is not None:
-                            try:
-                                # Use a conversion based on the type
-                                if item_type == str:
-                                    value = child.text.strip()
-                                elif item_type == int:
-                                    value = int(child.text.strip())
-                                elif item_type == float:
-                                    value = float(child.text.strip())
-                                elif item_type == bool:
-                                    value = child.text.strip().lower() in ('true', '1', 'yes')
-                                elif item_type == Decimal:
-                                    value = Decimal(child.text.strip())
-                                elif item_type == date:
-                                    value = date.fromisoformat(child.text.strip())
-                                elif item_type == datetime:
-                                    value = datetime.fromisoformat(child.text.strip())
-                                else:
-                                    value = child.text.strip()
-                            except (ValueError, TypeError) as e:
-                                logger.warning(
-                                    "Could not parse element <%s> content '%s' as %s: %s",
-                                    child.tag,
-                                    child.text,
-                                    item_type,
-                                    e,
-                                )
-                                if strict_mode:
-                                    raise ValueError(
-                                        f"Could not parse element <{child.tag}> content '{child.text}' as {item_type}: {e}"
-                                    )
-                                unknown_elements.append(child)
-                                continue  # Skip adding to field data
-                            if field_name not in data:
-                                data[field_name] = []
-                            data[field_name].append(value)
-                    # For complex types, delegate to the subclass's XML parser
-                    elif hasattr(item_type, '_from_xml_element'):
-                        try:
-                            parsed_item = item_type._from_xml_element(child, strict=strict_mode)
-                            if field_name not in data:
-                                data[field_name] = []
-                            data[field_name].append(parsed_item)
-                        except Exception as e:
-                            logger.warning(
-                                "Failed to parse child element <%s> as %s: %s",
-                                child.tag,
-                                item_type,
-                                e,
-                            )
-                            if strict_mode:
-                                raise ValueError(
-                                    f"Failed to parse child element <{child.tag}> as {item_type}: {e}"
-                                )
-                            unknown_elements.append(child)
-                    else:
-                        logger.warning(
-                            "Unsupported item type for list field: %s for tag %s",
-                            item_type,
-                            child.tag,
-                        )
-                        if strict_mode:
-                            raise ValueError(
-                                f"Unsupported item type for list field: {item_type} for tag {child.tag}"
-                            )
-                        unknown_elements.append(child)
-                # Direct submodel handling
-                elif isclass(field_type) and hasattr(field_type, '_from_xml_element'):
-                    try:
-                        parsed_item = field_type._from_xml_element(child, strict=strict_mode)
-                        data[field_name] = parsed_item
-                    except Exception as e:
-                        logger.warning(
-                            "Failed to parse child element <%s> as %s: %s",
-                            child.tag,
-                            field_type,
-                            e,
+            kind = plan.kind
+            if kind == "model":
+                parse = plan.parse
+                assert parse is not None  # Always set for "model" and "value" plans
+                try:
+                    value = parse(child, strict=strict_mode)
+                except Exception as e:
+                    logger.warning(
+                        "Failed to parse child element <%s> as %s: %s",
+                        child.tag,
+                        plan.target_type,
+                        e,
+                    )
+                    if strict_mode:
+                        raise ValueError(
+                            f"Failed to parse child element <{child.tag}> as {plan.target_type}: {e}"
                         )
-                        if strict_mode:
-                            raise ValueError(
-                                f"Failed to parse child element <{child.tag}> as {field_type}: {e}"
-                            )
-                        unknown_elements.append(child)
-                # Simple direct value case
-                elif field_type in (str, int, float, bool, Decimal, date, datetime):
-                    if child.text is not None:
-                        try:
-                            # Use a conversion based on the type
-                            if field_type == str:
-                                value = child.text.strip()
-                            elif field_type == int:
-                                value = int(child.text.strip())
-                            elif field_type == float:
-                                value = float(child.text.strip())
-                            elif field_type == bool:
-                                value = child.text.strip().lower() in ('true', '1', 'yes')
-                            elif field_type == Decimal:
-                                value = Decimal(child.text.strip())
-                            elif field_type == date:
-                                value = date.fromisoformat(child.text.strip())
-                            elif field_type == datetime:
-                                value = datetime.fromisoformat(child.text.strip())
-                            else:
-                                value = child.text.strip()
-                            data[field_name] = value
-                        except (ValueError, TypeError) as e:
-                            logger.warning(
-                                "Could not parse element <%s> content '%s' as %s: %s",
-                                child.tag,
-                                child.text,
-                                field_type,
-                                e,
-                            )
-                            if strict_mode:
-                                raise ValueError(
-                                    f"Could not parse element <{child.tag}> content '{child.text}' as {field_type}: {e}"
-                                )
-                            unknown_elements.append(child)
-                else:
-                    # Unknown complex type - we might need more handling here
+                    unknown_elements.append(child)
+                    continue
+            elif kind == "value":
+                if child.text is None:
+                    continue
+                parse = plan.parse
+                assert parse is not None
+                try:
+                    value = parse(child.text.strip())
+                except (ValueError, TypeError) as e:
                     logger.warning(
-                        "Unsupported field type for element <%s>: %s",
+                        "Could not parse element <%s> content '%s' as %s: %s",
                         child.tag,
-                        field_type,
+                        child.text,
+                        plan.target_type,
+                        e,
                     )
                     if strict_mode:
                         raise ValueError(
-                            f"Unsupported field type for element <{child.tag}>: {field_type}"
+                            f"Could not parse element <{child.tag}> content '{child.text}' as {plan.target_type}: {e}"
                         )
                     unknown_elements.append(child)
+                    continue
+            elif kind == "literal":
+                # For Literals, we just use the text value directly
+                if not child.text:
+                    continue
+                value = child.text.strip()
+                if value not in plan.literal_values:
+                    error_msg = f"Invalid value '{value}' for Literal field, expected one of: {plan.literal_values}"
+                    logger.warning(error_msg)
+                    if strict_mode:
+                        raise ValueError(error_msg)
+                    unknown_elements.append(child)
+                    continue
             else:
-                # Handle unknown elements / ##other namespace elements
-                if strict_mode:
-                    raise ValueError(
-                        f"Unknown element <{child.tag}> in namespace {child.nsmap} - content '{child.text}'"
+                if plan.is_list:
+                    error_msg = f"Unsupported item type for list field: {plan.target_type} for tag {child.tag}"
+                    logger.warning(
+                        "Unsupported item type for list field: %s for tag %s",
+                        plan.target_type,
+                        child.tag,
                     )
-                unknown_elements.append(child)  # Store the raw lxml element
+                else:
+                    # Unknown complex type - we might need more handling here
+                    error_msg = (
+                        f"Unsupported field type for element <{child.tag}>: {plan.target_type}"
+                    )
+                    logger.warning(
+                        "Unsupported field type for element <%s>: %s",
+                        child.tag,
+                        plan.target_type,
+                    )
+                if strict_mode:
+                    raise ValueError(error_msg)
+                unknown_elements.append(child)
+                continue
+
+            if plan.is_list:
+                data.setdefault(plan.field_name, []).append(value)
+            else:
+                data[plan.field_name] = value
 
         if unknown_elements:
             data['unknown_elements'] = unknown_elements
         return data
 
     def _build_children(self, parent_element: ET._Element):
-        tag_map = {}
-        for name, field_info in self.__class__.model_fields.items():
-            extra = (
-                field_info.json_schema_extra
-                if isinstance(field_info.json_schema_extra, dict)
-                else {}
-            )
-            # Skip excluded fields and attributes
-            if field_info.exclude or extra.get("is_attribute"):
+        for name, tag_name, nsmap_for_element in _xml_build_plan(self.__class__).children:
+            value = getattr(self, name, None)
+            if value is None:
                 continue
-            ns = extra.get("tag_namespace", NS_MAP['eCH-0196'])
-            local_name = field_info.alias or name
-            tag_map[name] = (ns, local_name)
 
-        for name, field_info in self.__class__.model_fields.items():
-            # Skip excluded fields
-            if field_info.exclude:
-                continue
-            if name in tag_map:
-                value = getattr(self, name, None)
-                if value is None:
+            for item in value if isinstance(value, list) else (value,):
+                if item is None:
                     continue
-
-                ns_uri, local_name = tag_map[name]
-                # Construct tag name correctly using lxml helper if ns_uri is present
-                if ns_uri:
-                    tag_name = f"{{{ns_uri}}}{local_name}"
-                    # Ensure namespace is defined in the parent or globally if needed
-                    # ET.register_namespace might be needed, or pass nsmap to Element
+                if isinstance(item, BaseXmlModel):
+                    item._build_xml_element(parent_element, tag_name)
                 else:
-                    tag_name = local_name  # No namespace
-
-                values_to_process = value if isinstance(value, list) else [value]
-
-                for item in values_to_process:
-                    if item is None:
-                        continue
-
-                    # Determine namespace prefix for the element
-                    prefix = next((p for p, u in NS_MAP.items() if u == ns_uri), None)
-                    nsmap_for_element = (
-                        {prefix: ns_uri}
-                        if prefix and ns_uri
-                        else ({None: ns_uri} if ns_uri else None)
+                    # Handle simple text content
+                    child_element = ET.SubElement(
+                        parent_element, tag_name, attrib={}, nsmap=nsmap_for_element
                     )
-
-                    if isinstance(item, BaseXmlModel):
-                        # Pass nsmap to ensure prefix is defined if needed
-                        item._build_xml_element(parent_element, tag_name)
-                    else:
-                        # Handle simple text content
-                        child_element = ET.SubElement(
-                            parent_element, tag_name, attrib={}, nsmap=nsmap_for_element
-                        )
-                        child_element.text = str(item)  # Basic handling
+                    child_element.text = str(item)  # Basic handling
 
         # Add unknown elements back for round-tripping
         for unknown in self.unknown_elements:
-            # We stored raw lxml elements, so just append them
-            # Ensure they are deepcopied if necessary to avoid issues when appending to different trees
-            from copy import deepcopy
-
+            # We stored raw lxml elements; copy them so the model keeps its own
+            # and they can be appended to any number of trees
             parent_element.append(deepcopy(unknown))
 
     def _build_xml_element(
         self, parent_element: Optional[ET._Element] = None, name: Optional[str] = None
     ) -> ET._Element:
         """Build XML element from this model instance."""
+        plan = _xml_build_plan(self.__class__)
         # Determine tag name: specified name, or from config, or class name
-        tag_name = None
-        ns = NS_MAP['eCH-0196']  # Default namespace
-        config = getattr(self.__class__, 'Config', None)
-
         if name is not None:
             # If name is provided externally, use it (likely already has namespace)
             if '{' in name:
@@ -933,38 +671,23 @@ class BaseXmlModel(BaseModel):
                 ns, tag_name = name.split('}', 1)
                 ns = ns[1:]  # Remove leading '{'
             else:
-                # Use name as is for tag_name
+                ns = NS_MAP['eCH-0196']  # Default namespace
                 tag_name = name
         else:
-            # No name provided, get from config or class
-            if config and hasattr(config, 'tag_name'):
-                tag_name = config.tag_name
-            else:
-                # Convert class name to camelCase for tag name
-                class_name = self.__class__.__name__
-                # Convert first character to lowercase
-                tag_name = class_name[0].lower() + class_name[1:] if class_name else ''
-
-        # Get namespace from config if available
-        if config and hasattr(config, 'tag_namespace'):
-            ns = config.tag_namespace
-
-        # Use model_config instead of Config if available
-        model_config = getattr(self.__class__, 'model_config', {})
-        json_schema_extra = model_config.get('json_schema_extra', {})
-        if json_schema_extra:
-            if 'tag_name' in json_schema_extra:
-                tag_name = json_schema_extra['tag_name']
-            if 'tag_namespace' in json_schema_extra:
-                ns = json_schema_extra['tag_namespace']
+            ns = NS_MAP['eCH-0196']
+            tag_name = plan.tag_name
+
+        # Namespace and tag name configured on the class take precedence
+        if plan.tag_namespace is not _UNSET:
+            ns = plan.tag_namespace
+        if plan.config_tag_name is not _UNSET:
+            tag_name = plan.config_tag_name
 
         # Create element with namespace
         if parent_element is not None:
             # For SubElement, use {namespace}localname format for the tag
             qualified_name = f"{{{ns}}}{tag_name}"
-            element = ET.SubElement(
-                parent_element, qualified_name, attrib={}, nsmap=parent_element.nsmap
-            )
+            element = ET.SubElement(parent_element, qualified_name)
         else:
             # For root element, use the tag_name and set nsmap
             element = ET.Element(tag_name, attrib={}, nsmap={None: ns})
@@ -1008,6 +731,291 @@ class BaseXmlModel(BaseModel):
         return instance
 
 
+# --- Compiled XML parse plans ---
+# Which field a tag or attribute maps to and how its value is parsed depends only
+# on the model class, so it is derived from the field annotations once per class.
+
+_SIMPLE_VALUE_PARSERS: Dict[Any, Callable[[str], Any]] = {
+    str: lambda text: text,
+    int: int,
+    float: float,
+    bool: lambda text: text.lower() in ('true', '1', 'yes'),
+    Decimal: Decimal,
+    date: date.fromisoformat,
+    datetime: datetime.fromisoformat,
+}
+
+
+def _simple_value_parser(field_type: Any) -> Optional[Callable[[str], Any]]:
+    # Compared with == rather than looked up, annotations need not be hashable
+    return next((p for t, p in _SIMPLE_VALUE_PARSERS.items() if t == field_type), None)
+
+
+class _AttributeParsePlan(NamedTuple):
+    """How to parse an XML attribute into a model field."""
+
+    field_name: str
+    target_type: Any
+    parse: Callable[[str], Any]
+
+
+class _ChildParsePlan(NamedTuple):
+    """How to parse the child elements with one tag into a model field."""
+
+    field_name: str
+    # "model" (nested BaseXmlModel), "value" (text of a simple type), "literal"
+    # or "unsupported"
+    kind: str
+    target_type: Any
+    is_list: bool
+    parse: Optional[Callable[..., Any]] = None
+    literal_values: Tuple[Any, ...] = ()
+
+
+class _XmlParsePlan(NamedTuple):
+    attributes: Dict[str, _AttributeParsePlan]  # By attribute name
+    known_attributes: frozenset
+    children: Dict[str, _ChildParsePlan]  # By qualified tag
+
+
+_XML_PARSE_PLANS: Dict[type, _XmlParsePlan] = {}
+
+
+def _is_attribute_field(field_info: Any) -> bool:
+    return isinstance(field_info.json_schema_extra, dict) and bool(
+        field_info.json_schema_extra.get("is_attribute")
+    )
+
+
+def _compile_attribute_parser(field_type: Any) -> Tuple[Any, Callable[[str], Any]]:
+    """Returns the type an attribute value is parsed as and the parser to use."""
+    origin_type = get_origin(field_type)
+    type_args = get_args(field_type)
+    is_annotated = origin_type is Annotated
+
+    # Handle Optional[T]
+    actual_type = field_type
+    if origin_type is Union and type(None) in type_args:
+        actual_type = next((t for t in type_args if t is not type(None)), str)  # type: ignore # Use str as fallback
+        origin_type = get_origin(actual_type)  # Re-check origin after stripping Optional
+        type_args = get_args(actual_type)
+        is_annotated = origin_type is Annotated
+        if actual_type is None:
+            actual_type = str  # Fallback if only Optional[None]
+
+    # If it was Annotated[T, ...], get the base type T
+    base_type = actual_type
+    if is_annotated:
+        base_type = type_args[0]
+        origin_type = get_origin(base_type)  # Use origin of base type for checks
+
+    def as_is(value: str) -> str:
+        return value
+
+    # Check for Literal origin *before* trying to call the type
+    if origin_type is Literal:
+        return base_type, as_is  # Assign string directly for Literal
+    if base_type == Decimal:
+        return base_type, Decimal
+    if base_type == int:
+        return base_type, int
+    if base_type == date:
+        return base_type, date.fromisoformat
+    if base_type == datetime:
+        return base_type, datetime.fromisoformat
+    if base_type == bool:
+        return base_type, lambda value: value.lower() in ('true', '1')
+    if base_type == bytes:  # Handle base64Binary
+        # TODO: Implement base64 decoding if needed for fileData
+        return base_type, as_is  # Store as string for now
+    # Assume string or custom type derived from string
+    return base_type, base_type if callable(base_type) else as_is
+
+
+def _compile_child_plan(field_name: str, field_type: Any) -> _ChildParsePlan:
+    """Derives how child elements of a field are parsed from its annotation."""
+    origin_type = get_origin(field_type)
+
+    # Handle Optional[T]
+    if origin_type is Union and type(None) in get_args(field_type):
+        non_none_types = [t for t in get_args(field_type) if t is not type(None)]
+        if non_none_types:
+            actual_type = non_none_types[0]  # Use first non-None type
+            origin_type = get_origin(actual_type)
+            if isclass(actual_type) and hasattr(actual_type, '_from_xml_element'):
+                return _ChildParsePlan(
+                    field_name, "model", actual_type, False, actual_type._from_xml_element
+                )
+
+    if origin_type is Literal:
+        return _ChildParsePlan(
+            field_name, "literal", field_type, False, literal_values=get_args(field_type)
+        )
+
+    if origin_type in (list, List):
+        item_type = get_args(field_type)[0]
+        if not isclass(item_type):
+            # Handle List[Union[..]] etc.
+            if get_origin(item_type):
+                item_type = get_args(item_type)[0]  # Use first type arg (might need refinement)
+        parse = _simple_value_parser(item_type)
+        if parse is not None:
+            return _ChildParsePlan(field_name, "value", item_type, True, parse)
+        if hasattr(item_type, '_from_xml_element'):
+            return _ChildParsePlan(
+                field_name, "model", item_type, True, item_type._from_xml_element
+            )
+        return _ChildParsePlan(field_name, "unsupported", item_type, True)
+
+    if isclass(field_type) and hasattr(field_type, '_from_xml_element'):
+        return _ChildParsePlan(field_name, "model", field_type, False, field_type._from_xml_element)
+    parse = _simple_value_parser(field_type)
+    if parse is not None:
+        return _ChildParsePlan(field_name, "value", field_type, False, parse)
+    return _ChildParsePlan(field_name, "unsupported", field_type, False)
+
+
+def _xml_parse_plan(cls: type) -> _XmlParsePlan:
+    """Returns the parse plan of a BaseXmlModel class, compiling it on first use."""
+    plan = _XML_PARSE_PLANS.get(cls)
+    if plan is not None:
+        return plan
+
+    fields = cls.model_fields  # type: ignore[attr-defined]
+    attributes: Dict[str, _AttributeParsePlan] = {}
+    for name, field_info in fields.items():
+        # An attribute maps to the first field with that alias or name
+        attribute_name = field_info.alias or name
+        if attribute_name not in attributes:
+            target_type, parse = _compile_attribute_parser(field_info.annotation)
+            attributes[attribute_name] = _AttributeParsePlan(name, target_type, parse)
+    known_attributes = frozenset(
+        field_info.alias or name
+        for name, field_info in fields.items()
+        if _is_attribute_field(field_info)
+    )
+
+    children: Dict[str, _ChildParsePlan] = {}
+    for name, field_info in fields.items():
+        # Skip attributes and fields to exclude at XML level
+        if _is_attribute_field(field_info) or field_info.exclude:
+            continue
+        extra_info = (
+            field_info.json_schema_extra if isinstance(field_info.json_schema_extra, dict) else {}
+        )
+        # Tag name from field's extra info, falling back to the alias or field name
+        tag_name = extra_info.get('tag_name') or field_info.alias or name
+        tag_ns = extra_info.get('tag_namespace')
+        # If namespace provided, use qualified tag with namespace
+        if tag_ns:
+            qualified_tag = f"{{{NS_MAP.get(tag_ns, tag_ns)}}}{tag_name}"
+        else:
+            qualified_tag = tag_name
+        children[qualified_tag] = _compile_child_plan(name, field_info.annotation)
+
+    plan = _XmlParsePlan(attributes, known_attributes, children)
+    _XML_PARSE_PLANS[cls] = plan
+    return plan
+
+
+# --- Compiled XML serialization plans ---
+
+_UNSET: Any = object()
+
+
+def _format_decimal(value: Decimal) -> str:
+    # Format Decimal as a plain string to avoid scientific notation and remove trailing zeros
+    return format(value.normalize(), "f")
+
+
+def _format_attribute_value(value: Any) -> str:
+    """Converts a non-boolean attribute value to its XML string."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        # TODO: Implement base64 encoding if needed for fileData
+        raise NotImplementedError("Base64 encoding is not implemented")
+    if isinstance(value, Decimal):
+        return _format_decimal(value)
+    return str(value)
+
+
+# Shortcuts for the exact types most attribute values have
+_ATTRIBUTE_FORMATTERS: Dict[type, Callable[[Any], str]] = {
+    str: str,
+    int: str,
+    Decimal: _format_decimal,
+    date: date.isoformat,
+    datetime: datetime.isoformat,
+}
+
+
+class _XmlBuildPlan(NamedTuple):
+    # (field name, attribute name, whether the field has a default) per attribute
+    attributes: Tuple[Tuple[str, str, bool], ...]
+    # (field name, qualified tag, nsmap for simple values) per child element, in field order
+    children: Tuple[Tuple[str, str, Optional[Dict[Optional[str], str]]], ...]
+    tag_name: str  # Tag of the element when the parent does not name it
+    tag_namespace: Any  # Namespace set by the class config, or _UNSET
+    config_tag_name: Any  # Tag name set by model_config, overriding any other, or _UNSET
+
+
+_XML_BUILD_PLANS: Dict[type, _XmlBuildPlan] = {}
+
+
+def _xml_build_plan(cls: type) -> _XmlBuildPlan:
+    """Returns the serialization plan of a BaseXmlModel class, compiling it on first use."""
+    plan = _XML_BUILD_PLANS.get(cls)
+    if plan is not None:
+        return plan
+
+    attributes = []
+    children: List[Tuple[str, str, Optional[Dict[Optional[str], str]]]] = []
+    for name, field_info in cls.model_fields.items():  # type: ignore[attr-defined]
+        if _is_attribute_field(field_info):
+            attributes.append(
+                (name, field_info.alias or name, field_info.default is not PydanticUndefined)
+            )
+            continue
+        # Skip excluded fields
+        if field_info.exclude:
+            continue
+        extra = (
+            field_info.json_schema_extra if isinstance(field_info.json_schema_extra, dict) else {}
+        )
+        ns_uri = extra.get("tag_namespace", NS_MAP['eCH-0196'])
+        local_name = field_info.alias or name
+        tag_name = f"{{{ns_uri}}}{local_name}" if ns_uri else local_name  # No namespace
+        # Namespace prefix for simple text elements
+        prefix = next((p for p, u in NS_MAP.items() if u == ns_uri), None)
+        nsmap_for_element: Optional[Dict[Optional[str], str]] = (
+            {prefix: ns_uri} if prefix and ns_uri else ({None: ns_uri} if ns_uri else None)
+        )
+        children.append((name, tag_name, nsmap_for_element))
+
+    config = getattr(cls, 'Config', None)
+    if config and hasattr(config, 'tag_name'):
+        default_tag_name = config.tag_name
+    else:
+        # Convert class name to camelCase for tag name
+        class_name = cls.__name__
+        default_tag_name = class_name[0].lower() + class_name[1:] if class_name else ''
+    tag_namespace = config.tag_namespace if config and hasattr(config, 'tag_namespace') else _UNSET
+    config_tag_name = _UNSET
+    json_schema_extra = getattr(cls, 'model_config', {}).get('json_schema_extra', {})
+    if json_schema_extra:
+        if 'tag_name' in json_schema_extra:
+            config_tag_name = json_schema_extra['tag_name']
+        if 'tag_namespace' in json_schema_extra:
+            tag_namespace = json_schema_extra['tag_namespace']
+
+    plan = _XmlBuildPlan(
+        tuple(attributes), tuple(children), default_tag_name, tag_namespace, config_tag_name
+    )
+    _XML_BUILD_PLANS[cls] = plan
+    return plan
+
+
 # --- Main eCH-0196 Types (Simplified Stubs) ---
 
 
@@ -1812,10 +1820,9 @@ class TaxStatementBase(BaseXmlModel):
         Returns:
             bool: True if validation passes
         """
-        from pathlib import Path
+        from opensteuerauszug.util.xsd_validation import DEFAULT_ECH0196_XSD, schema_errors
 
-        specs_dir = Path("specs")
-        xsd_path = specs_dir / "eCH-0196-2-2.xsd"
+        xsd_path = DEFAULT_ECH0196_XSD
 
         output_required_errors = self._validate_output_required_fields()
         if output_required_errors:
@@ -1829,36 +1836,10 @@ class TaxStatementBase(BaseXmlModel):
             logger.warning(f"XSD schema file not found at {xsd_path}. Skipping validation.")
             return True
 
-        # Custom resolver to handle schema imports
-        class _LocalXsdResolver(ET.Resolver):
-            def __init__(self, specs_directory: Path) -> None:
-                super().__init__()
-                self._specs_dir = specs_directory
-
-            def resolve(self, url, pubid, context):
-                if not url:
-                    return None
-                basename = url.rsplit("/", 1)[-1]
-                candidate = self._specs_dir / basename
-                if candidate.exists():
-                    return self.resolve_filename(str(candidate), context)
-                return None
-
         try:
-            # Parse the XSD schema
-            xsd_parser = ET.XMLParser()
-            xsd_parser.resolvers.add(_LocalXsdResolver(specs_dir))
-            schema_doc = ET.parse(str(xsd_path), parser=xsd_parser)
-            schema = ET.XMLSchema(schema_doc)
-
-            # Convert the model to XML
-            xml_bytes = self.to_xml_bytes()
-            xml_doc = ET.fromstring(xml_bytes)
-
-            # Validate against the schema
-            if not schema.validate(xml_doc):
-                error_log = schema.error_log
-                error_messages = [str(error) for error in error_log]
+            # The schema is compiled once per process; the tree is validated as built
+            error_messages = schema_errors(self._xml_root(), xsd_path)
+            if error_messages:
                 error_message = "XSD validation failed:\n  " + "\n  ".join(error_messages)
                 logger.error(error_message)
                 raise ValueError(error_message)
@@ -1875,6 +1856,10 @@ class TaxStatementBase(BaseXmlModel):
             logger.error(error_message)
             raise ValueError(error_message)
 
+    def _xml_root(self) -> ET._Element:
+        """The statement as an lxml element tree."""
+        return self._build_xml_element(None)
+
     def to_xml_bytes(self) -> bytes:
         raise NotImplementedError
 
@@ -1914,6 +1899,9 @@ class TaxStatement(TaxStatementBase):
         "json_schema_extra": {'tag_name': 'taxStatement', 'tag_namespace': NS_MAP['eCH-0196']}
     }
 
+    # (id of the owning statement, serializations by kind) while the cache is enabled
+    _serialization_cache: Optional[Tuple[int, Dict[Tuple, Any]]] = PrivateAttr(default=None)
+
     def _build_xml_element(
         self, parent_element: Optional[ET._Element] = None, name: Optional[str] = None
     ) -> ET._Element:
@@ -1977,9 +1965,49 @@ class TaxStatement(TaxStatementBase):
         except Exception as e:
             raise ValueError(f"Error reading tax statement from file: {e}")
 
+    def enable_serialization_cache(self) -> None:
+        """Reuse the serialized XML until :meth:`invalidate_serialization_cache`.
+
+        Validation, rendering (the PDF417 barcodes) and the XML output each
+        serialize the whole statement. Once the cache is enabled they share one
+        serialization. Changes to the model are not detected: whoever changes
+        the statement afterwards must call :meth:`invalidate_serialization_cache`.
+        """
+        if self._serialization_cache is None or self._serialization_cache[0] != id(self):
+            self._serialization_cache = (id(self), {})
+
+    def invalidate_serialization_cache(self) -> None:
+        """Drop the cached serializations after the model was changed."""
+        if self._serialization_cache is not None:
+            self._serialization_cache = (id(self), {})
+
+    def _cached_serialization(self, kind: Tuple, build: Callable[[], Any]) -> Any:
+        cache = self._serialization_cache
+        # A copy of the statement inherits the cache, but not its contents
+        if cache is None or cache[0] != id(self):
+            return build()
+        data = cache[1].get(kind)
+        if data is None:
+            data = cache[1][kind] = build()
+        return data
+
     def to_xml_bytes(self, pretty_print=True) -> bytes:
         """Serializes the model to XML bytes."""
-        root = self._build_xml_element(None)
+        return self._cached_serialization(
+            ("xml", pretty_print), lambda: self._serialize_xml(pretty_print)
+        )
+
+    def to_compressed_xml_bytes(self) -> bytes:
+        """The XML of :meth:`to_xml_bytes` compressed with zlib, as encoded in the barcodes."""
+        return self._cached_serialization(("zlib",), lambda: zlib.compress(self.to_xml_bytes(), 9))
+
+    def _xml_root(self) -> ET._Element:
+        # Shared by validation and serialization while the cache is enabled;
+        # neither modifies the tree.
+        return self._cached_serialization(("tree",), lambda: self._build_xml_element(None))
+
+    def _serialize_xml(self, pretty_print: bool) -> bytes:
+        root = self._xml_root()
         xml_bytes = ET.tostring(root, pretty_print=pretty_print, xml_declaration=True, encoding='UTF-8')  # type: ignore
         # Replace single quotes with double quotes in XML declaration to match verifier expectations
         # Use regex to handle variations in whitespace and ensure robustness
@@ -5,7 +5,6 @@ import hashlib
 from pathlib import Path
 from typing import Any, Dict, Optional, Union, List, cast
 from decimal import Decimal, ROUND_HALF_UP
-import zlib
 from PIL import Image as PILImage
 import html
 
@@ -1515,8 +1514,7 @@ def render_to_barcodes(tax_statement: TaxStatement) -> list[PILImage.Image]:
     from pdf417gen.encoding import encode_optional_field, MACRO_FILE_NAME
 
     # Use the real XML data for proper macro PDF417 generation
-    xml = tax_statement.to_xml_bytes()
-    data = zlib.compress(xml, 9)
+    data = tax_statement.to_compressed_xml_bytes()
 
     file_name = tax_statement.id
 
@@ -2822,6 +2820,10 @@ def render_tax_statement(
         story.append(PageBreak())
         story.extend(criticial_warnings_flowables)
 
+    # The tables above sort lists of the statement in place; the barcodes must
+    # encode the statement as it is now, not a serialization cached before.
+    tax_statement.invalidate_serialization_cache()
+
     # Add the barcode page
     make_barcode_pages(doc, story, tax_statement, title_style, barcode_style)
 
@@ -1,10 +1,14 @@
+import json
 import logging
+import os
+import time
 import typer
 import sys
 from enum import Enum
 from pathlib import Path
-from typing import List, Optional, cast
+from typing import List, Optional, Tuple, cast
 from datetime import date, datetime
+import lxml.etree as ET
 from pypdf import PdfReader, PdfWriter
 
 from .config.models import (
@@ -23,13 +27,16 @@ from .calculate.total import TotalCalculator
 from .calculate.cleanup import CleanupCalculator
 from .calculate.minimal_tax_value import MinimalTaxValueCalculator
 from .calculate.kursliste_tax_value_calculator import KurslisteTaxValueCalculator
+from .calculate.kursliste_prefetch import KurslistePrefetchCalculator
 from .calculate.fill_in_tax_value_calculator import FillInTaxValueCalculator
 from .calculate.payment_reconciliation_calculator import PaymentReconciliationCalculator
 from .calculate.withholding_cap_calculator import WithholdingCapCalculator
+from .calculate.pipeline import CalculatorPipeline
 from .util.known_issues import is_known_issue
 from .core.exchange_rate_provider import ExchangeRateProvider
-from .core.kursliste_manager import KurslisteManager
-from .core.kursliste_exchange_rate_provider import KurslisteExchangeRateProvider
+from .core.kursliste_accessor import KurslisteAccessor
+from .core.kursliste_db_reader import KurslisteDBReader
+from .core.kursliste_session import KurslisteSession, KurslisteSessionPool
 from .config import ConfigManager, ConcreteAccountSettings
 from .config.paths import (
     resolve_config_file,
@@ -37,6 +44,8 @@ from .config.paths import (
     resolve_security_identifiers_file,
 )
 from .kursliste.__main__ import app as kursliste_app
+from .batch import RAW_IMPORTER, format_summary, load_manifest, results_as_dicts, run_batch
+from .util.xsd_validation import DEFAULT_ECH0196_XSD, validate_files
 from typer.main import TyperGroup
 
 logger = logging.getLogger(__name__)
@@ -103,6 +112,32 @@ _COMMAND_DEFAULT_PHASES = {
 }
 
 
+def _open_kursliste_session(
+    ctx: typer.Context,
+    kursliste_dir: Path,
+    read_only: bool,
+    mmap_size: int,
+    index_xml: bool,
+    accessor_cache_size: int,
+) -> Tuple[KurslisteSession, bool]:
+    """
+    Opens the Kursliste session of a run.
+
+    When the run is part of a batch, the context object is the worker's
+    KurslisteSessionPool and the pooled session is returned. Returns the session
+    and whether the run owns it (and has to close it).
+    """
+    options = dict(
+        read_only=read_only,
+        mmap_size=mmap_size,
+        index_xml=index_xml,
+        accessor_cache_size=accessor_cache_size,
+    )
+    if isinstance(ctx.obj, KurslisteSessionPool):
+        return ctx.obj.get(kursliste_dir, **options), False
+    return KurslisteSession(kursliste_dir, **options), True
+
+
 @app.command("process")
 def process(
     ctx: typer.Context,
@@ -194,6 +229,34 @@ def process(
         "--kursliste-dir",
         help="Directory containing Kursliste XML files for exchange rate information. Defaults to 'data/kursliste' in CWD or XDG data home.",
     ),
+    kursliste_mmap_mb: int = typer.Option(
+        KurslisteDBReader.DEFAULT_MMAP_SIZE // (1024 * 1024),
+        "--kursliste-mmap-mb",
+        min=0,
+        help="MiB of each Kursliste SQLite database to memory-map with --kursliste-immutable. 0 disables memory mapping.",
+    ),
+    kursliste_immutable: bool = typer.Option(
+        False,
+        "--kursliste-immutable/--no-kursliste-immutable",
+        help="Open the Kursliste SQLite databases read-only and immutable, memory-mapped, so concurrent runs share the OS page cache. SQLite then skips locking and change detection: the databases must not be written (e.g. by 'kursliste convert') while a run has them open.",
+    ),
+    kursliste_xml_index: bool = typer.Option(
+        False,
+        "--kursliste-xml-index",
+        help="For years with only a Kursliste XML file, read it through a byte-offset index (stored next to the file) instead of loading it into memory.",
+    ),
+    kursliste_cache_size: int = typer.Option(
+        KurslisteAccessor.DEFAULT_CACHE_SIZE,
+        "--kursliste-cache-size",
+        min=0,
+        help="Maximum number of cached Kursliste lookup results per lookup type and year. 0 disables the caches.",
+    ),
+    tax_value_threads: int = typer.Option(
+        1,
+        "--tax-value-threads",
+        min=1,
+        help="Threads computing the tax values and Kursliste payments of the securities in parallel. The result does not depend on the number of threads.",
+    ),
     org_nr: Optional[str] = typer.Option(
         None, "--org-nr", help="Override the organization number used in barcodes (5-digit number)"
     ),
@@ -221,6 +284,8 @@ def process(
 ):
     """Processes financial data to generate a Swiss tax statement (Steuerauszug)."""
     logging.basicConfig(level=log_level.value)
+    # basicConfig leaves an already configured root logger alone (batch jobs)
+    logging.getLogger().setLevel(log_level.value)
     # Suppress pypdf warnings to avoid cluttering output with benign warnings
     # about rotated text and other PDF layout issues
     logging.getLogger('pypdf').setLevel(logging.ERROR)
@@ -516,6 +581,9 @@ def process(
             tax_year = statement.taxPeriod
 
     current_phase = None
+    # Shared by the calculate and verify phases, created by the first one that needs it
+    kursliste_session: Optional[KurslisteSession] = None
+    owns_kursliste_session = False
     try:
         if Phase.IMPORT in run_phases and not raw_import:
             current_phase = Phase.IMPORT
@@ -698,49 +766,76 @@ def process(
             else:
                 print("Security identifier map not loaded or empty. Enrichment will be skipped.")
 
-            print("Running CleanupCalculator...")
-            cleanup_calculator = CleanupCalculator(
-                period_from=parsed_period_from,
-                period_to=parsed_period_to,
-                identifier_map=security_identifier_map,
-                enable_filtering=filter_to_period_flag,
-                importer_name=importer_type.value,
-                override_org_nr=org_nr,
-                config_settings=general_config_settings,
-                render_language=render_language,
-            )
-            statement = cleanup_calculator.calculate(statement)
-            print(
-                f"CleanupCalculator finished. Summary: Modified fields count: {len(cleanup_calculator.modified_fields)}"
-            )
-            dump_debug_model(
-                current_phase.value + "_after_cleanup", statement
-            )  # Optional intermediate dump
-
             exchange_rate_provider: ExchangeRateProvider
             effective_kursliste_dir = resolve_kursliste_dir(kursliste_dir)
             print(f"Using KurslisteExchangeRateProvider with directory: {effective_kursliste_dir}")
             try:
                 if not effective_kursliste_dir.exists():
                     print(f"Warning: Kursliste directory {effective_kursliste_dir} does not exist")
-                kursliste_manager = KurslisteManager()
-                kursliste_manager.load_directory(effective_kursliste_dir)
+                kursliste_session, owns_kursliste_session = _open_kursliste_session(
+                    ctx,
+                    effective_kursliste_dir,
+                    read_only=kursliste_immutable,
+                    mmap_size=kursliste_mmap_mb * 1024 * 1024,
+                    index_xml=kursliste_xml_index,
+                    accessor_cache_size=kursliste_cache_size,
+                )
 
                 # Verify that Kursliste data exists for the required tax year
                 required_tax_year = parsed_period_to.year
-                kursliste_manager.ensure_year_available(required_tax_year, effective_kursliste_dir)
+                kursliste_session.ensure_year_available(required_tax_year)
 
-                exchange_rate_provider = KurslisteExchangeRateProvider(kursliste_manager)
+                exchange_rate_provider = kursliste_session.exchange_rate_provider
             except Exception as e:
                 raise ValueError(
                     f"Failed to initialize KurslisteExchangeRateProvider with directory {effective_kursliste_dir}: {e}"
                 )
 
+            # Steps whose dependencies allow it share one traversal of the statement.
+            # The intermediate debug dumps need every step to run on its own.
+            pipeline = CalculatorPipeline(fuse=debug_dump_path is None)
+            phase_name = current_phase.value
+
+            cleanup_calculator = CleanupCalculator(
+                period_from=parsed_period_from,
+                period_to=parsed_period_to,
+                identifier_map=security_identifier_map,
+                enable_filtering=filter_to_period_flag,
+                importer_name=importer_type.value,
+                override_org_nr=org_nr,
+                config_settings=general_config_settings,
+                render_language=render_language,
+            )
+
+            def cleanup_done(model: TaxStatement) -> None:
+                print(
+                    f"CleanupCalculator finished. Summary: Modified fields count: {len(cleanup_calculator.modified_fields)}"
+                )
+                dump_debug_model(
+                    phase_name + "_after_cleanup", model
+                )  # Optional intermediate dump
+
+            pipeline.add("cleanup", cleanup_calculator, on_done=cleanup_done)
+            last_step = "cleanup"
+
+            if tax_calculation_level != TaxCalculationLevel.NONE:
+                prefetch_calculator = KurslistePrefetchCalculator(kursliste_session.manager)
+
+                def prefetch_done(model: TaxStatement) -> None:
+                    print(
+                        f"KurslistePrefetchCalculator finished. Loaded {prefetch_calculator.loaded_securities} securities and {prefetch_calculator.loaded_exchange_rates} exchange rates in {prefetch_calculator.elapsed_seconds:.2f}s"
+                    )
+
+                # The tax value calculator needs the bulk lookups completed, not per node
+                pipeline.add(
+                    "kursliste_prefetch", prefetch_calculator, after=["cleanup"], on_done=prefetch_done
+                )
+                last_step = "kursliste_prefetch"
+
             tax_value_calculator: Optional[MinimalTaxValueCalculator] = None
             calculator_name = ""
 
             if tax_calculation_level == TaxCalculationLevel.MINIMAL:
-                print("Running MinimalTaxValueCalculator...")
                 calculator_name = "MinimalTaxValueCalculator"
                 tax_value_calculator = MinimalTaxValueCalculator(
                     mode=CalculationMode.OVERWRITE,
@@ -748,32 +843,40 @@ def process(
                     keep_existing_payments=calculate_settings.keep_existing_payments,
                 )
             elif tax_calculation_level == TaxCalculationLevel.KURSLISTE:
-                print("Running KurslisteTaxValueCalculator...")
                 calculator_name = "KurslisteTaxValueCalculator"
                 tax_value_calculator = KurslisteTaxValueCalculator(
                     mode=CalculationMode.OVERWRITE,
                     exchange_rate_provider=exchange_rate_provider,
                     keep_existing_payments=calculate_settings.keep_existing_payments,
                     render_language=render_language,
+                    workers=tax_value_threads,
                 )
             elif tax_calculation_level == TaxCalculationLevel.FILL_IN:
-                print("Running FillInTaxValueCalculator...")
                 calculator_name = "FillInTaxValueCalculator"
                 tax_value_calculator = FillInTaxValueCalculator(
                     mode=CalculationMode.OVERWRITE,
                     exchange_rate_provider=exchange_rate_provider,
                     keep_existing_payments=calculate_settings.keep_existing_payments,
                     render_language=render_language,
+                    workers=tax_value_threads,
                 )
 
             if tax_value_calculator and calculator_name:
-                statement = tax_value_calculator.calculate(statement)
-                print(
-                    f"{calculator_name} finished. Modified fields: {len(tax_value_calculator.modified_fields) if tax_value_calculator.modified_fields else '0'}, Errors: {len(tax_value_calculator.errors)}"
-                )
-                dump_debug_model(
-                    current_phase.value + f"_after_{calculator_name.lower()}", statement
+                value_calculator = tax_value_calculator
+                value_calculator_name = calculator_name
+
+                def tax_value_done(model: TaxStatement) -> None:
+                    print(
+                        f"{value_calculator_name} finished. Modified fields: {len(value_calculator.modified_fields) if value_calculator.modified_fields else '0'}, Errors: {len(value_calculator.errors)}"
+                    )
+                    dump_debug_model(
+                        phase_name + f"_after_{value_calculator_name.lower()}", model
+                    )
+
+                pipeline.add(
+                    "tax_value", tax_value_calculator, after=[last_step], on_done=tax_value_done
                 )
+                last_step = "tax_value"
             elif tax_calculation_level != TaxCalculationLevel.NONE:
                 print(
                     f"Warning: Tax calculation level '{tax_calculation_level.value}' was specified but no corresponding calculator was run."
@@ -785,30 +888,48 @@ def process(
 
             # --- 3. Cap withholding to broker level (if enabled) ---
             if use_broker_withholding == UseBrokerWithholding.CAP:
-                print("Running WithholdingCapCalculator...")
                 cap_calculator = WithholdingCapCalculator()
-                statement = cap_calculator.calculate(statement)
-                if cap_calculator.capped_securities:
-                    for sec_name, dates in cap_calculator.capped_securities.items():
-                        print(
-                            f"  Capped withholding for {sec_name} on {', '.join(str(d) for d in dates)}"
-                        )
-                dump_debug_model(current_phase.value + "_after_withholding_cap", statement)
+
+                def withholding_cap_done(model: TaxStatement) -> None:
+                    if cap_calculator.capped_securities:
+                        for sec_name, dates in cap_calculator.capped_securities.items():
+                            print(
+                                f"  Capped withholding for {sec_name} on {', '.join(str(d) for d in dates)}"
+                            )
+                    dump_debug_model(phase_name + "_after_withholding_cap", model)
+
+                # Caps a security once its tax values and payments are set, so it
+                # can share the traversal of the tax value calculator.
+                if last_step == "tax_value":
+                    pipeline.add(
+                        "withholding_cap",
+                        cap_calculator,
+                        after_each_node=["tax_value"],
+                        on_done=withholding_cap_done,
+                    )
+                else:
+                    pipeline.add(
+                        "withholding_cap",
+                        cap_calculator,
+                        after=[last_step],
+                        on_done=withholding_cap_done,
+                    )
+                last_step = "withholding_cap"
 
             # --- 4. Run TotalCalculator (or other main calculators) ---
-            # Ensure statement is not None after cleanup, though cleanup should always return it
-            if not statement:
-                raise ValueError(
-                    "TaxStatement became None after cleanup phase. This should not happen."
+            total_calculator = TotalCalculator(mode=CalculationMode.OVERWRITE)
+
+            def total_done(model: TaxStatement) -> None:
+                print(
+                    f"TotalCalculator finished. Modified fields: {len(total_calculator.modified_fields) if total_calculator.modified_fields else '0'}"
                 )
-            calculator = TotalCalculator(mode=CalculationMode.OVERWRITE)
+                dump_debug_model(phase_name, model)
 
-            # Apply calculations
-            statement = calculator.calculate(statement)
-            print(
-                f"TotalCalculator finished. Modified fields: {len(calculator.modified_fields) if calculator.modified_fields else '0'}"
-            )
-            dump_debug_model(current_phase.value, statement)
+            pipeline.add("total", total_calculator, after=[last_step], on_done=total_done)
+
+            print(f"Running calculators: {pipeline.describe()}")
+            statement = pipeline.run(statement)
+            print(pipeline.format_timings())
 
         if Phase.VERIFY in run_phases:
             current_phase = Phase.VERIFY
@@ -823,13 +944,22 @@ def process(
                 f"Using KurslisteExchangeRateProvider with directory: {effective_kursliste_dir} for verification"
             )
             try:
-                if not effective_kursliste_dir.exists():
-                    print(
-                        f"Warning: Kursliste directory {effective_kursliste_dir} does not exist for verification."
+                if kursliste_session is None:
+                    if not effective_kursliste_dir.exists():
+                        print(
+                            f"Warning: Kursliste directory {effective_kursliste_dir} does not exist for verification."
+                        )
+                        effective_kursliste_dir.mkdir(parents=True, exist_ok=True)
+                    kursliste_session, owns_kursliste_session = _open_kursliste_session(
+                        ctx,
+                        effective_kursliste_dir,
+                        read_only=kursliste_immutable,
+                        mmap_size=kursliste_mmap_mb * 1024 * 1024,
+                        index_xml=kursliste_xml_index,
+                        accessor_cache_size=kursliste_cache_size,
                     )
-                    effective_kursliste_dir.mkdir(parents=True, exist_ok=True)
-                kursliste_manager_verify = KurslisteManager()
-                kursliste_manager_verify.load_directory(effective_kursliste_dir)
+                else:
+                    print("Reusing the Kursliste session of the calculate phase.")
 
                 # Verify that Kursliste data exists for the required tax year
                 if statement.taxPeriod:
@@ -840,13 +970,9 @@ def process(
                     raise typer.BadParameter(
                         "Verify phase requires either statement.taxPeriod to be set or a --period-to argument."
                     )
-                kursliste_manager_verify.ensure_year_available(
-                    required_tax_year_verify, effective_kursliste_dir
-                )
+                kursliste_session.ensure_year_available(required_tax_year_verify)
 
-                exchange_rate_provider_verify = KurslisteExchangeRateProvider(
-                    kursliste_manager_verify
-                )
+                exchange_rate_provider_verify = kursliste_session.exchange_rate_provider
             except Exception as e:
                 raise ValueError(
                     f"Failed to initialize KurslisteExchangeRateProvider for verification with directory {effective_kursliste_dir}: {e}"
@@ -869,6 +995,7 @@ def process(
                     exchange_rate_provider=exchange_rate_provider_verify,
                     keep_existing_payments=calculate_settings.keep_existing_payments,
                     render_language=render_language,
+                    workers=tax_value_threads,
                 )
             elif tax_calculation_level == TaxCalculationLevel.FILL_IN:
                 verifier_name = "FillInTaxValueCalculator"
@@ -877,6 +1004,7 @@ def process(
                     exchange_rate_provider=exchange_rate_provider_verify,
                     keep_existing_payments=calculate_settings.keep_existing_payments,
                     render_language=render_language,
+                    workers=tax_value_threads,
                 )
 
             if tax_value_verifier and verifier_name:
@@ -968,6 +1096,11 @@ def process(
 
             dump_debug_model(current_phase.value, statement)
 
+        if statement is not None:
+            # Validation, the barcodes and the XML output share one serialization.
+            # Every later change to the statement must invalidate it.
+            statement.enable_serialization_cache()
+
         if Phase.VALIDATE in run_phases:
             current_phase = Phase.VALIDATE
             print(f"Phase: {current_phase.value}")
@@ -988,6 +1121,7 @@ def process(
             # Fill in missing fields to make rendering possible
             calculator = TotalCalculator(mode=CalculationMode.FILL)
             statement = calculator.calculate(statement)
+            statement.invalidate_serialization_cache()
             print("Calculation successful.")
             dump_debug_model(current_phase.value, statement)
 
@@ -1068,6 +1202,9 @@ def process(
                 print(f"Failed to write final XML to {final_xml_path}: {e}")
                 raise typer.Exit(code=1)
 
+        if kursliste_session is not None:
+            print(kursliste_session.memory_footprint().format())
+
         print("Processing finished successfully.")
 
     except Exception as e:
@@ -1083,9 +1220,161 @@ def process(
             except Exception as dump_e:
                 print(f"Failed to dump debug model after error: {dump_e}")
         raise typer.Exit(code=1)
+    finally:
+        if kursliste_session is not None and owns_kursliste_session:
+            kursliste_session.close()
 
 
 app.command("verify")(process)
 
+
+@app.command("batch")
+def batch(
+    manifest: Path = typer.Argument(
+        ...,
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+        readable=True,
+        help="TOML manifest listing the jobs (see opensteuerauszug.batch for the format).",
+    ),
+    workers: int = typer.Option(
+        os.cpu_count() or 1,
+        "--workers",
+        "-j",
+        min=1,
+        help="Number of worker processes. Each keeps its Kursliste files open across its jobs. 1 runs the jobs in this process.",
+    ),
+    log_dir: Optional[Path] = typer.Option(
+        None,
+        "--log-dir",
+        help="Directory for the output of jobs without a 'log' entry. Defaults to the manifest's directory.",
+    ),
+    summary_json: Optional[Path] = typer.Option(
+        None, "--summary-json", help="Also write the per-job results to this JSON file."
+    ),
+    config_file: Optional[Path] = typer.Option(
+        None, "--config", "-c", help="Configuration TOML file used by all jobs."
+    ),
+    kursliste_dir: Optional[Path] = typer.Option(
+        None, "--kursliste-dir", help="Kursliste directory used by all jobs."
+    ),
+    kursliste_mmap_mb: int = typer.Option(
+        KurslisteDBReader.DEFAULT_MMAP_SIZE // (1024 * 1024),
+        "--kursliste-mmap-mb",
+        min=0,
+        help="MiB of each Kursliste SQLite database to memory-map with --kursliste-immutable.",
+    ),
+    kursliste_immutable: bool = typer.Option(
+        True,
+        "--kursliste-immutable/--no-kursliste-immutable",
+        help="Open the Kursliste SQLite databases immutable and memory-mapped, shared by the workers. The databases must not be written while the batch runs.",
+    ),
+    kursliste_xml_index: bool = typer.Option(
+        False,
+        "--kursliste-xml-index",
+        help="Read XML-only Kursliste years through a byte-offset index.",
+    ),
+    kursliste_cache_size: int = typer.Option(
+        KurslisteAccessor.DEFAULT_CACHE_SIZE,
+        "--kursliste-cache-size",
+        min=0,
+        help="Maximum number of cached Kursliste lookup results per lookup type and year.",
+    ),
+):
+    """Runs the process command for every job of a manifest and prints a summary."""
+    try:
+        jobs = load_manifest(manifest, log_dir=log_dir)
+    except ValueError as e:
+        print(f"Error: {e}")
+        raise typer.Exit(code=1)
+    valid_importers = {t.value for t in ImporterType} | {RAW_IMPORTER}
+    for job in jobs:
+        if job.importer is not None and job.importer not in valid_importers:
+            print(
+                f"Error: Job '{job.name}' uses unknown importer '{job.importer}'. "
+                f"Valid importers: {', '.join(sorted(valid_importers))}"
+            )
+            raise typer.Exit(code=1)
+
+    # Options shared by all jobs, placed before the job's own arguments
+    common_args = [
+        "--kursliste-mmap-mb",
+        str(kursliste_mmap_mb),
+        "--kursliste-cache-size",
+        str(kursliste_cache_size),
+    ]
+    common_args.append(
+        "--kursliste-immutable" if kursliste_immutable else "--no-kursliste-immutable"
+    )
+    if kursliste_xml_index:
+        common_args.append("--kursliste-xml-index")
+    if kursliste_dir is not None:
+        common_args += ["--kursliste-dir", str(kursliste_dir)]
+    if config_file is not None:
+        common_args += ["--config", str(config_file)]
+
+    workers = min(workers, len(jobs))
+    print(f"Running {len(jobs)} job(s) from {manifest} with {workers} worker(s)...")
+    start = time.perf_counter()
+    results = run_batch(jobs, common_args, workers=workers)
+    print(format_summary(results, time.perf_counter() - start))
+
+    if summary_json is not None:
+        summary_json.write_text(json.dumps(results_as_dicts(results), indent=2), encoding="utf-8")
+        print(f"Summary written to {summary_json}")
+    if any(not result.ok for result in results):
+        raise typer.Exit(code=1)
+
+
+@app.command("validate")
+def validate(
+    xml_paths: List[Path] = typer.Argument(
+        ...,
+        exists=True,
+        readable=True,
+        help="eCH-0196 XML files to validate. For a directory, all *.xml files in it.",
+    ),
+    xsd_path: Path = typer.Option(
+        DEFAULT_ECH0196_XSD,
+        "--xsd",
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+        readable=True,
+        help="Schema to validate against. Imported schemas are looked up in its directory.",
+    ),
+    workers: int = typer.Option(
+        os.cpu_count() or 1,
+        "--workers",
+        "-j",
+        min=1,
+        help="Number of worker processes. Each compiles the schema once. 1 validates in this process.",
+    ),
+):
+    """Validates eCH-0196 XML files (e.g. from --xml-output) against the XSD schema."""
+    files: List[Path] = []
+    for path in xml_paths:
+        files.extend(sorted(path.glob("*.xml")) if path.is_dir() else [path])
+    if not files:
+        print("Error: No XML files to validate.")
+        raise typer.Exit(code=1)
+
+    try:
+        results = validate_files(files, xsd_path, workers=workers)
+    except (OSError, ET.XMLSchemaParseError) as e:
+        print(f"Error: Cannot load schema {xsd_path}: {e}")
+        raise typer.Exit(code=1)
+
+    for result in results:
+        print(f"{'OK' if result.ok else 'INVALID'} {result.path}")
+        for error in result.errors:
+            print(f"  {error}")
+    invalid = sum(1 for result in results if not result.ok)
+    print(f"{len(results) - invalid} of {len(results)} file(s) valid.")
+    if invalid:
+        raise typer.Exit(code=1)
+
+
 if __name__ == "__main__":
     app()
@@ -1,11 +1,23 @@
-from datetime import date, timedelta
-from typing import List, Tuple
+import bisect
+from datetime import date
+from typing import Iterable, List, Tuple
+
+
+def _begin_ordinal(date_range: Tuple[date, date]) -> int:
+    return date_range[0].toordinal()
+
+
+def _end_ordinal(date_range: Tuple[date, date]) -> int:
+    return date_range[1].toordinal()
 
 
 class DateRangeCoverage:
     """
     Utility to track coverage of date ranges and check if a given range is fully covered.
     Date ranges are inclusive of both begin and end.
+
+    The covered ranges are kept sorted and disjoint, so both their begins and their
+    ends are ascending and every operation locates the affected ranges by bisection.
     """
 
     def __init__(self):
@@ -19,22 +31,37 @@ class DateRangeCoverage:
         """
         if begin > end:
             raise ValueError("Begin date must not be after end date.")
-        new_ranges = []
-        placed = False
-        for b, e in self.covered:
-            if e < begin - timedelta(days=1):
-                new_ranges.append((b, e))
-            elif end < b - timedelta(days=1):
-                if not placed:
-                    new_ranges.append((begin, end))
-                    placed = True
-                new_ranges.append((b, e))
+        # Ranges from lo up to (excluding) hi overlap [begin, end] or are adjacent to it.
+        # Ordinals avoid overflowing at date.min / date.max.
+        lo = bisect.bisect_left(self.covered, begin.toordinal() - 1, key=_end_ordinal)
+        hi = bisect.bisect_right(self.covered, end.toordinal() + 1, key=_begin_ordinal)
+        if lo < hi:
+            begin = min(begin, self.covered[lo][0])
+            end = max(end, self.covered[hi - 1][1])
+        self.covered[lo:hi] = [(begin, end)]
+
+    def mark_covered_many(self, ranges: Iterable[Tuple[date, date]]) -> None:
+        """
+        Mark several date ranges (begin, end) as covered at once.
+
+        Equivalent to calling mark_covered for each range, but sorts and merges all
+        of them with the existing coverage in a single pass. No range is marked if
+        any of them is invalid.
+        """
+        new_ranges = list(ranges)
+        for begin, end in new_ranges:
+            if begin > end:
+                raise ValueError("Begin date must not be after end date.")
+        if not new_ranges:
+            return
+        merged: List[Tuple[date, date]] = []
+        for begin, end in sorted(self.covered + new_ranges):
+            if merged and begin.toordinal() <= merged[-1][1].toordinal() + 1:
+                if end > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], end)
             else:
-                begin = min(begin, b)
-                end = max(end, e)
-        if not placed:
-            new_ranges.append((begin, end))
-        self.covered = new_ranges
+                merged.append((begin, end))
+        self.covered = merged
 
     def is_covered(self, begin: date, end: date) -> bool:
         """
@@ -42,21 +69,16 @@ class DateRangeCoverage:
         """
         if begin > end:
             raise ValueError("Begin date must not be after end date.")
-        for b, e in self.covered:
-            if b <= begin and end <= e:
-                return True
-            if e < begin:
-                continue
-            if b > end:
-                break
-        return False
+        covering = self.maximal_covered_range_containing(begin)
+        return covering is not None and end <= covering[1]
 
     def maximal_covered_range_containing(self, d: date) -> tuple[date, date] | None:
         """
         Returns the maximal continuously covered range (begin, end) that contains the given date,
         or None if the date is not in any covered range.
         """
-        for b, e in self.covered:
-            if b <= d <= e:
-                return (b, e)
+        # The last range beginning at or before d is the only one that can contain it
+        i = bisect.bisect_right(self.covered, d.toordinal(), key=_begin_ordinal) - 1
+        if i >= 0 and d <= self.covered[i][1]:
+            return self.covered[i]
         return None
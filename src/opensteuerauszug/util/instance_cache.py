@@ -0,0 +1,168 @@
+"""
+Per-instance LRU caches for methods.
+
+``functools.lru_cache`` on a method keeps one cache on the class, with ``self`` as
+part of every key: the cache cannot be sized per object, keeps every instance it
+has seen alive and mixes the statistics of all instances. ``instance_lru_cache``
+gives each instance its own bounded cache instead. The bound method keeps the
+``cache_info()`` / ``cache_clear()`` interface of ``lru_cache`` and additionally
+counts evictions.
+"""
+
+import threading
+from collections import OrderedDict
+from functools import update_wrapper
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional, Tuple, cast
+
+
+class CacheInfo(NamedTuple):
+    """Cache statistics, field compatible with the ``functools.lru_cache`` CacheInfo."""
+
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+    evictions: int = 0
+
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    A mapping of at most maxsize entries that evicts the least recently used one.
+
+    maxsize None means unbounded. All operations are guarded by a lock so the cache
+    can be shared between threads.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None):
+        if maxsize is not None and maxsize < 0:
+            raise ValueError(f"maxsize must not be negative, got {maxsize}")
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the cached value (marking it most recently used) or default."""
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Stores a value, evicting the least recently used entries beyond maxsize."""
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+
+    def clear(self) -> None:
+        """Drops all entries and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                self.hits, self.misses, self.maxsize, len(self._entries), self.evictions
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Separates positional from keyword arguments in cache keys, like lru_cache does
+_KWARGS_MARK = object()
+
+
+def _make_key(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Hashable:
+    if not kwargs:
+        return args
+    return args + (_KWARGS_MARK,) + tuple(kwargs.items())
+
+
+class _BoundCachedMethod:
+    """A method bound to one instance, with that instance's cache."""
+
+    def __init__(self, method: Callable[..., Any], instance: Any, cache: LRUCache):
+        self._method = method
+        self._instance = instance
+        self.cache = cache
+        update_wrapper(self, method)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        key = _make_key(args, kwargs)
+        value = self.cache.get(key, _MISSING)
+        if value is _MISSING:
+            value = self._method(self._instance, *args, **kwargs)
+            self.cache.put(key, value)
+        return value
+
+    def cache_info(self) -> CacheInfo:
+        return self.cache.info()
+
+    def cache_clear(self) -> None:
+        self.cache.clear()
+
+
+class instance_lru_cache:
+    """
+    Method decorator caching results per instance in an LRUCache.
+
+    The size of each instance's caches is read from the attribute named by
+    size_attribute when a method is first used on that instance (None or a
+    missing attribute means unbounded). Like lru_cache, arguments must be
+    hashable and exceptions are not cached.
+
+    Usage::
+
+        class Accessor:
+            cache_size = 1024
+
+            @instance_lru_cache
+            def lookup(self, key): ...
+    """
+
+    def __init__(self, method: Callable[..., Any], size_attribute: str = "cache_size"):
+        self._method = method
+        self._name = method.__name__
+        self._size_attribute = size_attribute
+        # The descriptor itself is not callable; it only carries the method's metadata
+        update_wrapper(cast(Any, self), method)
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._name = name
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if instance is None:
+            return self
+        # Stored in the instance dict, which takes precedence over this (non-data)
+        # descriptor, so later attribute lookups do not come back here.
+        bound = _BoundCachedMethod(
+            self._method, instance, LRUCache(getattr(instance, self._size_attribute, None))
+        )
+        instance.__dict__[self._name] = bound
+        return bound
+
+
+def cached_methods(instance: Any) -> Dict[str, _BoundCachedMethod]:
+    """The instance_lru_cache methods of an instance that have been used, by name."""
+    return {
+        name: value
+        for name, value in vars(instance).items()
+        if isinstance(value, _BoundCachedMethod)
+    }
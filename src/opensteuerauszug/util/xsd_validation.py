@@ -0,0 +1,136 @@
+"""
+Validating eCH-0196 XML against the XSD schema.
+
+Compiling ``eCH-0196-2-2.xsd`` together with the eCH-0007/0008/0010/0097
+schemas it imports takes longer than validating a whole statement, so every
+process compiles a schema only once and keeps it. Validation works on lxml
+trees: a statement built in memory does not need to be serialized and parsed
+again, and ``validate_files`` checks the XML files written by earlier runs
+across a pool of worker processes.
+"""
+
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Sequence, Union
+
+import lxml.etree as ET
+
+ECH0196_XSD_NAME = "eCH-0196-2-2.xsd"
+DEFAULT_SPECS_DIR = Path("specs")
+DEFAULT_ECH0196_XSD = DEFAULT_SPECS_DIR / ECH0196_XSD_NAME
+
+_schemas: Dict[Path, ET.XMLSchema] = {}
+_schemas_lock = threading.Lock()
+
+
+class _LocalXsdResolver(ET.Resolver):
+    """Resolves schema imports to the files next to the main schema, never the network."""
+
+    def __init__(self, specs_directory: Path) -> None:
+        super().__init__()
+        self._specs_dir = specs_directory
+
+    def resolve(self, url, pubid, context):
+        if not url:
+            return None
+        basename = url.rsplit("/", 1)[-1]
+        candidate = self._specs_dir / basename
+        if candidate.exists():
+            return self.resolve_filename(str(candidate), context)
+        return None
+
+
+def load_schema(xsd_path: Union[str, Path] = DEFAULT_ECH0196_XSD) -> ET.XMLSchema:
+    """
+    The compiled schema at ``xsd_path``, built on the first call in this process.
+
+    Imported schemas are looked up in the directory of ``xsd_path``.
+
+    Raises:
+        OSError: If the schema file cannot be read.
+        lxml.etree.XMLSchemaParseError: If the schema is invalid.
+    """
+    key = Path(xsd_path).resolve()
+    with _schemas_lock:
+        schema = _schemas.get(key)
+        if schema is None:
+            parser = ET.XMLParser()
+            parser.resolvers.add(_LocalXsdResolver(key.parent))
+            schema = ET.XMLSchema(ET.parse(str(key), parser=parser))
+            _schemas[key] = schema
+    return schema
+
+
+def schema_errors(
+    document: Union[ET._Element, ET._ElementTree],
+    xsd_path: Union[str, Path] = DEFAULT_ECH0196_XSD,
+) -> List[str]:
+    """
+    The schema violations of an lxml element or tree, empty if it is valid.
+
+    Elements built in memory have no line numbers; their violations name the
+    element path (e.g. ``/*/*[3]/*[2]``) instead.
+    """
+    schema = load_schema(xsd_path)
+    if schema.validate(document):
+        return []
+    return [
+        str(error) if error.line else f"{error.path}: {error.message}" for error in schema.error_log
+    ]
+
+
+@dataclass
+class FileValidationResult:
+    """Outcome of validating one XML file."""
+
+    path: Path
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def validate_file(
+    path: Union[str, Path], xsd_path: Union[str, Path] = DEFAULT_ECH0196_XSD
+) -> FileValidationResult:
+    """Validates an XML file; a file that cannot be parsed is reported as invalid."""
+    path = Path(path)
+    try:
+        parser = ET.XMLParser(resolve_entities=False, no_network=True, huge_tree=True)
+        document = ET.parse(str(path), parser)
+    except (OSError, ET.XMLSyntaxError) as e:
+        return FileValidationResult(path, [f"Cannot parse XML: {e}"])
+    return FileValidationResult(path, schema_errors(document, xsd_path))
+
+
+def validate_files(
+    paths: Sequence[Union[str, Path]],
+    xsd_path: Union[str, Path] = DEFAULT_ECH0196_XSD,
+    workers: int = 1,
+) -> List[FileValidationResult]:
+    """
+    Validates XML files, in ``workers`` processes if more than one.
+
+    Every worker compiles the schema once and validates its share of the files.
+
+    Returns:
+        One result per file, in the order of ``paths``.
+
+    Raises:
+        OSError, lxml.etree.XMLSchemaParseError: If the schema cannot be loaded.
+    """
+    paths = [Path(path) for path in paths]
+    xsd_path = Path(xsd_path).resolve()
+    # Fail early (and once) on a broken schema instead of in every worker
+    load_schema(xsd_path)
+    workers = min(workers, len(paths))
+    if workers <= 1:
+        return [validate_file(path, xsd_path) for path in paths]
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(validate_file, paths, [xsd_path] * len(paths), chunksize=chunksize)
+        )
@@ -0,0 +1,75 @@
+from pathlib import Path
+from typing import Any, List, Tuple
+
+from opensteuerauszug.calculate.base import BaseCalculator, CalculationMode, LazyPath
+from opensteuerauszug.model.ech0196 import BaseXmlModel, Security, TaxStatement
+
+SAMPLE_STATEMENT = Path(__file__).resolve().parent.parent / "samples" / "fake_statement.xml"
+
+
+class RecordingCalculator(BaseCalculator):
+    """Has a handler for every model class, recording the visits."""
+
+    def __init__(self):
+        super().__init__(CalculationMode.VERIFY)
+        self.visits: List[Tuple[str, Any]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_handle_"):
+            class_name = name[len("_handle_") :]
+            return lambda model, path: self.visits.append((class_name, path))
+        raise AttributeError(name)
+
+
+def visits_of_dict_traversal(model: BaseXmlModel, path_prefix: str) -> List[Tuple[str, str]]:
+    """The traversal of _process_model before it was compiled per class."""
+    visits = [(type(model).__name__, path_prefix)]
+    for field_name, field_value in model.__dict__.items():
+        if field_name.startswith('_') or field_name == 'unknown_attrs':
+            continue
+        field_path = f"{path_prefix}.{field_name}" if path_prefix else field_name
+        if isinstance(field_value, list):
+            for i, item in enumerate(field_value):
+                if isinstance(item, BaseXmlModel):
+                    readable_index = f"{i}"
+                    if isinstance(item, Security):
+                        readable_index = item.isin or item.valorNumber or f"{i}"
+                    visits.extend(visits_of_dict_traversal(item, f"{field_path}[{readable_index}]"))
+        elif isinstance(field_value, BaseXmlModel):
+            visits.extend(visits_of_dict_traversal(field_value, field_path))
+    return visits
+
+
+def test_traversal_matches_dict_traversal():
+    statement = TaxStatement.from_xml_file(str(SAMPLE_STATEMENT))
+    calculator = RecordingCalculator()
+
+    calculator.calculate(statement)
+
+    expected = visits_of_dict_traversal(statement, "")
+    assert [(name, str(path)) for name, path in calculator.visits] == expected
+    assert {"TaxStatement", "Security", "SecurityStock", "BankAccountPayment"} <= {
+        name for name, _ in expected
+    }
+
+
+def test_lazy_path_behaves_like_str():
+    root = LazyPath("", "listOfSecurities")
+    security = LazyPath(LazyPath(root, "depot", 0), "security", "CH0012345678")
+
+    assert str(security) == "listOfSecurities.depot[0].security[CH0012345678]"
+    assert f"{security}.taxValue" == "listOfSecurities.depot[0].security[CH0012345678].taxValue"
+    assert security == "listOfSecurities.depot[0].security[CH0012345678]"
+    assert {security: 1}["listOfSecurities.depot[0].security[CH0012345678]"] == 1
+    assert security.startswith("listOfSecurities.depot")
+    assert security + ".stock" == "listOfSecurities.depot[0].security[CH0012345678].stock"
+    assert bool(security)
+
+
+def test_paths_are_formatted_only_when_used():
+    statement = TaxStatement.from_xml_file(str(SAMPLE_STATEMENT))
+    calculator = RecordingCalculator()
+
+    calculator.calculate(statement)
+
+    assert all(path._text is None for _, path in calculator.visits if isinstance(path, LazyPath))
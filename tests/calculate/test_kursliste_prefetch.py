@@ -0,0 +1,132 @@
+"""Tests for the Kursliste prefetch step of the calculate phase."""
+
+import datetime as dt
+from datetime import date
+from decimal import Decimal
+
+from opensteuerauszug.calculate.kursliste_prefetch import KurslistePrefetchCalculator
+from opensteuerauszug.core.kursliste_accessor import KurslisteAccessor
+from opensteuerauszug.core.kursliste_manager import KurslisteManager
+from opensteuerauszug.model.ech0196 import (
+    Depot,
+    DepotNumber,
+    ISINType,
+    ListOfSecurities,
+    Security,
+    SecurityStock,
+    SecurityTaxValue,
+    TaxStatement,
+    ValorNumber,
+)
+from opensteuerauszug.model.kursliste import ExchangeRateYearEnd, Kursliste, Share
+
+
+def _make_security(position_id, isin, valor=None):
+    return Security(
+        positionId=position_id,
+        isin=ISINType(isin),
+        valorNumber=valor,
+        securityName=f"Security {isin}",
+        securityCategory="SHARE",
+        country="US",
+        currency="USD",
+        quotationType="PIECE",
+        stock=[
+            SecurityStock(
+                referenceDate=date(2024, 1, 1),
+                mutation=False,
+                quantity=Decimal("10"),
+                balanceCurrency="USD",
+                quotationType="PIECE",
+            ),
+        ],
+        taxValue=SecurityTaxValue(
+            referenceDate=date(2024, 12, 31),
+            quotationType="PIECE",
+            quantity=Decimal("10"),
+            balanceCurrency="USD",
+        ),
+    )
+
+
+def _make_manager():
+    share = Share(
+        id=1,
+        institutionId=1,
+        institutionName="Test Institution",
+        valorNumber=12345,
+        isin="US0000000001",
+        securityName="Known Corp",
+        country="US",
+        currency="USD",
+        securityGroup="SHARE",
+    )
+    kursliste = Kursliste(
+        version="2.2.0.0",
+        creationDate=dt.datetime(2024, 12, 31),
+        year=2024,
+        shares=[share],
+        exchangeRatesYearEnd=[
+            ExchangeRateYearEnd(currency="USD", year=2024, value=Decimal("0.85")),
+        ],
+    )
+    manager = KurslisteManager()
+    manager.kurslisten[2024] = KurslisteAccessor(data_source=[kursliste], tax_year=2024)
+    return manager
+
+
+def test_prefetch_warms_security_and_rate_caches():
+    manager = _make_manager()
+    statement = TaxStatement(
+        minorVersion=2,
+        taxPeriod=2024,
+        periodFrom=date(2024, 1, 1),
+        periodTo=date(2024, 12, 31),
+        listOfSecurities=ListOfSecurities(
+            depot=[
+                Depot(
+                    depotNumber=DepotNumber("D1"),
+                    security=[
+                        _make_security(1, "US0000000001", valor=ValorNumber(12345)),
+                        _make_security(2, "US0000000002"),
+                    ],
+                )
+            ]
+        ),
+    )
+
+    prefetch = KurslistePrefetchCalculator(manager)
+    result = prefetch.calculate(statement)
+
+    assert result is statement
+    assert prefetch.loaded_securities == 1
+    # Only the year-end rate exists: 2024-12-31 resolves, 2024-01-01 does not.
+    assert prefetch.loaded_exchange_rates == 1
+    assert prefetch.elapsed_seconds >= 0
+
+    accessor = manager.get_kurslisten_for_year(2024)
+    assert accessor is not None
+    assert [s.isin for s in accessor._securities_by_valor[12345]] == ["US0000000001"]
+    # The ISIN of a security found by valor is not looked up again
+    assert "US0000000001" not in accessor._securities_by_isin
+    assert accessor._securities_by_isin["US0000000002"] == []
+    assert prefetch.modified_fields == set()
+
+
+def test_prefetch_skips_years_without_kursliste():
+    manager = KurslisteManager()
+    statement = TaxStatement(
+        minorVersion=2,
+        listOfSecurities=ListOfSecurities(
+            depot=[
+                Depot(
+                    depotNumber=DepotNumber("D1"),
+                    security=[_make_security(1, "US0000000001")],
+                )
+            ]
+        ),
+    )
+    prefetch = KurslistePrefetchCalculator(manager)
+    prefetch.calculate(statement)
+    assert prefetch.loaded_securities == 0
+    assert prefetch.loaded_exchange_rates == 0
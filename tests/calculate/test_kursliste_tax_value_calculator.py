@@ -2570,3 +2570,104 @@ def test_kursliste_calculator_fails_on_bond_security(kursliste_manager):
 
     assert "Bonds are not supported" in str(excinfo.value)
     assert "#262" in str(excinfo.value)
+
+
+def _portfolio_statement() -> TaxStatement:
+    """Two depots holding every Kursliste test security plus one that is not listed."""
+    isins = [
+        "CH0012032048",
+        "CH0016999861",
+        "IE00B3B8PX14",
+        "IE00B4WPHX27",
+        "LU0049785289",
+        "US4642882819",
+        "US78468R6229",
+        "US9219377937",
+        "US9220426764",
+        "US9229087690",
+        "US0000000001",  # Not in the Kursliste
+    ]
+    securities = []
+    for position_id, isin in enumerate(isins, start=1):
+        currency = "CHF" if isin.startswith("CH") else "USD"
+        securities.append(
+            Security(
+                country=isin[:2],
+                securityName=f"Security {isin}",
+                positionId=position_id,
+                currency=currency,
+                quotationType="PIECE",
+                securityCategory="SHARE",
+                isin=ISINType(isin),
+                taxValue=SecurityTaxValue(
+                    referenceDate=date(2024, 12, 31),
+                    quotationType="PIECE",
+                    quantity=Decimal("120"),
+                    balanceCurrency=currency,
+                ),
+                stock=[
+                    SecurityStock(
+                        referenceDate=date(2024, 1, 1),
+                        mutation=False,
+                        quotationType="PIECE",
+                        quantity=Decimal("100"),
+                        balanceCurrency=currency,
+                    ),
+                    SecurityStock(
+                        referenceDate=date(2024, 6, 3),
+                        mutation=True,
+                        quotationType="PIECE",
+                        quantity=Decimal("20"),
+                        balanceCurrency=currency,
+                    ),
+                ],
+            )
+        )
+    return TaxStatement(
+        minorVersion=2,
+        taxPeriod=2024,
+        periodFrom=date(2024, 1, 1),
+        periodTo=date(2024, 12, 31),
+        listOfSecurities=ListOfSecurities(
+            depot=[
+                Depot(depotNumber=DepotNumber("D1"), security=securities[:6]),
+                Depot(depotNumber=DepotNumber("D2"), security=securities[6:]),
+            ]
+        ),
+    )
+
+
+def test_parallel_calculation_matches_sequential(kursliste_manager):
+    provider = KurslisteExchangeRateProvider(kursliste_manager)
+    results = {}
+    for workers in (1, 4):
+        calc = KurslisteTaxValueCalculator(
+            mode=CalculationMode.OVERWRITE, exchange_rate_provider=provider, workers=workers
+        )
+        statement = calc.calculate(_portfolio_statement())
+        results[workers] = (
+            statement.to_xml_bytes(),
+            statement.critical_warnings,
+            [str(e) for e in calc.errors],
+            calc.modified_fields,
+        )
+
+    xml, critical_warnings, errors, modified_fields = results[1]
+    assert any(w.identifier == "US0000000001" for w in critical_warnings)
+    assert b"<payment " in xml
+    assert results[4] == results[1]
+
+
+def test_parallel_calculation_reports_first_failure_in_statement_order(kursliste_manager):
+    statement = _portfolio_statement()
+    depot = statement.listOfSecurities.depot[1]
+    depot.security[1].securityCategory = "BOND"
+    depot.security[3].securityCategory = "BOND"
+    calc = KurslisteTaxValueCalculator(
+        mode=CalculationMode.OVERWRITE,
+        exchange_rate_provider=KurslisteExchangeRateProvider(kursliste_manager),
+        workers=4,
+    )
+
+    with pytest.raises(ValueError, match=depot.security[1].isin):
+        calc.calculate(statement)
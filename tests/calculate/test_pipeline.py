@@ -0,0 +1,153 @@
+from pathlib import Path
+from typing import Any, List, Tuple
+
+import pytest
+
+from opensteuerauszug.calculate.base import BaseCalculator, CalculationMode
+from opensteuerauszug.calculate.minimal_tax_value import MinimalTaxValueCalculator
+from opensteuerauszug.calculate.payment_reconciliation_calculator import (
+    PaymentReconciliationCalculator,
+)
+from opensteuerauszug.calculate.pipeline import CalculatorPipeline
+from opensteuerauszug.calculate.total import TotalCalculator
+from opensteuerauszug.calculate.withholding_cap_calculator import WithholdingCapCalculator
+from opensteuerauszug.core.exchange_rate_provider import DummyExchangeRateProvider
+from opensteuerauszug.model.ech0196 import Security, TaxStatement
+
+SAMPLE_STATEMENT = Path(__file__).resolve().parent.parent / "samples" / "fake_statement.xml"
+
+
+class RecordingCalculator(BaseCalculator):
+    """Records its Security hooks in a log shared with other calculators."""
+
+    def __init__(self, name: str, log: List[Tuple[str, str, Any]]):
+        super().__init__(CalculationMode.VERIFY)
+        self.name = name
+        self.log = log
+
+    def _handle_Security(self, security: Security, path_prefix: str) -> None:
+        self.log.append((self.name, "handle", security.isin))
+
+    def _leave_Security(self, security: Security, path_prefix: str) -> None:
+        self.log.append((self.name, "leave", security.isin))
+
+
+class NotAVisitor:
+    def __init__(self, log: List[Tuple[str, str, Any]]):
+        self.log = log
+
+    def calculate(self, tax_statement: TaxStatement) -> TaxStatement:
+        self.log.append(("standalone", "calculate", None))
+        return tax_statement
+
+
+def _add_calculators(pipeline: CalculatorPipeline) -> CalculatorPipeline:
+    pipeline.add(
+        "tax_value",
+        MinimalTaxValueCalculator(CalculationMode.OVERWRITE, DummyExchangeRateProvider()),
+    )
+    pipeline.add("withholding_cap", WithholdingCapCalculator(), after_each_node=["tax_value"])
+    pipeline.add(
+        "payment_reconciliation",
+        PaymentReconciliationCalculator(),
+        after_each_node=["withholding_cap"],
+    )
+    pipeline.add(
+        "total", TotalCalculator(CalculationMode.OVERWRITE), after=["payment_reconciliation"]
+    )
+    return pipeline
+
+
+def test_fused_run_matches_separate_runs():
+    fused = _add_calculators(CalculatorPipeline())
+    separate = _add_calculators(CalculatorPipeline(fuse=False))
+
+    fused_statement = fused.run(TaxStatement.from_xml_file(str(SAMPLE_STATEMENT)))
+    separate_statement = separate.run(TaxStatement.from_xml_file(str(SAMPLE_STATEMENT)))
+
+    assert fused.describe() == "tax_value + withholding_cap + payment_reconciliation; total"
+    assert len({t.traversal for t in separate.timings}) == 4
+    assert fused_statement.to_xml_bytes() == separate_statement.to_xml_bytes()
+    assert (
+        fused_statement.payment_reconciliation_report
+        == separate_statement.payment_reconciliation_report
+    )
+    for name in ("tax_value", "total"):
+        assert fused.steps[name].calculator.modified_fields
+        assert (
+            fused.steps[name].calculator.modified_fields
+            == separate.steps[name].calculator.modified_fields
+        )
+
+
+def test_fused_hooks_run_in_step_order_at_each_node():
+    log: List[Tuple[str, str, Any]] = []
+    pipeline = CalculatorPipeline()
+    pipeline.add("second", RecordingCalculator("second", log), after_each_node=["first"])
+    pipeline.add("first", RecordingCalculator("first", log))
+
+    pipeline.run(TaxStatement.from_xml_file(str(SAMPLE_STATEMENT)))
+
+    isins = [isin for name, hook, isin in log if name == "first" and hook == "handle"]
+    assert isins
+    expected = []
+    for isin in isins:
+        expected += [("first", "handle", isin), ("second", "handle", isin)]
+        expected += [("first", "leave", isin), ("second", "leave", isin)]
+    assert log == expected
+    assert pipeline.describe() == "first + second"
+
+
+def test_after_and_non_visitors_start_a_new_traversal():
+    log: List[Tuple[str, str, Any]] = []
+    pipeline = CalculatorPipeline()
+    pipeline.add("a", RecordingCalculator("a", log))
+    pipeline.add("b", RecordingCalculator("b", log), after=["a"])
+    pipeline.add("c", RecordingCalculator("c", log), after_each_node=["b"])
+    pipeline.add("standalone", NotAVisitor(log), after=["c"])
+    pipeline.add("d", RecordingCalculator("d", log), after_each_node=["standalone"])
+    pipeline.add("e", RecordingCalculator("e", log), after_each_node=["d"], fuse=False)
+
+    assert pipeline.describe() == "a; b + c; standalone; d; e"
+
+    pipeline.run(TaxStatement.from_xml_file(str(SAMPLE_STATEMENT)))
+
+    assert [t.name for t in pipeline.timings] == ["a", "b", "c", "standalone", "d", "e"]
+    assert [t.traversal for t in pipeline.timings] == [1, 2, 2, 3, 4, 5]
+    assert pipeline.timings[1].fused_with == ["c"]
+    assert all(t.seconds >= 0 for t in pipeline.timings)
+    timings = pipeline.format_timings()
+    assert timings.startswith("Calculator timings (5 traversal(s)):")
+    assert "(fused with b)" in timings
+    # Every "a" hook comes before every "b" hook; "standalone" runs between traversals
+    names = [name for name, _, _ in log]
+    assert names.index("standalone") == len(names) - names[::-1].index("c")
+    assert max(i for i, n in enumerate(names) if n == "a") < names.index("b")
+
+
+def test_on_done_is_called_after_each_step():
+    done: List[str] = []
+    pipeline = CalculatorPipeline()
+    pipeline.add("a", RecordingCalculator("a", []), on_done=lambda s: done.append("a"))
+    pipeline.add(
+        "b", RecordingCalculator("b", []), after_each_node=["a"], on_done=lambda s: done.append("b")
+    )
+
+    pipeline.run(TaxStatement.from_xml_file(str(SAMPLE_STATEMENT)))
+
+    assert done == ["a", "b"]
+
+
+def test_invalid_dependencies_are_rejected():
+    pipeline = CalculatorPipeline()
+    pipeline.add("standalone", NotAVisitor([]))
+    with pytest.raises(ValueError, match="Duplicate"):
+        pipeline.add("standalone", NotAVisitor([]))
+
+    pipeline.add("total", TotalCalculator(), after=["withholding_cap"])
+    with pytest.raises(ValueError, match="unknown step 'withholding_cap'"):
+        pipeline.plan()
+
+    pipeline.add("withholding_cap", WithholdingCapCalculator(), after=["total"])
+    with pytest.raises(ValueError, match="cyclic"):
+        pipeline.plan()
@@ -0,0 +1,29 @@
+from datetime import date
+from decimal import Decimal
+
+from opensteuerauszug.core.exchange_rate_provider import DummyExchangeRateProvider
+
+
+def test_default_get_exchange_rates_falls_back_to_single_lookups():
+    provider = DummyExchangeRateProvider()
+
+    rates = provider.get_exchange_rates(
+        [("CHF", date(2024, 1, 1)), ("USD", date(2024, 1, 1)), ("USD", date(2024, 1, 1))]
+    )
+
+    assert rates == {
+        ("CHF", date(2024, 1, 1)): Decimal("1"),
+        ("USD", date(2024, 1, 1)): Decimal("0.5"),
+    }
+
+
+def test_default_convert_many():
+    provider = DummyExchangeRateProvider()
+
+    converted = provider.convert_many(
+        [Decimal("10"), Decimal("10"), None],
+        ["CHF", "USD", "USD"],
+        [date(2024, 1, 1), date(2024, 2, 1), date(2024, 3, 1)],
+    )
+
+    assert converted == [Decimal("10"), Decimal("5.0"), None]
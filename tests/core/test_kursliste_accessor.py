@@ -324,6 +324,23 @@ def test_caching_security_lookup_db(db_accessor):
     assert info3.currsize == 2
 
 
+def test_caches_are_per_accessor_and_bounded(db_accessor):
+    other = KurslisteAccessor(db_accessor.data_source, TAX_YEAR, cache_size=1)
+
+    other.get_security_by_isin("CH00000000S1")
+    other.get_security_by_isin("CH00000000B1")
+    info = other.get_security_by_isin.cache_info()
+    assert (info.misses, info.currsize, info.maxsize, info.evictions) == (2, 1, 1, 1)
+    assert db_accessor.get_security_by_isin.cache_info().maxsize == (
+        KurslisteAccessor.DEFAULT_CACHE_SIZE
+    )
+    assert other.cached_result_count() == 1
+
+    other.clear_caches()
+    assert other.cached_result_count() == 0
+    assert other.cache_stats()["get_security_by_isin"].misses == 0
+
+
 # --- XML Accessor Tests ---
 @pytest.fixture
 def xml_accessor(xml_kursliste_list_fixture):
@@ -408,3 +425,33 @@ def xml_accessor_wrong_year(xml_kursliste_list_fixture):
 def test_security_lookup_xml_wrong_tax_year_context(xml_accessor_wrong_year):
     assert xml_accessor_wrong_year.get_security_by_valor(900100) is None
     assert len(xml_accessor_wrong_year.get_securities_by_isin("GB0123456789")) == 0
+
+
+def test_batch_security_lookup_db_fills_cache(db_accessor, monkeypatch):
+    result = db_accessor.get_securities_by_isins(["CH00000000S1", "XX00000000XX"])
+    assert [s.id for s in result["CH00000000S1"]] == [1]
+    assert result["XX00000000XX"] == []
+
+    by_valor = db_accessor.get_securities_by_valors([7654321])
+    assert isinstance(by_valor[7654321][0], Bond)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("should be served from the prefetched results")
+
+    monkeypatch.setattr(db_accessor.data_source, "find_security_by_isin", fail)
+    monkeypatch.setattr(db_accessor.data_source, "find_security_by_valor", fail)
+    sec = db_accessor.get_security_by_isin("CH00000000S1")
+    assert sec is not None and sec.id == 1
+    assert db_accessor.get_security_by_isin("XX00000000XX") is None
+    bond = db_accessor.get_security_by_valor(7654321)
+    assert bond is not None and bond.id == 2
+
+
+def test_batch_security_lookup_xml(xml_accessor):
+    result = xml_accessor.get_securities_by_isins(["GB0123456789", "YYNONEXISTISIN"])
+    assert len(result["GB0123456789"]) == 2
+    assert result["YYNONEXISTISIN"] == []
+
+    by_valor = xml_accessor.get_securities_by_valors([900300, 900100])
+    assert len(by_valor[900300]) == 2
+    assert by_valor[900100][0].securityName == "Share XML AG"
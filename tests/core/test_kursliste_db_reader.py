@@ -1,3 +1,5 @@
+import sqlite3
+
 import pytest
 from decimal import Decimal
 from datetime import date
@@ -166,3 +168,283 @@ def test_get_exchange_rate(db_path):
         assert reader.get_exchange_rate("JPY", date(TAX_YEAR, 1, 1)) == Decimal("0.0065")
         assert reader.get_exchange_rate("AUD", date(TAX_YEAR, 10, 25)) is None
         assert reader.get_exchange_rate("USD", date(TAX_YEAR, 1, 1)) == Decimal("0.8800")
+
+
+def test_get_exchange_rate_loads_each_currency_year_once(db_path):
+    with KurslisteDBReader(str(db_path)) as reader:
+        assert reader.conn is not None
+        queries = []
+        reader.conn.set_trace_callback(queries.append)
+
+        # Daily rate, monthly fallback, year-end fallback and December 31st
+        assert reader.get_exchange_rate("USD", date(TAX_YEAR, 10, 25)) == Decimal("0.8900")
+        assert reader.get_exchange_rate("USD", date(TAX_YEAR, 12, 15)) == Decimal("0.8700")
+        assert reader.get_exchange_rate("USD", date(TAX_YEAR, 10, 24)) == Decimal("0.8800")
+        assert reader.get_exchange_rate("USD", date(TAX_YEAR, 12, 31)) == Decimal("0.8800")
+        assert len(queries) == 3
+
+        # Another year is a separate series
+        assert reader.get_exchange_rate("USD", date(TAX_YEAR + 1, 1, 1)) is None
+        assert len(queries) == 6
+        assert reader.get_exchange_rate("USD", date(TAX_YEAR + 1, 12, 31)) is None
+        assert len(queries) == 6
+
+
+def test_get_exchange_rate_last_inserted_row_wins(db_path):
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "INSERT INTO exchange_rates_daily (currency_code, date, rate, denomination, tax_year)"
+            " VALUES ('USD', ?, '90', 100, ?)",
+            (date(TAX_YEAR, 10, 25).isoformat(), TAX_YEAR),
+        )
+        conn.execute(
+            "INSERT INTO exchange_rates_daily (currency_code, date, rate, denomination, tax_year)"
+            " VALUES ('EUR', ?, NULL, 1, ?)",
+            (date(TAX_YEAR, 10, 25).isoformat(), TAX_YEAR),
+        )
+
+    with KurslisteDBReader(str(db_path)) as reader:
+        assert reader.get_exchange_rate("USD", date(TAX_YEAR, 10, 25)) == Decimal("0.9")
+        # A newer row without a rate falls back to the monthly rate
+        assert reader.get_exchange_rate("EUR", date(TAX_YEAR, 10, 25)) == Decimal("0.9600")
+
+
+def test_find_securities_by_isins_batch(db_path):
+    with KurslisteDBReader(str(db_path)) as reader:
+        result = reader.find_securities_by_isins(
+            ["CH0012345678", "LU0065432109", "XX0000000000", "CH0012345678"], TAX_YEAR
+        )
+        assert set(result) == {"CH0012345678", "LU0065432109"}
+        assert [s.id for s in result["CH0012345678"]] == [101]
+        assert sorted(s.id for s in result["LU0065432109"]) == [303, 501]
+        # First entry matches the single-key lookup
+        single = reader.find_security_by_isin("LU0065432109", TAX_YEAR)
+        assert single is not None
+        assert result["LU0065432109"][0].id == single.id
+
+        assert reader.find_securities_by_isins(["CH0012345678"], TAX_YEAR - 1) == {}
+        assert reader.find_securities_by_isins([], TAX_YEAR) == {}
+
+
+def test_find_securities_by_valors_batch_chunked(db_path, monkeypatch):
+    monkeypatch.setattr(KurslisteDBReader, "_IN_CLAUSE_CHUNK_SIZE", 1)
+    with KurslisteDBReader(str(db_path)) as reader:
+        result = reader.find_securities_by_valors([123456, 789012, 888888], TAX_YEAR)
+        assert set(result) == {123456, 789012}
+        assert sorted(s.id for s in result[123456]) == [101, 401]
+        assert isinstance(result[789012][0], Bond)
+
+
+PRICES_XML_CONTENT = f"""<?xml version="1.0" encoding="UTF-8"?>
+<kursliste xmlns="http://xmlns.estv.admin.ch/ictax/2.0.0/kursliste"
+           version="2.0.0.1" creationDate="2024-01-01T00:00:00" year="{TAX_YEAR}">
+    <share id="601" quoted="true" source="KURSLISTE" securityGroup="SHARE" securityType="SHARE.COMMON"
+           valorNumber="600601" isin="CH0000000601" securityName="Daily Share AG"
+           currency="USD" nominalValue="1.00" country="US"
+           institutionId="999" institutionName="Test Bank Share">
+        <yearend id="60101" quotationType="PIECE" taxValue="12.3400000001" />
+        <yearend id="60102" quotationType="PIECE" taxValue="99" taxValueCHF="99" />
+        <daily date="{TAX_YEAR}-06-30" currency="USD" quotationType="PIECE" taxValue="11.00" taxValueCHF="9.90" />
+        <daily date="{TAX_YEAR}-07-31" currency="USD" quotationType="PIECE" taxValue="10.50" />
+        <daily date="{TAX_YEAR}-08-31" currency="USD" quotationType="PIECE" />
+    </share>
+</kursliste>
+"""
+
+
+@pytest.fixture
+def prices_db_path(tmp_path):
+    sample_xml_file = tmp_path / f"prices_kursliste_{TAX_YEAR}.xml"
+    sample_xml_file.write_text(PRICES_XML_CONTENT)
+    output_db_file = tmp_path / f"kursliste_prices_{TAX_YEAR}.sqlite"
+    convert_kursliste_xml_to_sqlite(str(sample_xml_file), str(output_db_file))
+    return output_db_file
+
+
+def test_get_security_price(db_path):
+    with KurslisteDBReader(str(db_path)) as reader:
+        assert reader.has_security_prices
+        assert reader.get_security_price("CH0012345678", TAX_YEAR) == Decimal("150.50")
+        # Only taxValue available
+        assert reader.get_security_price("CH0078901234", TAX_YEAR) == Decimal("1012.50")
+        # Duplicate ISIN: price of the first security, like find_security_by_isin
+        assert reader.get_security_price("LU0065432109", TAX_YEAR) == Decimal("68.70")
+        assert reader.get_security_price("CH0000000401", TAX_YEAR) is None
+        assert reader.get_security_price("XX0000000000", TAX_YEAR) is None
+        assert reader.get_security_price("CH0012345678", TAX_YEAR - 1) is None
+
+
+def test_get_security_price_daily_and_yearend(prices_db_path):
+    isin = "CH0000000601"
+    with KurslisteDBReader(str(prices_db_path)) as reader:
+        assert reader.get_security_price(isin, TAX_YEAR, date(TAX_YEAR, 6, 30)) == Decimal("9.90")
+        assert reader.get_security_price(isin, TAX_YEAR, date(TAX_YEAR, 7, 31)) == Decimal("10.50")
+        # No value on that day or no daily entry at all: first usable yearend entry
+        expected_yearend = Decimal("12.3400000001")
+        assert reader.get_security_price(isin, TAX_YEAR, date(TAX_YEAR, 8, 31)) == expected_yearend
+        assert reader.get_security_price(isin, TAX_YEAR, date(TAX_YEAR, 9, 30)) == expected_yearend
+        assert reader.get_security_price(isin, TAX_YEAR) == expected_yearend
+
+
+def test_get_security_price_matches_model_fallback(prices_db_path):
+    """Databases without the security_prices table fall back to the security blob."""
+    import sqlite3
+    from opensteuerauszug.core.kursliste_accessor import KurslisteAccessor
+
+    price_dates = [None] + [date(TAX_YEAR, m, d) for m, d in ((6, 30), (7, 31), (8, 31), (9, 30))]
+    with KurslisteDBReader(str(prices_db_path)) as reader:
+        expected = [
+            KurslisteAccessor(reader, TAX_YEAR).get_security_price("CH0000000601", d)
+            for d in price_dates
+        ]
+
+    conn = sqlite3.connect(str(prices_db_path))
+    conn.execute("DROP TABLE security_prices")
+    conn.commit()
+    conn.close()
+
+    with KurslisteDBReader(str(prices_db_path)) as reader:
+        assert not reader.has_security_prices
+        accessor = KurslisteAccessor(reader, TAX_YEAR)
+        assert [accessor.get_security_price("CH0000000601", d) for d in price_dates] == expected
+
+
+@pytest.fixture(scope="module")
+def mini_kursliste_db(tmp_path_factory):
+    from pathlib import Path
+
+    sample_xml = Path(__file__).parent.parent / "samples" / "kursliste" / "kursliste_mini.xml"
+    db_file = tmp_path_factory.mktemp("mini_kursliste") / "kursliste_2024.sqlite"
+    convert_kursliste_xml_to_sqlite(str(sample_xml), str(db_file))
+    return sample_xml, db_file
+
+
+def test_security_payments_match_xml_model(mini_kursliste_db):
+    """Payments re-attached from security_payments equal the ones parsed from the XML."""
+    from opensteuerauszug.model.kursliste import Kursliste
+
+    sample_xml, db_file = mini_kursliste_db
+    kursliste = Kursliste.from_xml_file(sample_xml, denylist=set())
+    xml_funds = {fund.id: fund for fund in kursliste.funds}
+    xml_shares = {share.id: share for share in kursliste.shares}
+
+    checked_payments = 0
+    with KurslisteDBReader(str(db_file)) as reader:
+        assert reader.has_security_payments
+        for xml_security in list(xml_funds.values()) + list(xml_shares.values()):
+            db_security = reader.find_security_by_valor(
+                int(xml_security.valorNumber), kursliste.year
+            )
+            if db_security is None or db_security.id != xml_security.id:
+                continue
+            assert db_security.payment == xml_security.payment
+            checked_payments += len(xml_security.payment)
+    assert checked_payments > 0
+
+
+def test_get_security_payments_by_isin_skips_deleted(mini_kursliste_db):
+    from opensteuerauszug.model.kursliste import Kursliste
+
+    sample_xml, db_file = mini_kursliste_db
+    kursliste = Kursliste.from_xml_file(sample_xml, denylist=set())
+    with KurslisteDBReader(str(db_file)) as reader:
+        securities_with_deleted = [
+            sec
+            for sec in kursliste.shares + kursliste.funds
+            if any(p.deleted for p in sec.payment)
+            and reader.find_security_by_isin(sec.isin, kursliste.year).id == sec.id
+        ]
+        assert securities_with_deleted
+        for sec in securities_with_deleted:
+            payments = reader.get_security_payments_by_isin(sec.isin, kursliste.year)
+            assert payments == [p for p in sec.payment if not p.deleted]
+            all_payments = reader.get_security_payments_by_isin(
+                sec.isin, kursliste.year, include_deleted=True
+            )
+            assert all_payments == sec.payment
+        assert reader.get_security_payments_by_isin("XX0000000000", kursliste.year) == []
+
+
+def test_binary_blobs_match_xml_blobs(mini_kursliste_db, tmp_path):
+    """Securities decoded from the binary blob format equal those from XML blobs."""
+    sample_xml, binary_db_file = mini_kursliste_db
+    xml_db_file = tmp_path / "kursliste_2024_xml.sqlite"
+    convert_kursliste_xml_to_sqlite(str(sample_xml), str(xml_db_file), blob_format="xml")
+
+    with (
+        KurslisteDBReader(str(binary_db_file)) as binary_reader,
+        KurslisteDBReader(str(xml_db_file)) as xml_reader,
+    ):
+        assert binary_reader._blob_format == "binary"
+        assert xml_reader._blob_format == "xml"
+        isins = [
+            row[0]
+            for row in xml_reader.conn.execute(
+                "SELECT DISTINCT isin FROM securities WHERE isin IS NOT NULL"
+            )
+        ]
+        assert isins
+        for isin in isins:
+            assert binary_reader.find_securities_by_isin(
+                isin, 2024
+            ) == xml_reader.find_securities_by_isin(isin, 2024)
+
+
+def test_read_only_mode(mini_kursliste_db):
+    _, db_file = mini_kursliste_db
+    with KurslisteDBReader(str(db_file)) as reader:
+        isin = reader.conn.execute(
+            "SELECT isin FROM securities WHERE isin IS NOT NULL LIMIT 1"
+        ).fetchone()[0]
+        expected = reader.find_securities_by_isin(isin, 2024)
+
+    with KurslisteDBReader(
+        str(db_file), read_only=True, mmap_size=4 * 1024 * 1024, cache_size_kib=512
+    ) as reader:
+        assert reader.conn.execute("PRAGMA mmap_size").fetchone()[0] == 4 * 1024 * 1024
+        assert reader.conn.execute("PRAGMA cache_size").fetchone()[0] == -512
+        assert reader.find_securities_by_isin(isin, 2024) == expected
+        with pytest.raises(sqlite3.OperationalError):
+            reader.conn.execute("DELETE FROM securities")
+
+
+def test_read_only_mode_requires_existing_file(tmp_path):
+    with pytest.raises(sqlite3.OperationalError):
+        KurslisteDBReader(str(tmp_path / "missing.sqlite"), read_only=True)
+    assert not (tmp_path / "missing.sqlite").exists()
+
+
+def test_lookups_from_several_threads(mini_kursliste_db):
+    from concurrent.futures import ThreadPoolExecutor
+
+    _, db_file = mini_kursliste_db
+    with KurslisteDBReader(str(db_file), read_only=True) as reader:
+        isins = [
+            row[0]
+            for row in reader.conn.execute(
+                "SELECT DISTINCT isin FROM securities WHERE isin IS NOT NULL ORDER BY isin"
+            )
+        ]
+        expected = [reader.find_securities_by_isin(isin, 2024) for isin in isins]
+        assert any(expected)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(
+                executor.map(lambda isin: reader.find_securities_by_isin(isin, 2024), isins * 4)
+            )
+
+    assert results == expected * 4
+
+
+def test_get_signs_and_da1_rates_match_xml_model(mini_kursliste_db):
+    from opensteuerauszug.model.kursliste import Kursliste
+
+    sample_xml, db_file = mini_kursliste_db
+    kursliste = Kursliste.from_xml_file(sample_xml, denylist=set())
+    assert kursliste.signs and kursliste.da1Rates
+
+    with KurslisteDBReader(str(db_file), read_only=True) as reader:
+        assert reader.get_signs(kursliste.year) == kursliste.signs
+        assert reader.get_da1_rates(kursliste.year) == kursliste.da1Rates
+        assert reader.get_signs(kursliste.year + 1) == []
+        assert reader.get_da1_rates(kursliste.year + 1) == []
@@ -214,6 +214,53 @@ class TestKurslisteExchangeRateProvider(unittest.TestCase):
         self.assertEqual(expected_rate, rate)
         self.kursliste_manager_mock.get_kurslisten_for_year.assert_called_once_with(test_year)
 
+    def test_get_exchange_rates_groups_by_year(self):
+        self.kursliste_mock.exchangeRates = [
+            ExchangeRate(currency="USD", date=date(2023, 5, 20), value=Decimal("0.90")),
+            ExchangeRate(currency="EUR", date=date(2023, 5, 20), value=Decimal("0.95")),
+        ]
+
+        rates = self.provider.get_exchange_rates(
+            [
+                ("USD", date(2023, 5, 20)),
+                ("CHF", date(2023, 5, 20)),
+                ("EUR", date(2023, 5, 20)),
+                ("USD", date(2023, 5, 20)),
+            ]
+        )
+        self.assertEqual(
+            {
+                ("USD", date(2023, 5, 20)): Decimal("0.90"),
+                ("CHF", date(2023, 5, 20)): Decimal("1"),
+                ("EUR", date(2023, 5, 20)): Decimal("0.95"),
+            },
+            rates,
+        )
+        self.kursliste_manager_mock.get_kurslisten_for_year.assert_called_once_with(2023)
+
+    def test_get_exchange_rates_missing_rate_raises(self):
+        with self.assertRaisesRegex(
+            ValueError,
+            "Exchange rate for XYZ on 2023-10-10 not found in any Kursliste source for tax year 2023.",
+        ):
+            self.provider.get_exchange_rates([("XYZ", date(2023, 10, 10))])
+
+    def test_convert_many(self):
+        self.kursliste_mock.exchangeRates = [
+            ExchangeRate(currency="USD", date=date(2023, 5, 20), value=Decimal("0.90")),
+        ]
+
+        converted = self.provider.convert_many(
+            [Decimal("100"), None, Decimal("7.50")],
+            ["USD", "USD", "CHF"],
+            [date(2023, 5, 20), date(2023, 5, 20), date(2023, 6, 1)],
+        )
+        self.assertEqual([Decimal("90.00"), None, Decimal("7.50")], converted)
+
+    def test_convert_many_length_mismatch(self):
+        with self.assertRaises(ValueError):
+            self.provider.convert_many([Decimal("1")], ["USD", "EUR"], [date(2023, 5, 20)])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,88 @@
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from opensteuerauszug.core.kursliste_accessor import KurslisteAccessor
+from opensteuerauszug.core.kursliste_index import KurslisteIndex
+from opensteuerauszug.model.kursliste import Kursliste
+
+MINI_KURSLISTE = Path(__file__).parent.parent / "samples" / "kursliste" / "kursliste_mini.xml"
+
+
+@pytest.fixture(scope="module")
+def mini_kursliste() -> Kursliste:
+    return Kursliste.from_xml_file(MINI_KURSLISTE, denylist=set())
+
+
+def _scan_exchange_rate(kl: Kursliste, currency: str, reference_date: date) -> Optional[Decimal]:
+    """The linear scan the index replaces."""
+    if reference_date.month == 12 and reference_date.day == 31:
+        for rate in kl.exchangeRatesYearEnd:
+            if rate.currency == currency and rate.year == reference_date.year:
+                if rate.value is not None:
+                    return rate.value
+                if rate.valueMiddle is not None:
+                    return rate.valueMiddle
+    for rate in kl.exchangeRatesMonthly:
+        if (
+            rate.currency == currency
+            and rate.year == reference_date.year
+            and rate.month == f"{reference_date.month:02d}"
+            and rate.value is not None
+        ):
+            return rate.value
+    for rate in kl.exchangeRates:
+        if rate.currency == currency and rate.date == reference_date and rate.value is not None:
+            return rate.value
+    return None
+
+
+def test_security_lookups_match_model_scans(mini_kursliste):
+    accessor = KurslisteAccessor([mini_kursliste], mini_kursliste.year)
+    index = KurslisteIndex(mini_kursliste)
+    assert index.securities_by_isin and index.securities_by_valor
+    for isin in index.securities_by_isin:
+        assert accessor.get_securities_by_isin(isin) == mini_kursliste.find_securities_by_isin(isin)
+        assert accessor.get_security_by_isin(isin) is mini_kursliste.find_security_by_isin(isin)
+    for valor in index.securities_by_valor:
+        assert accessor.get_securities_by_valor(valor) == mini_kursliste.find_securities_by_valor(
+            valor
+        )
+        assert accessor.get_security_by_valor(valor) is mini_kursliste.find_security_by_valor(valor)
+    assert accessor.get_security_by_isin("XX0000000000") is None
+    assert accessor.get_securities_by_valor(1) == []
+
+
+def test_exchange_rates_match_scan(mini_kursliste):
+    accessor = KurslisteAccessor([mini_kursliste], mini_kursliste.year)
+    keys = {(rate.currency, rate.date) for rate in mini_kursliste.exchangeRates}
+    for rate in mini_kursliste.exchangeRatesMonthly:
+        keys.add((rate.currency, date(rate.year, int(rate.month), 15)))
+    for rate in mini_kursliste.exchangeRatesYearEnd:
+        keys.add((rate.currency, date(rate.year, 12, 31)))
+    assert keys
+    for currency, reference_date in keys:
+        expected = _scan_exchange_rate(mini_kursliste, currency, reference_date)
+        assert accessor.get_exchange_rate(currency, reference_date) == expected
+
+
+def test_signs_and_da1_rates(mini_kursliste):
+    accessor = KurslisteAccessor([mini_kursliste], mini_kursliste.year)
+    for sign in mini_kursliste.signs:
+        assert accessor.get_sign_by_value(sign.sign) is next(
+            s for s in mini_kursliste.signs if s.sign == sign.sign
+        )
+    index = KurslisteIndex(mini_kursliste)
+    for (country, group), rates in index.da1_rates_by_country_group.items():
+        assert rates == [
+            r for r in mini_kursliste.da1Rates if r.country == country and r.securityGroup == group
+        ]
+
+
+def test_index_ignores_other_tax_years(mini_kursliste):
+    accessor = KurslisteAccessor([mini_kursliste], mini_kursliste.year + 1)
+    isin = next(iter(KurslisteIndex(mini_kursliste).securities_by_isin))
+    assert accessor.get_security_by_isin(isin) is None
@@ -1,7 +1,10 @@
+import threading
 from pathlib import Path
 from typing import List
 from datetime import date
 
+import pytest
+
 from opensteuerauszug.core.kursliste_manager import KurslisteManager
 from opensteuerauszug.core.kursliste_db_reader import KurslisteDBReader
 from opensteuerauszug.model.kursliste import Kursliste
@@ -92,6 +95,23 @@ def test_load_directory_sqlite_only(tmp_path):
     accessor_2024.data_source.close()  # Close the underlying DBReader connection
 
 
+def test_load_directory_sqlite_read_only(tmp_path):
+    manager = KurslisteManager(read_only=True, mmap_size=1024 * 1024)
+    temp_xml_file_2024 = create_sample_xml(tmp_path / "kursliste_2024_temp.xml", 2024)
+    create_sample_sqlite_from_xml(temp_xml_file_2024, tmp_path / "kursliste_2024.sqlite")
+    temp_xml_file_2024.unlink()
+
+    manager.load_directory(tmp_path)
+
+    reader = manager.get_kurslisten_for_year(2024).data_source
+    assert isinstance(reader, KurslisteDBReader)
+    assert reader.read_only
+    assert reader.conn.execute("PRAGMA mmap_size").fetchone()[0] == 1024 * 1024
+    security = manager.get_kurslisten_for_year(2024).get_security_by_valor(123456)
+    assert security is not None and security.securityName == "Test Share AG 2024"
+    reader.close()
+
+
 def test_load_directory_xml_and_sqlite_preference(tmp_path):
     manager = KurslisteManager()
     xml_file_2025 = create_sample_xml(tmp_path / "kursliste_2025.xml", 2025)
@@ -299,3 +319,98 @@ def test_load_directory_specific_sqlite_name_preference(tmp_path):
     )  # Content from the specifically named DB
 
     accessor_2036.data_source.close()
+
+
+def test_load_directory_is_lazy(tmp_path):
+    manager = KurslisteManager()
+    create_sample_xml(tmp_path / "kursliste_2040.xml", 2040)
+    temp_xml_2041 = create_sample_xml(tmp_path / "kursliste_2041_temp.xml", 2041)
+    create_sample_sqlite_from_xml(temp_xml_2041, tmp_path / "kursliste_2041.sqlite")
+    temp_xml_2041.unlink()
+
+    manager.load_directory(tmp_path)
+
+    assert manager.kurslisten == {}
+    assert manager.get_available_years() == [2040, 2041]
+
+    accessor_2040 = manager.get_kurslisten_for_year(2040)
+    assert accessor_2040 is not None
+    assert manager.get_kurslisten_for_year(2040) is accessor_2040
+    assert list(manager.kurslisten) == [2040]
+    assert manager.get_available_years() == [2040, 2041]
+
+
+def test_preload(tmp_path):
+    create_sample_xml(tmp_path / "kursliste_2042.xml", 2042)
+    create_sample_xml(tmp_path / "kursliste_2043.xml", 2043)
+    create_sample_xml(tmp_path / "kursliste_2044.xml", 2044)
+
+    manager = KurslisteManager()
+    manager.load_directory(tmp_path)
+    manager.preload([2043, 2050])
+    assert list(manager.kurslisten) == [2043]
+
+    manager.preload()
+    assert sorted(manager.kurslisten) == [2042, 2043, 2044]
+
+
+def test_ensure_year_available_loads_cataloged_year(tmp_path):
+    (tmp_path / "kursliste_2045.xml").write_text("<not-a-kursliste/>")
+    manager = KurslisteManager()
+    manager.load_directory(tmp_path)
+    assert manager.get_available_years() == [2045]
+
+    with pytest.raises(ValueError, match="Kursliste data for tax year 2045 not found"):
+        manager.ensure_year_available(2045)
+    assert manager.get_available_years() == []
+
+
+def test_concurrent_first_access_waits_for_load(tmp_path, monkeypatch):
+    create_sample_xml(tmp_path / "kursliste_2046.xml", 2046)
+    manager = KurslisteManager()
+    manager.load_directory(tmp_path)
+
+    loading = threading.Event()
+    release = threading.Event()
+    original_load_year = manager._load_year
+
+    def slow_load_year(year, files):
+        loading.set()
+        assert release.wait(timeout=10)
+        return original_load_year(year, files)
+
+    monkeypatch.setattr(manager, "_load_year", slow_load_year)
+
+    results = {}
+
+    def lookup(name):
+        results[name] = manager.get_kurslisten_for_year(2046)
+
+    first = threading.Thread(target=lookup, args=("first",))
+    first.start()
+    assert loading.wait(timeout=10)
+    # The year is being loaded by the first thread; it must stay visible
+    assert manager.get_available_years() == [2046]
+    second = threading.Thread(target=lookup, args=("second",))
+    second.start()
+    release.set()
+    first.join(timeout=10)
+    second.join(timeout=10)
+
+    assert results["first"] is not None
+    assert results["second"] is results["first"]
+
+
+@pytest.mark.parametrize("index_xml", [False, True])
+def test_load_directory_catalogs_xml_by_content_year(tmp_path, capsys, index_xml):
+    create_sample_xml(tmp_path / "kursliste_2047.xml", 2048)
+    manager = KurslisteManager(index_xml=index_xml)
+    manager.load_directory(tmp_path)
+
+    assert "Year mismatch for kursliste_2047.xml" in capsys.readouterr().out
+    assert manager.get_available_years() == [2048]
+    assert manager.get_kurslisten_for_year(2047) is None
+    accessor = manager.get_kurslisten_for_year(2048)
+    assert accessor is not None
+    assert accessor.get_security_by_isin("CH0012345678") is not None
+    assert manager.loaded_files[2048] == [tmp_path / "kursliste_2047.xml"]
@@ -0,0 +1,128 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from opensteuerauszug.core.kursliste_db_reader import KurslisteDBReader
+from opensteuerauszug.core.kursliste_session import KurslisteSession, KurslisteSessionPool
+from opensteuerauszug.kursliste.converter import convert_kursliste_xml_to_sqlite
+
+SAMPLE_DIR = Path(__file__).parent.parent / "samples" / "kursliste"
+
+
+@pytest.fixture
+def kursliste_dir(tmp_path):
+    convert_kursliste_xml_to_sqlite(
+        str(SAMPLE_DIR / "kursliste_mini.xml"), str(tmp_path / "kursliste_2024.sqlite")
+    )
+    shutil.copy(SAMPLE_DIR / "kursliste_mini_2025.xml", tmp_path / "kursliste_2025.xml")
+    return tmp_path
+
+
+def test_session_shares_manager_between_uses(kursliste_dir):
+    with KurslisteSession(kursliste_dir, read_only=True) as session:
+        session.ensure_year_available(2024)
+        accessor = session.manager.get_kurslisten_for_year(2024)
+        assert isinstance(accessor.data_source, KurslisteDBReader)
+        assert session.exchange_rate_provider.kursliste_manager is session.manager
+
+        # A second phase asking for the same year gets the same, already warm accessor
+        session.ensure_year_available(2024)
+        assert session.manager.get_kurslisten_for_year(2024) is accessor
+
+        with pytest.raises(ValueError, match="Kursliste data for tax year 2030 not found"):
+            session.ensure_year_available(2030)
+    assert accessor.data_source.conn is None
+
+
+def test_memory_footprint(kursliste_dir):
+    with KurslisteSession(kursliste_dir, read_only=True, mmap_size=1024) as session:
+        footprint = session.memory_footprint()
+        assert footprint.years == []
+        assert footprint.cataloged_years == [2024, 2025]
+
+        accessor_2024 = session.manager.get_kurslisten_for_year(2024)
+        isin = accessor_2024.data_source.conn.execute(
+            "SELECT isin FROM securities WHERE isin IS NOT NULL LIMIT 1"
+        ).fetchone()[0]
+        accessor_2024.get_securities_by_isins([isin])
+        session.manager.get_kurslisten_for_year(2025)
+
+        footprint = session.memory_footprint()
+        assert footprint.cataloged_years == []
+        sqlite_year, xml_year = footprint.years
+        assert (sqlite_year.year, sqlite_year.source) == (2024, "sqlite")
+        assert sqlite_year.mapped_bytes == 1024
+        assert sqlite_year.page_cache_limit_bytes == (
+            KurslisteDBReader.DEFAULT_CACHE_SIZE_KIB * 1024
+        )
+        assert sqlite_year.prefetched_securities >= 1
+        assert (xml_year.year, xml_year.source) == (2025, "xml")
+        assert xml_year.file_bytes == (kursliste_dir / "kursliste_2025.xml").stat().st_size
+        assert "2024: sqlite" in footprint.format()
+
+
+def test_memory_footprint_counts_cache_use(kursliste_dir):
+    with KurslisteSession(kursliste_dir, read_only=True, accessor_cache_size=1) as session:
+        accessor = session.manager.get_kurslisten_for_year(2024)
+        assert accessor.cache_size == 1
+        isins = [
+            row[0]
+            for row in accessor.data_source.conn.execute(
+                "SELECT isin FROM securities WHERE isin IS NOT NULL LIMIT 2"
+            )
+        ]
+        accessor.get_security_by_isin(isins[0])
+        accessor.get_security_by_isin(isins[0])
+        accessor.get_security_by_isin(isins[1])
+
+        footprint = session.memory_footprint()
+        assert footprint.cached_results == 1
+        assert (footprint.cache_hits, footprint.cache_misses, footprint.cache_evictions) == (
+            1,
+            2,
+            1,
+        )
+        assert "1 hits, 2 misses, 1 evictions" in footprint.format()
+
+
+def test_session_pool_reuses_sessions(kursliste_dir):
+    pool = KurslisteSessionPool()
+    session = pool.get(kursliste_dir, read_only=True)
+
+    assert pool.get(kursliste_dir, read_only=True) is session
+    assert pool.get(kursliste_dir, read_only=True, index_xml=True) is not session
+
+    session.ensure_year_available(2024)
+    reader = session.manager.get_kurslisten_for_year(2024).data_source
+    pool.close()
+    assert reader.conn is None
+
+
+def test_session_pool_end_job_drops_prefetched_securities(kursliste_dir):
+    pool = KurslisteSessionPool()
+    session = pool.get(kursliste_dir, read_only=True)
+    accessor = session.manager.get_kurslisten_for_year(2024)
+    first_isin, second_isin = [
+        row[0]
+        for row in accessor.data_source.conn.execute(
+            "SELECT DISTINCT isin FROM securities WHERE isin IS NOT NULL LIMIT 2"
+        )
+    ]
+
+    # Two jobs in the same worker, each prefetching its own statement
+    pool.get(kursliste_dir, read_only=True)
+    accessor.get_securities_by_isins([first_isin])
+    first_job = accessor.prefetched_security_count()
+    pool.end_job()
+    assert accessor.prefetched_security_count() == 0
+
+    pool.get(kursliste_dir, read_only=True)
+    accessor.get_securities_by_isins([second_isin])
+    second_job = accessor.prefetched_security_count()
+    pool.end_job()
+
+    assert first_job == len(accessor.get_securities_by_isin(first_isin)) > 0
+    # Only the second job's securities were held, not both jobs'
+    assert second_job == len(accessor.get_securities_by_isin(second_isin)) > 0
+    pool.close()
@@ -0,0 +1,122 @@
+import shutil
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from opensteuerauszug.core import kursliste_xml_reader
+from opensteuerauszug.core.kursliste_accessor import KurslisteAccessor
+from opensteuerauszug.core.kursliste_manager import KurslisteManager
+from opensteuerauszug.core.kursliste_xml_reader import KurslisteXmlReader, index_path_for
+from opensteuerauszug.model.kursliste import Kursliste
+
+MINI_KURSLISTE = Path(__file__).parent.parent / "samples" / "kursliste" / "kursliste_mini.xml"
+
+V20_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<kursliste xmlns="http://xmlns.estv.admin.ch/ictax/2.0.0/kursliste"
+           version="2.0.0.1" creationDate="2024-01-15T09:00:00" year="2023">
+    <!-- a comment between elements -->
+    <share id="101" quoted="true" source="KURSLISTE" securityGroup="SHARE" securityType="SHARE.COMMON"
+           valorNumber="123456" isin="CH0012345678" securityName="Test Share AG"
+           currency="CHF" nominalValue="10.00" country="CH"
+           institutionId="999" institutionName="Test Bank Share">
+        <yearend id="10101" quotationType="PIECE" taxValue="150.50" taxValueCHF="150.50" />
+    </share>
+    <exchangeRate currency="USD" date="2023-11-10" denomination="1" value="0.8950" />
+    <exchangeRateYearEnd currency="USD" year="2023" denomination="1" valueMiddle="0.8400" />
+</kursliste>
+"""
+
+
+@pytest.fixture
+def mini_xml(tmp_path):
+    xml_path = tmp_path / "kursliste_2024.xml"
+    shutil.copy(MINI_KURSLISTE, xml_path)
+    return xml_path
+
+
+@pytest.fixture(scope="module")
+def mini_kursliste():
+    return Kursliste.from_xml_file(MINI_KURSLISTE, denylist=set())
+
+
+def test_lookups_match_parsed_kursliste(mini_xml, mini_kursliste):
+    xml_accessor = KurslisteAccessor([mini_kursliste], 2024)
+    with KurslisteXmlReader(str(mini_xml)) as reader:
+        assert reader.tax_year == 2024
+        accessor = KurslisteAccessor(reader, 2024)
+        securities = mini_kursliste.shares + mini_kursliste.funds + mini_kursliste.bonds
+        assert securities
+        for security in securities:
+            assert accessor.get_securities_by_isin(
+                security.isin
+            ) == mini_kursliste.find_securities_by_isin(security.isin)
+            assert accessor.get_securities_by_valor(
+                security.valorNumber
+            ) == mini_kursliste.find_securities_by_valor(security.valorNumber)
+            assert accessor.get_security_price(security.isin) == xml_accessor.get_security_price(
+                security.isin
+            )
+            assert accessor.get_security_payments(
+                security.isin
+            ) == xml_accessor.get_security_payments(security.isin)
+        for sign in mini_kursliste.signs:
+            assert accessor.get_sign_by_value(sign.sign) == sign
+        for rate in mini_kursliste.da1Rates:
+            assert accessor.get_da1_rate(
+                rate.country, rate.securityGroup, rate.securityType
+            ) == xml_accessor.get_da1_rate(rate.country, rate.securityGroup, rate.securityType)
+        for rate in mini_kursliste.exchangeRatesMonthly:
+            reference_date = date(rate.year, int(rate.month), 12)
+            assert accessor.get_exchange_rate(
+                rate.currency, reference_date
+            ) == xml_accessor.get_exchange_rate(rate.currency, reference_date)
+        assert accessor.get_security_by_isin("XX0000000000") is None
+        assert reader.find_securities_by_isin(securities[0].isin, 2023) == []
+
+
+def test_index_is_stored_and_reused(mini_xml, monkeypatch):
+    KurslisteXmlReader(str(mini_xml)).close()
+    assert index_path_for(mini_xml).exists()
+
+    def fail(_path):
+        raise AssertionError("index should have been loaded from the sidecar file")
+
+    monkeypatch.setattr(kursliste_xml_reader, "build_offset_index", fail)
+    with KurslisteXmlReader(str(mini_xml)) as reader:
+        assert reader.tax_year == 2024
+
+
+def test_stale_index_is_rebuilt(tmp_path):
+    xml_path = tmp_path / "kursliste_2023.xml"
+    xml_path.write_text(V20_XML)
+    KurslisteXmlReader(str(xml_path)).close()
+
+    xml_path.write_text(V20_XML.replace("Test Share AG", "Renamed Share AG"))
+    with KurslisteXmlReader(str(xml_path)) as reader:
+        assert reader.find_security_by_isin("CH0012345678", 2023).securityName == (
+            "Renamed Share AG"
+        )
+
+
+def test_v20_namespace_and_rates(tmp_path):
+    xml_path = tmp_path / "kursliste_2023.xml"
+    xml_path.write_text(V20_XML)
+    parsed = Kursliste.from_xml_file(xml_path, denylist=set())
+    with KurslisteXmlReader(str(xml_path), write_index=False) as reader:
+        assert not index_path_for(xml_path).exists()
+        assert reader.find_security_by_valor(123456, 2023) == parsed.shares[0]
+        assert reader.get_exchange_rate("USD", date(2023, 11, 10)) == parsed.exchangeRates[0].value
+        assert reader.get_exchange_rate("USD", date(2023, 12, 31)) == (
+            parsed.exchangeRatesYearEnd[0].valueMiddle
+        )
+        assert reader.get_exchange_rate("USD", date(2023, 11, 11)) is None
+
+
+def test_manager_index_xml(mini_xml):
+    manager = KurslisteManager(index_xml=True)
+    manager.load_directory(mini_xml.parent)
+    accessor = manager.get_kurslisten_for_year(2024)
+    assert isinstance(accessor.data_source, KurslisteXmlReader)
+    assert manager.loaded_files[2024] == [mini_xml]
+    accessor.data_source.close()
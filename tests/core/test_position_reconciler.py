@@ -385,5 +385,107 @@ class TestPositionReconciler(unittest.TestCase):
             self.assertEqual(pos.currency, "CHF")
 
 
+    def test_positions_at_matches_single_lookups(self):
+        stocks = [
+            create_stock("2023-01-10", "5", True, name="Before first balance"),
+            create_stock("2023-02-01", "100", False),
+            create_stock("2023-02-01", "2.50", True, name="Same day as balance"),
+            create_stock("2023-03-15", "-20", True),
+            create_stock("2023-03-15", "0.125", True),
+            create_stock("2023-06-30", "82.625", False),
+            create_stock("2023-07-01", "-82.625", True),
+        ]
+        reconciler = PositionReconciler(stocks, identifier="BATCH")
+        dates = [
+            date(2023, 1, 1),
+            date(2023, 1, 10),
+            date(2023, 3, 15),
+            date(2023, 3, 16),
+            date(2023, 2, 1),
+            date(2023, 7, 1),
+            date(2024, 1, 1),
+        ]
+
+        positions = reconciler.positions_at(dates)
+
+        self.assertEqual(
+            [p.quantity for p in positions],
+            [
+                Decimal("95"),
+                Decimal("95"),
+                Decimal("102.50"),
+                Decimal("82.625"),
+                Decimal("100"),
+                Decimal("82.625"),
+                Decimal("0"),
+            ],
+        )
+        self.assertEqual([p.reference_date for p in positions], dates)
+        for target_date, position in zip(dates, positions):
+            self.assertEqual(reconciler.synthesize_position_at_date(target_date), position)
+
+    def test_synthesized_quantities_match_linear_walk(self):
+        # The index must give exactly the quantities (including their Decimal
+        # exponent) of applying the mutations one by one.
+        stocks = [
+            create_stock("2023-01-03", "1.5", True),
+            create_stock("2023-01-03", "-0.25", True),
+            create_stock("2023-01-20", "3", True),
+            create_stock("2023-02-01", "10.00", False),
+            create_stock("2023-02-02", "0.001", True),
+            create_stock("2023-02-10", "-4", True),
+            create_stock("2023-03-01", "6.001", False),
+            create_stock("2023-03-01", "7", True),
+        ]
+        reconciler = PositionReconciler(stocks, identifier="LINEAR")
+        mutation_only = PositionReconciler(
+            [s for s in stocks if s.mutation], identifier="LINEAR_ZERO"
+        )
+
+        def linear(sorted_stocks, target_date):
+            before = [s for s in sorted_stocks if s.referenceDate <= target_date]
+            balances = [i for i, s in enumerate(before) if not s.mutation]
+            if balances:
+                quantity = before[balances[-1]].quantity
+                for s in sorted_stocks[balances[-1] + 1 :]:
+                    if s.referenceDate < target_date:
+                        quantity += s.quantity
+                return quantity
+            future = [i for i, s in enumerate(sorted_stocks) if not s.mutation]
+            if not future:
+                quantity = Decimal("0")
+                for s in sorted_stocks:
+                    if s.referenceDate < target_date:
+                        quantity += s.quantity
+                return quantity
+            quantity = sorted_stocks[future[0]].quantity
+            for s in reversed(sorted_stocks[: future[0]]):
+                if s.referenceDate < target_date:
+                    break
+                quantity -= s.quantity
+            return quantity
+
+        day = date(2022, 12, 30)
+        while day <= date(2023, 3, 3):
+            for r in (reconciler, mutation_only):
+                pos = r.synthesize_position_at_date(day, assume_zero_if_no_balances=True)
+                expected = linear(r.sorted_stocks, day)
+                self.assertEqual(str(pos.quantity), str(expected), f"{r.identifier} {day}")
+            day = date.fromordinal(day.toordinal() + 1)
+
+    def test_index_follows_added_stocks(self):
+        stocks = [create_stock("2023-01-01", "10", False)]
+        reconciler = PositionReconciler(stocks, identifier="GROWING")
+        self.assertEqual(
+            reconciler.synthesize_position_at_date(date(2023, 2, 1)).quantity, Decimal("10")
+        )
+
+        reconciler.sorted_stocks.append(create_stock("2023-01-15", "5", True))
+
+        self.assertEqual(
+            reconciler.synthesize_position_at_date(date(2023, 2, 1)).quantity, Decimal("15")
+        )
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,53 @@
+import copy
+import pickle
+
+from opensteuerauszug.importers.common import SecurityPositionAccumulator
+from opensteuerauszug.model.ech0196 import ISINType
+from opensteuerauszug.model.position import SecurityPosition
+
+
+def _pos(symbol="265598", depot="U1", isin=None):
+    return SecurityPosition(depot=depot, symbol=symbol, isin=isin)
+
+
+def test_defaultdict_access_indexes_position():
+    positions = SecurityPositionAccumulator()
+    p = _pos()
+    positions[p]["payments"].append("payment")
+    assert positions[p] == {"stocks": [], "payments": ["payment"]}
+    assert positions.find("U1", "265598") is p
+    # Numeric broker ids match the symbol they were stored under
+    assert positions.find("U1", 265598) is p
+    assert positions.find("U2", "265598") is None
+    assert positions.find("U1", "other") is None
+
+
+def test_find_returns_first_inserted_match():
+    positions = SecurityPositionAccumulator()
+    first = _pos(isin=ISINType("US0378331005"))
+    second = _pos()
+    positions[first]["stocks"]
+    positions[second]["stocks"]
+    assert positions.find("U1", "265598") is first
+
+    del positions[first]
+    assert positions.find("U1", "265598") is second
+    positions.pop(second)
+    assert positions.find("U1", "265598") is None
+
+
+def test_index_follows_other_mutations():
+    p, q = _pos(), _pos(symbol="4815747")
+    positions = SecurityPositionAccumulator([(p, {"stocks": [], "payments": []})])
+    positions.setdefault(q, {"stocks": [], "payments": []})
+    assert positions.find("U1", "4815747") is q
+
+    clone = copy.copy(positions)
+    restored = pickle.loads(pickle.dumps(positions))
+    positions.clear()
+    assert positions.find("U1", "265598") is None
+    for other in (clone, restored):
+        assert isinstance(other, SecurityPositionAccumulator)
+        assert other.find("U1", "265598") == p
+        assert other.find("U1", "4815747") == q
+        assert other[_pos(symbol="new")] == {"stocks": [], "payments": []}
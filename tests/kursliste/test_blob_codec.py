@@ -0,0 +1,52 @@
+from pathlib import Path
+
+import pytest
+
+from opensteuerauszug.kursliste.blob_codec import (
+    BINARY_BLOB_MAGIC,
+    construct_model,
+    decode_model,
+    encode_model,
+    is_binary_blob,
+)
+from opensteuerauszug.model.kursliste import Kursliste, Share
+
+MINI_KURSLISTE = Path(__file__).parent.parent / "samples" / "kursliste" / "kursliste_mini.xml"
+
+
+@pytest.fixture(scope="module")
+def mini_kursliste():
+    return Kursliste.from_xml_file(MINI_KURSLISTE, denylist=set())
+
+
+def test_round_trip_mini_kursliste(mini_kursliste):
+    objects = (
+        mini_kursliste.shares
+        + mini_kursliste.funds
+        + mini_kursliste.bonds
+        + mini_kursliste.signs
+        + mini_kursliste.da1Rates
+    )
+    assert objects
+    for obj in objects:
+        blob = encode_model(obj)
+        assert is_binary_blob(blob)
+        decoded = decode_model(blob, type(obj))
+        assert decoded == obj
+        assert decoded.model_fields_set == obj.model_fields_set
+        assert decoded.model_dump() == obj.model_dump()
+
+
+def test_decode_model_rejects_other_blobs():
+    with pytest.raises(ValueError, match="Not a binary"):
+        decode_model(b"<share/>", Share)
+    with pytest.raises(ValueError, match="Unsupported"):
+        decode_model(BINARY_BLOB_MAGIC + bytes([99]), Share)
+
+
+def test_construct_model_matches_model_construct(mini_kursliste):
+    share = mini_kursliste.shares[0]
+    values = {name: getattr(share, name) for name in share.model_fields_set}
+    constructed = construct_model(Share, values)
+    assert constructed == Share.model_construct(**values)
+    assert constructed.model_fields_set == share.model_fields_set
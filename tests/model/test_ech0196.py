@@ -704,3 +704,117 @@ def test_xml_declaration_uses_double_quotes(sample_tax_statement_data):
     assert (
         b'<?xml version="1.0" encoding="UTF-8"?>' == declaration_pretty
     ), f"XML declaration should use double quotes (pretty print), got: {declaration_pretty.decode()}"
+
+
+def test_parse_plan_is_compiled_once_per_class():
+    from opensteuerauszug.model.ech0196 import _xml_parse_plan
+
+    plan = _xml_parse_plan(Security)
+    assert _xml_parse_plan(Security) is plan
+    stock = plan.children[ns_tag(None, "stock")]
+    assert (stock.field_name, stock.kind, stock.target_type, stock.is_list) == (
+        "stock",
+        "model",
+        SecurityStock,
+        True,
+    )
+    assert plan.attributes["positionId"].parse("7") == 7
+    # Subclasses get their own plan
+    assert _xml_parse_plan(TaxStatement) is not _xml_parse_plan(TaxStatement.__mro__[1])
+
+
+def test_from_xml_skips_comments_and_processing_instructions():
+    xml = f"""
+    <security xmlns="{NS_MAP[None]}" positionId="1" country="CH" currency="CHF"
+              quotationType="PIECE" securityCategory="SHARE" securityName="Test">
+        <!-- a comment -->
+        <?pi data?>
+        <stock referenceDate="2024-01-01" mutation="0" quotationType="PIECE"
+               quantity="10" balanceCurrency="CHF"/>
+    </security>
+    """
+    security = Security._from_xml_element(ET.fromstring(xml.strip()), strict=True)
+    assert security.positionId == 1
+    assert [s.quantity for s in security.stock] == [Decimal("10")]
+    assert security.unknown_elements == []
+
+
+def test_build_plan_is_compiled_once_per_class():
+    from opensteuerauszug.model.ech0196 import _xml_build_plan
+
+    plan = _xml_build_plan(Security)
+    assert _xml_build_plan(Security) is plan
+    # Child elements in field order
+    assert [name for name, _, _ in plan.children] == ["taxValue", "payment", "stock", "uid"]
+    assert plan.children[2][1:] == (ns_tag(None, "stock"), {None: NS_MAP[None]})
+    assert ("positionId", "positionId", False) in plan.attributes
+
+
+def test_unknown_elements_survive_repeated_serialization():
+    xml = f"""
+    <security xmlns="{NS_MAP[None]}" xmlns:x="urn:x" positionId="1" country="CH"
+              currency="CHF" quotationType="PIECE" securityCategory="SHARE"
+              securityName="Test">
+        <x:extra>kept</x:extra>
+    </security>
+    """
+    security = Security._from_xml_element(ET.fromstring(xml.strip()))
+    first = ET.tostring(security._build_xml_element(None))
+    second = ET.tostring(security._build_xml_element(None))
+    assert first == second
+    assert b'<x:extra xmlns:x="urn:x">kept</x:extra>' in first
+    assert len(security.unknown_elements) == 1
+
+
+def test_serialization_cache_is_shared_until_invalidated(sample_tax_statement_data):
+    import zlib
+
+    statement = sample_tax_statement_data
+    # Without enabling, every call serializes again
+    assert statement.to_xml_bytes() is not statement.to_xml_bytes()
+
+    statement.enable_serialization_cache()
+    xml = statement.to_xml_bytes()
+    assert statement.to_xml_bytes() is xml
+    assert statement.to_xml_bytes(pretty_print=False) is not xml
+    compressed = statement.to_compressed_xml_bytes()
+    assert zlib.decompress(compressed) == xml
+    assert statement.to_compressed_xml_bytes() is compressed
+
+    # Changes are not detected, neither assignments nor list edits
+    statement.institution.name = "Other Bank AG"
+    statement.client.append(
+        Client(clientNumber=ClientNumber("C2"), firstName="Erika", lastName="Muster")
+    )
+    assert statement.to_xml_bytes() is xml
+
+    statement.invalidate_serialization_cache()
+    changed = statement.to_xml_bytes()
+    assert b'name="Other Bank AG"' in changed
+    assert b'clientNumber="C2"' in changed
+    assert zlib.decompress(statement.to_compressed_xml_bytes()) == changed
+    assert statement.to_xml_bytes() is changed
+
+
+def test_serialization_cache_is_not_shared_with_copies(sample_tax_statement_data):
+    statement = sample_tax_statement_data
+    statement.enable_serialization_cache()
+    statement.to_xml_bytes()
+
+    copy = statement.model_copy(update={"canton": "BE"})
+    assert b'canton="BE"' in copy.to_xml_bytes()
+
+
+def test_validate_model_shares_the_tree_with_serialization(monkeypatch):
+    monkeypatch.chdir(Path(__file__).resolve().parent.parent.parent)
+    statement = TaxStatement.from_xml_file("tests/samples/fake_statement.xml")
+    statement.enable_serialization_cache()
+    assert statement.validate_model() is True
+    root = statement._xml_root()
+    assert statement._xml_root() is root
+
+    statement.canton = None
+    statement.invalidate_serialization_cache()
+    with pytest.raises(ValueError, match="XSD validation failed:\n  /\\*: .*'canton'"):
+        statement.validate_model()
+    assert statement._xml_root() is not root
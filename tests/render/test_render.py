@@ -1,5 +1,6 @@
 import os
 import tempfile
+import zlib
 import pytest
 from datetime import date, datetime
 from decimal import Decimal
@@ -24,6 +25,8 @@ from opensteuerauszug.model.ech0196 import (
     ValorNumber,
     ISINType,
     ListOfSecurities,
+    ListOfLiabilities,
+    LiabilityAccount,
 )
 from opensteuerauszug.render.render import (
     render_tax_statement,
@@ -337,6 +340,79 @@ def test_make_barcode_pages(sample_tax_statement, monkeypatch):
     assert spacer_found, "No spacer found in the story"
 
 
+def _statement_with_unsorted_accounts(base: TaxStatement) -> TaxStatement:
+    def bank_account(name):
+        return BankAccount(
+            bankAccountName=BankAccountName(name),
+            iban=f"CH{name}",
+            totalTaxValue=Decimal("0"),
+            totalGrossRevenueA=Decimal("0"),
+            totalGrossRevenueB=Decimal("0"),
+        )
+
+    def liability(name):
+        return LiabilityAccount(
+            bankAccountName=BankAccountName(name),
+            bankAccountCountry="CH",
+            bankAccountCurrency="CHF",
+            totalTaxValue=Decimal("0"),
+            totalGrossRevenueB=Decimal("0"),
+        )
+
+    return base.model_copy(
+        deep=True,
+        update={
+            "listOfBankAccounts": ListOfBankAccounts(
+                bankAccount=[bank_account("Konto2"), bank_account("Konto1")],
+                totalTaxValue=Decimal("0"),
+                totalGrossRevenueA=Decimal("0"),
+                totalGrossRevenueB=Decimal("0"),
+            ),
+            "listOfLiabilities": ListOfLiabilities(
+                liabilityAccount=[liability("Hypothek B"), liability("Hypothek A")],
+                totalTaxValue=Decimal("0"),
+                totalGrossRevenueB=Decimal("0"),
+            ),
+        },
+    )
+
+
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_render_sorts_accounts_in_xml_and_barcodes(sample_tax_statement, use_cache):
+    """Sorting done by the renderer must reach the barcodes and the final XML,
+    also when the statement was serialized (and cached) before rendering."""
+
+    def render_and_capture(statement):
+        payloads = []
+
+        def capture_barcode_payload(tax_statement):
+            payloads.append(tax_statement.to_compressed_xml_bytes())
+            return [create_dummy_pil_image()]
+
+        with mock.patch(
+            'opensteuerauszug.render.render.render_to_barcodes', capture_barcode_payload
+        ), tempfile.TemporaryDirectory() as tmp_dir:
+            render_tax_statement(statement, os.path.join(tmp_dir, "out.pdf"))
+        return payloads, statement.to_xml_bytes()
+
+    reference = _statement_with_unsorted_accounts(sample_tax_statement)
+    reference_payloads, reference_xml = render_and_capture(reference)
+
+    statement = _statement_with_unsorted_accounts(sample_tax_statement)
+    if use_cache:
+        statement.enable_serialization_cache()
+        statement.to_xml_bytes()  # as validate_model does before rendering
+    payloads, xml = render_and_capture(statement)
+
+    assert xml.index(b'bankAccountName="Konto1"') < xml.index(b'bankAccountName="Konto2"')
+    assert xml.index(b'bankAccountName="Hypothek A"') < xml.index(
+        b'bankAccountName="Hypothek B"'
+    )
+    assert xml == reference_xml
+    assert payloads == reference_payloads
+    assert zlib.decompress(payloads[0]) == xml
+
+
 @pytest.mark.integration
 @pytest.mark.parametrize("sample_file", get_sample_files("*.xml"))
 @mock.patch('opensteuerauszug.render.render.render_to_barcodes')  # Mock at the source
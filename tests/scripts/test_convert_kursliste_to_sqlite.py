@@ -2,7 +2,10 @@ import sqlite3
 from decimal import Decimal
 from typing import Dict, Type
 
+import pytest
+
 from opensteuerauszug.model.kursliste import Security, Share, Bond, Fund, SecurityTypeESTV
+from opensteuerauszug.kursliste.blob_codec import decode_model, is_binary_blob
 from opensteuerauszug.kursliste.converter import convert_kursliste_xml_to_sqlite
 
 SAMPLE_XML_CONTENT = """<?xml version="1.0" encoding="UTF-8"?>
@@ -58,7 +61,8 @@ def test_convert_kursliste_xml_to_sqlite(tmp_path):
 
     output_db_file = tmp_path / "kursliste_test.sqlite"
 
-    convert_kursliste_xml_to_sqlite(str(sample_xml_file), str(output_db_file))
+    # The blobs are inspected as raw XML below
+    convert_kursliste_xml_to_sqlite(str(sample_xml_file), str(output_db_file), blob_format="xml")
     assert output_db_file.exists(), "SQLite DB file was not created."
 
     # b. Connect to the generated SQLite DB
@@ -246,3 +250,37 @@ def test_convert_kursliste_xml_to_sqlite(tmp_path):
     # Clean up the sample XML file explicitly if not using tmp_path features that auto-cleanup
     # sample_xml_file.unlink() # tmp_path should handle this
     # output_db_file.unlink() # tmp_path should handle this
+
+
+def test_convert_kursliste_xml_to_sqlite_binary_blobs(tmp_path):
+    sample_xml_file = tmp_path / "sample_kursliste_for_db_test.xml"
+    sample_xml_file.write_text(SAMPLE_XML_CONTENT)
+    xml_db_file = tmp_path / "kursliste_xml.sqlite"
+    binary_db_file = tmp_path / "kursliste_binary.sqlite"
+    convert_kursliste_xml_to_sqlite(str(sample_xml_file), str(xml_db_file), blob_format="xml")
+    convert_kursliste_xml_to_sqlite(str(sample_xml_file), str(binary_db_file))
+
+    query = "SELECT kl_id, security_object_blob FROM securities ORDER BY kl_id"
+    with sqlite3.connect(xml_db_file) as xml_conn, sqlite3.connect(binary_db_file) as binary_conn:
+        assert (
+            binary_conn.execute("SELECT value FROM metadata WHERE key = 'blob_format'").fetchone()[0]
+            == "binary"
+        )
+        xml_rows = xml_conn.execute(query).fetchall()
+        binary_rows = binary_conn.execute(query).fetchall()
+
+    model_classes = {'101': Share, '202': Bond, '303': Fund}
+    assert [row[0] for row in binary_rows] == [row[0] for row in xml_rows]
+    for (kl_id, xml_blob), (_, binary_blob) in zip(xml_rows, binary_rows):
+        assert is_binary_blob(binary_blob)
+        model_class = model_classes[kl_id]
+        assert decode_model(binary_blob, model_class) == model_class.from_xml(xml_blob)
+
+
+def test_convert_kursliste_xml_to_sqlite_rejects_unknown_blob_format(tmp_path):
+    sample_xml_file = tmp_path / "sample_kursliste_for_db_test.xml"
+    sample_xml_file.write_text(SAMPLE_XML_CONTENT)
+    with pytest.raises(ValueError, match="Unknown blob format"):
+        convert_kursliste_xml_to_sqlite(
+            str(sample_xml_file), str(tmp_path / "out.sqlite"), blob_format="json"
+        )
@@ -6,6 +6,7 @@ import sys
 from contextlib import redirect_stdout
 from pathlib import Path
 
+import lxml.etree as ET
 import pytest
 from opensteuerauszug.model.kursliste import Kursliste as KurslisteModel
 
@@ -718,3 +719,65 @@ def test_empty_input_kursliste(temp_dir):
     assert (
         not output_kursliste.exchangeRatesYearEnd or len(output_kursliste.exchangeRatesYearEnd) == 0
     )
+
+
+def test_definitions_copied_or_filtered_by_reference(temp_dir, sample_kursliste_xml):
+    """Definitions without a filter are copied, institutions only if referenced."""
+    output_xml_path, stdout, stderr, returncode = run_script(
+        temp_dir,
+        input_file=str(sample_kursliste_xml),
+        valor_numbers="12345",
+        target_currency="CHF",
+    )
+    assert returncode == 0, f"Script failed with stderr:\n{stderr}\nstdout:\n{stdout}"
+
+    # The sample's definitions do not all fit the model, so inspect the XML itself
+    root = ET.parse(str(output_xml_path)).getroot()
+    children = [(ET.QName(child).localname, child.get("id")) for child in root]
+    assert ("canton", "1") in children
+    assert [key for tag, key in children if tag == "institution"] == ["1"]
+    assert [key for tag, key in children if tag == "currency"] == ["1"]
+
+
+def test_invalid_kursliste_xml_leaves_no_partial_output(temp_dir, malformed_kursliste_xml):
+    """The output is only moved into place once the whole input has been filtered."""
+    output_xml_path, stdout, stderr, returncode = run_script(
+        temp_dir,
+        input_file=str(malformed_kursliste_xml),
+        valor_numbers="12345",
+        target_currency="CHF",
+    )
+
+    assert returncode != 0
+    assert list(temp_dir.iterdir()) == [], "No partial or temporary output should remain."
+
+
+def test_filter_converted_database(temp_dir):
+    """A Kursliste converted to SQLite filters to the same securities and rates as the XML."""
+    from scripts.convert_kursliste_to_sqlite import convert_kursliste_xml_to_sqlite
+
+    mini_kursliste_xml = SCRIPTS_DIR.parent / "tests" / "samples" / "kursliste" / "kursliste_mini.xml"
+    db_file = temp_dir / "kursliste_2024.sqlite"
+    convert_kursliste_xml_to_sqlite(str(mini_kursliste_xml), str(db_file))
+
+    outputs = []
+    for input_file in (mini_kursliste_xml, db_file):
+        output_xml_path, stdout, stderr, returncode = run_script(
+            temp_dir,
+            input_file=str(input_file),
+            valor_numbers="1246192,239657",
+            target_currency="CHF",
+        )
+        assert returncode == 0, f"Script failed with stderr:\n{stderr}\nstdout:\n{stdout}"
+        outputs.append(parse_output_xml(output_xml_path))
+    from_xml, from_db = outputs
+
+    assert from_db.year == from_xml.year == 2024
+    assert sorted(fund.valorNumber for fund in from_db.funds) == [239657, 1246192]
+    assert from_db.funds == from_xml.funds
+    assert from_db.signs == from_xml.signs
+    assert from_db.da1Rates == from_xml.da1Rates
+    assert {rate.currency for rate in from_db.exchangeRatesYearEnd} == {"USD"}
+    assert from_db.exchangeRates == from_xml.exchangeRates
+    assert from_db.exchangeRatesMonthly == from_xml.exchangeRatesMonthly
+    assert from_db.exchangeRatesYearEnd == from_xml.exchangeRatesYearEnd
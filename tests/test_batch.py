@@ -0,0 +1,221 @@
+import json
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from opensteuerauszug import batch
+from opensteuerauszug.batch import load_manifest
+from opensteuerauszug.steuerauszug import app
+
+runner = CliRunner()
+KURSLISTE_SAMPLE_DIR = Path(__file__).resolve().parent / "samples" / "kursliste"
+
+STATEMENT_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<taxStatement xmlns="http://www.ech.ch/xmlns/eCH-0196/2"
+              minorVersion="22"
+              id="CH00000TESTCLIENT00020241231XX"
+              creationDate="2025-01-15T10:00:00"
+              taxPeriod="2024"
+              periodFrom="2024-01-01"
+              periodTo="2024-12-31"
+              canton="ZH"
+              totalTaxValue="0"
+              totalGrossRevenueA="0"
+              totalGrossRevenueB="0"
+              totalWithHoldingTaxClaim="0">
+    <institution name="Test Bank AG"/>
+    <client clientNumber="TEST123"/>
+</taxStatement>
+"""
+
+
+@pytest.fixture
+def batch_dir(tmp_path: Path) -> Path:
+    (tmp_path / "client.xml").write_text(STATEMENT_XML)
+    (tmp_path / "broken.xml").write_text("not xml")
+    return tmp_path
+
+
+def write_manifest(directory: Path, content: str) -> Path:
+    manifest = directory / "manifest.toml"
+    manifest.write_text(content)
+    return manifest
+
+
+def test_load_manifest_merges_defaults_and_resolves_paths(batch_dir: Path):
+    manifest = write_manifest(
+        batch_dir,
+        """
+[defaults]
+importer = "raw"
+tax_year = 2024
+args = ["--phases", "calculate"]
+
+[[job]]
+name = "a"
+input = "client.xml"
+xml_output = "out/a.xml"
+args = ["--phases", "verify"]
+
+[[job]]
+input = "broken.xml"
+importer = "ibkr"
+log = "/var/tmp/broken.log"
+""",
+    )
+
+    first, second = load_manifest(manifest, log_dir=batch_dir / "logs")
+
+    assert first.name == "a"
+    assert first.input == batch_dir / "client.xml"
+    assert first.xml_output == batch_dir / "out" / "a.xml"
+    assert first.log == batch_dir / "logs" / "a.log"
+    assert first.args == ["--phases", "calculate", "--phases", "verify"]
+    assert first.command_line(["--config", "c.toml"]) == [
+        "process",
+        str(batch_dir / "client.xml"),
+        "--config",
+        "c.toml",
+        "--raw-import",
+        "--tax-year",
+        "2024",
+        "--xml-output",
+        str(batch_dir / "out" / "a.xml"),
+        "--phases",
+        "calculate",
+        "--phases",
+        "verify",
+    ]
+    assert second.name == "broken"
+    assert second.importer == "ibkr"
+    assert second.log == Path("/var/tmp/broken.log")
+
+
+@pytest.mark.parametrize(
+    "content, message",
+    [
+        ("", "contains no"),
+        ("[[job]]\nname = 'a'\n", "has no input"),
+        ("[[job]]\ninput = 'a.xml'\n[[job]]\ninput = 'a.xml'\n", "Duplicate job name"),
+        ("[[job]]\ninput = 'a.xml'\npriority = 1\n", "unknown keys: priority"),
+        ("[[job]\n", "Invalid batch manifest"),
+    ],
+)
+def test_load_manifest_rejects_malformed_manifests(batch_dir: Path, content: str, message: str):
+    with pytest.raises(ValueError, match=message):
+        load_manifest(write_manifest(batch_dir, content))
+
+
+def test_batch_isolates_failures_and_shares_kursliste(batch_dir: Path):
+    manifest = write_manifest(
+        batch_dir,
+        """
+[defaults]
+importer = "raw"
+args = ["--phases", "calculate", "--phases", "verify"]
+
+[[job]]
+name = "first"
+input = "client.xml"
+xml_output = "out/first.xml"
+
+[[job]]
+name = "broken"
+input = "broken.xml"
+
+[[job]]
+name = "second"
+input = "client.xml"
+""",
+    )
+    summary_path = batch_dir / "summary.json"
+
+    result = runner.invoke(
+        app,
+        [
+            "batch",
+            str(manifest),
+            "--workers",
+            "1",
+            "--kursliste-dir",
+            str(KURSLISTE_SAMPLE_DIR),
+            "--summary-json",
+            str(summary_path),
+        ],
+    )
+
+    assert result.exit_code == 1
+    assert "2 of 3 jobs succeeded, 1 failed." in result.stdout
+    summary = json.loads(summary_path.read_text())
+    assert [(job["name"], job["status"]) for job in summary] == [
+        ("first", "ok"),
+        ("broken", "failed"),
+        ("second", "ok"),
+    ]
+    assert (batch_dir / "out" / "first.xml").exists()
+    assert "Error during raw XML import" in (batch_dir / "broken.log").read_text()
+    # The second job ran in the same process and reused the Kursliste opened by the first
+    assert "Loading Kursliste" in (batch_dir / "first.log").read_text()
+    assert "Loading Kursliste" not in (batch_dir / "second.log").read_text()
+
+
+def test_batch_with_worker_processes(batch_dir: Path):
+    manifest = write_manifest(
+        batch_dir,
+        """
+[defaults]
+importer = "raw"
+args = ["--phases", "calculate"]
+
+[[job]]
+name = "a"
+input = "client.xml"
+
+[[job]]
+name = "b"
+input = "client.xml"
+""",
+    )
+
+    result = runner.invoke(
+        app,
+        ["batch", str(manifest), "-j", "2", "--kursliste-dir", str(KURSLISTE_SAMPLE_DIR)],
+    )
+
+    assert result.exit_code == 0, result.stdout
+    assert "with 2 worker(s)" in result.stdout
+    assert "2 of 2 jobs succeeded, 0 failed." in result.stdout
+
+
+def test_batch_rejects_unknown_importer(batch_dir: Path):
+    manifest = write_manifest(batch_dir, "[[job]]\ninput = 'client.xml'\nimporter = 'csv'\n")
+
+    result = runner.invoke(app, ["batch", str(manifest)])
+
+    assert result.exit_code == 1
+    assert "unknown importer 'csv'" in result.stdout
+
+
+def test_run_job_releases_prefetched_kursliste_data(batch_dir: Path, monkeypatch):
+    ended = []
+    pool = batch._worker_session_pool()
+    monkeypatch.setattr(pool, "end_job", lambda: ended.append(True))
+    job = load_manifest(
+        write_manifest(
+            batch_dir,
+            """
+[[job]]
+name = "a"
+input = "client.xml"
+importer = "raw"
+args = ["--phases", "calculate"]
+""",
+        ),
+        log_dir=batch_dir / "logs",
+    )[0]
+
+    batch.run_job(job, ["--kursliste-dir", str(KURSLISTE_SAMPLE_DIR)])
+    batch.run_job(job, ["--kursliste-dir", str(KURSLISTE_SAMPLE_DIR)])
+
+    assert ended == [True, True]
@@ -300,3 +300,58 @@ def test_render_uses_language_override_with_empty_general_config(
 
     assert result.exit_code == 0
     assert captured["language"] == "fr"
+
+
+def test_validate_command_checks_files_and_directories(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(Path(__file__).resolve().parent.parent)
+    sample = Path("tests") / "samples" / "fake_statement.xml"
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    (output_dir / "valid.xml").write_bytes(sample.read_bytes())
+    (output_dir / "invalid.xml").write_bytes(
+        sample.read_bytes().replace(b'canton="', b'kanton="', 1)
+    )
+
+    result = runner.invoke(app, ["validate", str(sample), "-j", "1"])
+    assert result.exit_code == 0, result.stdout
+    assert f"OK {sample}" in result.stdout
+    assert "1 of 1 file(s) valid." in result.stdout
+
+    result = runner.invoke(app, ["validate", str(output_dir), "-j", "2"])
+    assert result.exit_code == 1
+    lines = result.stdout.splitlines()
+    assert lines[0] == f"INVALID {output_dir / 'invalid.xml'}"
+    assert "kanton" in lines[1]
+    assert f"OK {output_dir / 'valid.xml'}" in lines
+    assert lines[-1] == "1 of 2 file(s) valid."
+
+
+@pytest.mark.parametrize("flags, read_only", [([], False), (["--kursliste-immutable"], True)])
+def test_process_opens_kursliste_immutable_only_on_request(
+    dummy_xml_file: Path, monkeypatch, flags, read_only
+):
+    from opensteuerauszug.core.kursliste_session import KurslisteSession
+
+    opened = []
+
+    def recording_session(kursliste_dir, **options):
+        opened.append(options["read_only"])
+        return KurslisteSession(kursliste_dir, **options)
+
+    monkeypatch.setattr("opensteuerauszug.steuerauszug.KurslisteSession", recording_session)
+    runner.invoke(
+        app,
+        [
+            "process",
+            str(dummy_xml_file),
+            "--raw-import",
+            "--tax-year",
+            "2024",
+            "--phases",
+            "calculate",
+            "--kursliste-dir",
+            str(KURSLISTE_SAMPLE_DIR),
+        ]
+        + flags,
+    )
+    assert opened == [read_only]
@@ -0,0 +1,118 @@
+import random
+from datetime import date, timedelta
+from typing import List, Tuple
+
+import pytest
+
+from opensteuerauszug.util.date_coverage import DateRangeCoverage
+
+
+class ListDateRangeCoverage:
+    """The original list-rebuilding implementation, as the reference behaviour."""
+
+    def __init__(self):
+        self.covered: List[Tuple[date, date]] = []
+
+    def mark_covered(self, begin: date, end: date) -> None:
+        new_ranges = []
+        placed = False
+        for b, e in self.covered:
+            if e < begin - timedelta(days=1):
+                new_ranges.append((b, e))
+            elif end < b - timedelta(days=1):
+                if not placed:
+                    new_ranges.append((begin, end))
+                    placed = True
+                new_ranges.append((b, e))
+            else:
+                begin = min(begin, b)
+                end = max(end, e)
+        if not placed:
+            new_ranges.append((begin, end))
+        self.covered = new_ranges
+
+    def is_covered(self, begin: date, end: date) -> bool:
+        for b, e in self.covered:
+            if b <= begin and end <= e:
+                return True
+            if e < begin:
+                continue
+            if b > end:
+                break
+        return False
+
+    def maximal_covered_range_containing(self, d: date):
+        for b, e in self.covered:
+            if b <= d <= e:
+                return (b, e)
+        return None
+
+
+BASE = date(2024, 1, 1)
+
+
+def _random_ranges(rng: random.Random, max_count: int) -> List[Tuple[date, date]]:
+    # Short ranges within a few months so that overlaps and adjacency are common
+    ranges = []
+    for _ in range(rng.randint(0, max_count)):
+        begin = BASE + timedelta(days=rng.randint(0, 90))
+        ranges.append((begin, begin + timedelta(days=rng.randint(0, 10))))
+    return ranges
+
+
+def _check_queries(coverage: DateRangeCoverage, reference: ListDateRangeCoverage, queries):
+    assert coverage.covered == reference.covered
+    for begin, end in queries:
+        assert coverage.is_covered(begin, end) == reference.is_covered(begin, end)
+        assert coverage.maximal_covered_range_containing(
+            begin
+        ) == reference.maximal_covered_range_containing(begin)
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_mark_covered_matches_reference(seed):
+    rng = random.Random(seed)
+    queries = _random_ranges(rng, 25)
+    coverage = DateRangeCoverage()
+    reference = ListDateRangeCoverage()
+    for begin, end in _random_ranges(rng, 25):
+        coverage.mark_covered(begin, end)
+        reference.mark_covered(begin, end)
+        _check_queries(coverage, reference, queries)
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_mark_covered_many_matches_reference(seed):
+    rng = random.Random(seed)
+    queries = _random_ranges(rng, 25)
+    coverage = DateRangeCoverage()
+    reference = ListDateRangeCoverage()
+    for begin, end in _random_ranges(rng, 15):
+        coverage.mark_covered(begin, end)
+        reference.mark_covered(begin, end)
+    ranges = _random_ranges(rng, 25)
+    coverage.mark_covered_many(ranges)
+    for begin, end in ranges:
+        reference.mark_covered(begin, end)
+    _check_queries(coverage, reference, queries)
+
+
+def test_mark_covered_many_rejects_invalid_range_without_marking():
+    coverage = DateRangeCoverage()
+    coverage.mark_covered(date(2024, 1, 1), date(2024, 1, 5))
+    try:
+        coverage.mark_covered_many(
+            [(date(2024, 2, 1), date(2024, 2, 3)), (date(2024, 3, 10), date(2024, 3, 1))]
+        )
+        assert False, "Should raise ValueError for invalid range"
+    except ValueError:
+        pass
+    assert coverage.covered == [(date(2024, 1, 1), date(2024, 1, 5))]
+
+
+def test_extreme_dates():
+    coverage = DateRangeCoverage()
+    coverage.mark_covered(date.min, date(2024, 1, 1))
+    coverage.mark_covered(date(2024, 1, 2), date.max)
+    assert coverage.covered == [(date.min, date.max)]
+    assert coverage.is_covered(date.min, date.max)
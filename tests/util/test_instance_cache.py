@@ -0,0 +1,123 @@
+import threading
+
+import pytest
+
+from opensteuerauszug.util.instance_cache import (
+    CacheInfo,
+    LRUCache,
+    cached_methods,
+    instance_lru_cache,
+)
+
+
+class Lookup:
+    def __init__(self, cache_size):
+        self.cache_size = cache_size
+        self.calls = []
+
+    @instance_lru_cache
+    def double(self, value, factor=2):
+        self.calls.append(value)
+        return value * factor
+
+    @instance_lru_cache
+    def missing(self, value):
+        self.calls.append(value)
+        return None
+
+    @instance_lru_cache
+    def failing(self, value):
+        self.calls.append(value)
+        raise KeyError(value)
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used entry
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.info() == CacheInfo(hits=3, misses=1, maxsize=2, currsize=2, evictions=1)
+
+    cache.clear()
+    assert cache.info() == CacheInfo(hits=0, misses=0, maxsize=2, currsize=0, evictions=0)
+
+
+def test_lru_cache_size_zero_and_unbounded():
+    disabled = LRUCache(maxsize=0)
+    disabled.put("a", 1)
+    assert len(disabled) == 0
+
+    unbounded = LRUCache()
+    for i in range(1000):
+        unbounded.put(i, i)
+    assert unbounded.info().currsize == 1000
+    assert unbounded.info().evictions == 0
+
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=-1)
+
+
+def test_caches_are_per_instance():
+    first, second = Lookup(cache_size=10), Lookup(cache_size=10)
+
+    assert first.double(2) == 4
+    assert first.double(2) == 4
+    assert second.double(2) == 4
+
+    assert first.calls == [2]
+    assert second.calls == [2]
+    assert first.double.cache_info() == CacheInfo(1, 1, 10, 1, 0)
+    assert second.double.cache_info() == CacheInfo(0, 1, 10, 1, 0)
+    assert set(cached_methods(first)) == {"double"}
+
+
+def test_cached_method_keys_none_results_and_exceptions():
+    lookup = Lookup(cache_size=None)
+
+    assert lookup.double(3, factor=3) == 9
+    assert lookup.double(3) == 6
+    assert lookup.missing(1) is None
+    assert lookup.missing(1) is None
+    with pytest.raises(KeyError):
+        lookup.failing(5)
+    with pytest.raises(KeyError):
+        lookup.failing(5)
+
+    assert lookup.calls == [3, 3, 1, 5, 5]
+    assert lookup.missing.cache_info().hits == 1
+    assert lookup.failing.cache_info().currsize == 0
+
+
+def test_cached_method_bounded_and_clear():
+    lookup = Lookup(cache_size=2)
+    for value in (1, 2, 3, 1):
+        lookup.double(value)
+
+    assert lookup.calls == [1, 2, 3, 1]  # 1 was evicted by 3
+    assert lookup.double.cache_info().evictions == 2
+
+    lookup.double.cache_clear()
+    assert lookup.double.cache_info() == CacheInfo(0, 0, 2, 0, 0)
+
+
+def test_cached_method_is_thread_safe():
+    lookup = Lookup(cache_size=8)
+
+    def work():
+        for i in range(2000):
+            assert lookup.double(i % 16) == (i % 16) * 2
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    info = lookup.double.cache_info()
+    assert info.hits + info.misses == 8000
+    assert info.currsize == 8
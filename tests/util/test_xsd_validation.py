@@ -0,0 +1,77 @@
+import shutil
+from pathlib import Path
+
+import lxml.etree as ET
+import pytest
+
+from opensteuerauszug.model.ech0196 import TaxStatement
+from opensteuerauszug.util.xsd_validation import (
+    ECH0196_XSD_NAME,
+    load_schema,
+    schema_errors,
+    validate_file,
+    validate_files,
+)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+XSD_PATH = PROJECT_ROOT / "specs" / ECH0196_XSD_NAME
+SAMPLE_STATEMENT = PROJECT_ROOT / "tests" / "samples" / "fake_statement.xml"
+
+pytestmark = pytest.mark.skipif(not XSD_PATH.exists(), reason="eCH-0196 XSD not available")
+
+
+@pytest.fixture
+def xml_files(tmp_path: Path):
+    valid = tmp_path / "valid.xml"
+    shutil.copy(SAMPLE_STATEMENT, valid)
+    invalid = tmp_path / "invalid.xml"
+    root = ET.parse(str(SAMPLE_STATEMENT)).getroot()
+    del root.attrib["canton"]
+    invalid.write_bytes(ET.tostring(root, xml_declaration=True, encoding="UTF-8"))
+    broken = tmp_path / "broken.xml"
+    broken.write_text("<taxStatement")
+    return valid, invalid, broken
+
+
+def test_schema_is_compiled_once_per_path():
+    schema = load_schema(XSD_PATH)
+    assert load_schema(str(XSD_PATH)) is schema
+    assert load_schema(XSD_PATH.parent / ".." / "specs" / ECH0196_XSD_NAME) is schema
+
+
+def test_built_tree_is_validated_like_its_serialization():
+    statement = TaxStatement.from_xml_file(str(SAMPLE_STATEMENT))
+    assert schema_errors(statement._build_xml_element(None), XSD_PATH) == []
+
+    statement.canton = None
+    errors = schema_errors(statement._build_xml_element(None), XSD_PATH)
+    from_bytes = schema_errors(ET.fromstring(statement.to_xml_bytes()), XSD_PATH)
+    assert len(errors) == len(from_bytes) == 1
+    # No line numbers in memory, so the element path is reported
+    assert errors[0].startswith("/*: ")
+    assert "'canton' is required but missing" in errors[0]
+    assert from_bytes[0].startswith("<string>:")
+
+
+def test_validate_file_reports_schema_and_syntax_errors(xml_files):
+    valid, invalid, broken = xml_files
+    assert validate_file(valid, XSD_PATH).ok
+    result = validate_file(invalid, XSD_PATH)
+    assert not result.ok
+    assert "'canton' is required but missing" in result.errors[0]
+    result = validate_file(broken, XSD_PATH)
+    assert not result.ok
+    assert result.errors[0].startswith("Cannot parse XML:")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_validate_files_keeps_the_order_of_the_paths(xml_files, workers):
+    paths = list(xml_files) * 3
+    results = validate_files(paths, XSD_PATH, workers=workers)
+    assert [result.path for result in results] == paths
+    assert [result.ok for result in results] == [True, False, False] * 3
+
+
+def test_validate_files_rejects_a_missing_schema(xml_files, tmp_path: Path):
+    with pytest.raises(OSError):
+        validate_files(xml_files, tmp_path / "missing.xsd")